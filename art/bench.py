@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for the art scenes.
+
+Runs each scene offscreen (SDL dummy video driver) for a fixed number of
+frames with a fixed seed and a fixed timestep, and reports per-scene frame
+time (mean/p95/p99), draw calls and blitted images per frame (a batched
+``blits`` is one call) and memory. Every scene runs in its own process so
+memory numbers do not bleed between scenes.
+
+    python art/bench.py                       # table for every scene
+    python art/bench.py stocks --frames 500   # just one scene
+    python art/bench.py --json bench.json     # machine-readable results
+    python art/bench.py --baseline bench.json # exit 1 on a regression
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+# Keep stdout clean for --json -
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from runtime import SCENES
+from runtime.cli import parse_size
+from runtime.headless import CountingSurface, load_offline_scene, open_headless, render_frames
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def bench_scene(name, frames, warmup, size, seed, trace_memory=False):
+    """Benchmark one scene in this process and return its results"""
+    open_headless(size)
+    scene = load_offline_scene(name, tempfile.mkdtemp(prefix="art-bench-"))
+
+    surface = CountingSurface(size)
+    restore = surface.count_draw_calls()
+    times = []
+    calls = []
+    blit_items = []
+
+    def on_frame(index, surface, seconds):
+        if index >= warmup:
+            times.append(seconds * 1000.0)
+            calls.append(surface.calls)
+            blit_items.append(surface.blit_items)
+        surface.calls = surface.blit_items = 0
+
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        render_frames(scene, size, warmup + frames, 1.0 / scene.target_fps, seed, surface, on_frame)
+    finally:
+        restore()
+
+    result = {
+        "scene": name,
+        "frames": frames,
+        "size": list(size),
+        "seed": seed,
+        "target_fps": scene.target_fps,
+        "mean_ms": sum(times) / len(times),
+        "p95_ms": percentile(sorted(times), 0.95),
+        "p99_ms": percentile(sorted(times), 0.99),
+        "max_ms": max(times),
+        "draw_calls": sum(calls) / len(calls),
+        "blit_items": sum(blit_items) / len(blit_items),
+        # ru_maxrss is in kilobytes on Linux
+        "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+    if trace_memory:
+        result["python_peak_kb"] = tracemalloc.get_traced_memory()[1] // 1024
+        tracemalloc.stop()
+    return result
+
+
+def bench_in_subprocess(name, args):
+    command = [sys.executable, os.path.abspath(__file__), name, "--single",
+               "--frames", str(args.frames), "--warmup", str(args.warmup),
+               "--size", f"{args.size[0]}x{args.size[1]}", "--seed", str(args.seed)]
+    if args.trace_memory:
+        command.append("--trace-memory")
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"scene": name, "error": completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def find_regressions(results, baseline, tolerance):
+    previous = {entry["scene"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scene"])
+        if not before or "error" in result or "error" in before:
+            continue
+        for metric in ("mean_ms", "p95_ms", "p99_ms"):
+            if result[metric] > before[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result['scene']}: {metric} {before[metric]:.2f} -> {result[metric]:.2f}"
+                )
+    return regressions
+
+
+def print_table(results):
+    print(f"{'scene':<18}{'mean ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'calls':>9}{'blitted':>9}{'rss MB':>9}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['scene']:<18} failed: {' '.join(result['error'])}")
+            continue
+        print(f"{result['scene']:<18}{result['mean_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+              f"{result['p99_ms']:>9.2f}{result['draw_calls']:>9.0f}{result.get('blit_items', 0):>9.0f}"
+              f"{result['max_rss_kb'] / 1024:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark art scenes headless")
+    parser.add_argument("scenes", nargs="*", default=list(SCENES),
+                        help="scenes to benchmark (default: all)")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per scene")
+    parser.add_argument("--warmup", type=int, default=20, help="frames run before measuring")
+    parser.add_argument("--size", type=parse_size, default=(800, 600), help="WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="also report peak Python heap (slows frames down)")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON ('-' for stdout)")
+    parser.add_argument("--baseline", metavar="PATH",
+                        help="earlier --json output; exit 1 if a scene got slower")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed slowdown against the baseline (default: 0.2 = 20%%)")
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        # Worker mode: one scene in this process, JSON on the last line
+        result = bench_scene(args.scenes[0], args.frames, args.warmup, args.size,
+                             args.seed, args.trace_memory)
+        print(json.dumps(result))
+        return
+
+    results = [bench_in_subprocess(name, args) for name in args.scenes]
+    report = {"python": sys.version.split()[0], "results": results}
+
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+    else:
+        print_table(results)
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(report, f, indent=2)
+
+    failed = any("error" in result for result in results)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = find_regressions(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print("Regression:", regression, file=sys.stderr)
+        failed = failed or bool(regressions)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Export an art scene to numbered PNGs or a video file.
+
+Runs the scene offscreen (SDL dummy video driver) with a fixed timestep and
+seed, as fast as it can draw, so exports never drop frames and come out
+the same every time. Raw frames go through a small bounded queue to a
+writer thread, which saves PNGs or pipes them into ffmpeg; memory use is
+the same for a ten-second loop as for an hour.
+
+    python art/export.py randomizer --seconds 10 --output frames/
+    python art/export.py mood-fade --seconds 30 --fps 30 --video mood.mp4
+    python art/export.py synapses --frames 600 --size 1920x1080 --seed 7 --video loop.mp4
+"""
+
+import argparse
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+# Keep the output clean
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from runtime import SCENES, load_scene_class
+from runtime.cli import parse_size, positive_float, positive_int
+from runtime.headless import load_offline_scene, open_headless, render_frames
+
+PIXEL_FORMAT = "RGB"  # Matches ffmpeg's rgb24
+
+
+class PngWriter:
+    """Saves frames as frame-000000.png, frame-000001.png, ... in ``directory``"""
+
+    def __init__(self, directory, size):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.size = size
+
+    def write(self, index, pixels):
+        image = pygame.image.frombytes(pixels, self.size, PIXEL_FORMAT)
+        pygame.image.save(image, os.path.join(self.directory, f"frame-{index:06d}.png"))
+
+    def close(self):
+        pass
+
+
+class FfmpegWriter:
+    """Pipes raw frames into an ffmpeg process that encodes ``path``"""
+
+    def __init__(self, path, size, fps, ffmpeg="ffmpeg"):
+        executable = shutil.which(ffmpeg)
+        if executable is None:
+            raise SystemExit(f"{ffmpeg} not found; install it or export PNGs with --output")
+        width, height = size
+        command = [executable, "-loglevel", "error", "-y",
+                   "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps),
+                   "-i", "-",
+                   # yuv420p needs even dimensions and is what players expect
+                   "-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2", "-pix_fmt", "yuv420p", path]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def write(self, index, pixels):
+        self.process.stdin.write(pixels)
+
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise SystemExit(f"ffmpeg exited with status {self.process.returncode}")
+
+
+class WriterThread:
+    """Takes frames from a bounded queue and hands them to a writer"""
+
+    def __init__(self, writer, max_queued):
+        self.writer = writer
+        self.frames = queue.Queue(maxsize=max_queued)
+        self.written = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="export-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            item = self.frames.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue  # Keep draining so the producer never blocks forever
+            try:
+                self.writer.write(*item)
+                self.written += 1
+            except Exception as e:
+                self.error = e
+
+    def put(self, index, pixels):
+        """Queue a frame; blocks while the queue is full. Returns seconds spent waiting"""
+        if self.error is not None:
+            raise self.error
+        started = time.perf_counter()
+        self.frames.put((index, pixels))
+        return time.perf_counter() - started
+
+    def finish(self):
+        self.frames.put(None)
+        self.thread.join()
+        self.writer.close()
+        if self.error is not None:
+            raise self.error
+
+
+def export_scene(name, frames, fps, size, seed, writer, max_queued=8):
+    """Render ``frames`` frames of ``name`` into ``writer``; returns throughput numbers"""
+    if frames <= 0:
+        raise ValueError(f"cannot export {frames} frames; need at least one")
+    if fps <= 0:
+        raise ValueError(f"frame rate must be positive, not {fps}")
+    open_headless(size)
+    # Offline, with a throwaway corpus, so exports only depend on the seed
+    work_dir = tempfile.TemporaryDirectory(prefix="art-export-")
+    scene = load_offline_scene(name, work_dir.name)
+    output = WriterThread(writer, max_queued)
+    draw_seconds = 0.0
+    wait_seconds = 0.0
+    started = time.perf_counter()
+    last_report = started
+
+    def on_frame(index, surface, seconds):
+        nonlocal draw_seconds, wait_seconds, last_report
+        draw_seconds += seconds
+        # tobytes copies the frame, so the scene can draw the next one at once
+        wait_seconds += output.put(index, pygame.image.tobytes(surface, PIXEL_FORMAT))
+        now = time.perf_counter()
+        if now - last_report >= 1.0:
+            last_report = now
+            print(f"\r[export] {index + 1}/{frames} frames, {(index + 1) / (now - started):.1f} fps",
+                  end="", file=sys.stderr, flush=True)
+
+    try:
+        render_frames(scene, size, frames, 1.0 / fps, seed, on_frame=on_frame)
+    finally:
+        output.finish()
+        work_dir.cleanup()
+    elapsed = time.perf_counter() - started
+    print(file=sys.stderr)
+    return {
+        "frames": frames,
+        "seconds": elapsed,
+        "fps": frames / elapsed,
+        "realtime": frames / elapsed / fps,
+        "draw_ms": 1000.0 * draw_seconds / frames,
+        # Time the scene waited on a full queue: high means the writer is the bottleneck
+        "writer_wait_ms": 1000.0 * wait_seconds / frames,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an art scene to PNG frames or a video")
+    parser.add_argument("scene", choices=list(SCENES), help="scene to export")
+    length = parser.add_mutually_exclusive_group()
+    length.add_argument("--frames", type=positive_int, help="number of frames (default: 10 seconds' worth)")
+    length.add_argument("--seconds", type=positive_float, help="length of the export in seconds")
+    parser.add_argument("--fps", type=positive_float, default=None,
+                        help="frames per second of the export (default: the scene's target FPS)")
+    parser.add_argument("--size", type=parse_size, default=(800, 600), help="WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=1234)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--output", default="export", help="directory for numbered PNGs (default: export)")
+    target.add_argument("--video", metavar="PATH", help="encode to PATH with ffmpeg instead of PNGs")
+    parser.add_argument("--ffmpeg", default="ffmpeg", help="ffmpeg executable for --video")
+    parser.add_argument("--queue", type=positive_int, default=8,
+                        help="frames buffered for the writer; bounds memory (default: 8)")
+    args = parser.parse_args()
+
+    fps = args.fps if args.fps is not None else load_scene_class(args.scene).target_fps
+    if args.frames is not None:
+        frames = args.frames
+    else:
+        frames = round((args.seconds if args.seconds is not None else 10.0) * fps)
+    if frames <= 0:
+        parser.error(f"nothing to export: {args.seconds} s at {fps} fps is {frames} frames")
+
+    if args.video:
+        writer = FfmpegWriter(args.video, args.size, fps, args.ffmpeg)
+        destination = args.video
+    else:
+        writer = PngWriter(args.output, args.size)
+        destination = args.output
+
+    result = export_scene(args.scene, frames, fps, args.size, args.seed, writer, args.queue)
+    print(f"[export] {args.scene}: {result['frames']} frames to {destination} in {result['seconds']:.1f} s, "
+          f"{result['fps']:.1f} fps ({result['realtime']:.1f}x real time), "
+          f"draw {result['draw_ms']:.2f} ms/frame, writer wait {result['writer_wait_ms']:.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,94 +1,101 @@
-import pygame
-import random
-import requests
-
-# Initialize Pygame
-pygame.init()
-
-# Set up the display
-width, height = 800, 600
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("Scrolling Neon Poetry")
-
-# Define neon-like colors
-NEON_COLORS = [
-    (255, 0, 255),  # Magenta
-    (0, 255, 255),  # Cyan
-    (255, 255, 0),  # Yellow
-    (0, 255, 0),    # Lime
-    (0, 0, 255),    # Blue
-    (255, 165, 0),  # Orange
-    (255, 20, 147), # Pink
-]
-
-# Function to fetch random lines of poetry from the PoetryDB API
-def fetch_poetry_lines():
-    api_url = "https://poetrydb.org/random/10/lines.json"
-    response = requests.get(api_url)
-    
-    if response.status_code == 200:
-        data = response.json()
-        lines = [line for poem in data for line in poem['lines']]  # Flatten the list of lines
-        return lines
-    else:
-        print("Error fetching poetry:", response.status_code)
-        return ["Error fetching poetry."]  # Fallback in case of error
-
-# Fetch poetry lines
-poetry_lines = fetch_poetry_lines()
-
-# Font setup
-pygame.font.init()
-font_size = 32
-font = pygame.font.SysFont('Arial', font_size, bold=True)
-
-# Poetry movement parameters
-text_speed = 2  # Controls how fast the text moves across the screen
-text_objects = []  # Store each text object with its position
-
-# Initialize the first set of text objects with random colors and initial positions
-for line in poetry_lines:
-    color = random.choice(NEON_COLORS)
-    text_surface = font.render(line, True, color)
-    # Start each line off-screen on the right
-    start_x = width
-    start_y = random.randint(50, height - text_surface.get_height() - 50)
-    text_objects.append({
-        "surface": text_surface,
-        "x": start_x,
-        "y": start_y,
-        "color": color
-    })
-
-# Main loop
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Fill the screen with black to reset for the next frame
-    screen.fill((0, 0, 0))
-
-    # Move and draw each line of poetry across the screen
-    for text_obj in text_objects:
-        # Move the text to the left by the speed value
-        text_obj["x"] -= text_speed
-        
-        # If the text moves off the left side of the screen, reset it to the right side
-        if text_obj["x"] + text_obj["surface"].get_width() < 0:
-            text_obj["x"] = width
-            text_obj["y"] = random.randint(50, height - text_obj["surface"].get_height() - 50)
-            text_obj["color"] = random.choice(NEON_COLORS)  # Change the color on each reset
-
-        # Draw the text at its updated position
-        screen.blit(text_obj["surface"], (text_obj["x"], text_obj["y"]))
-
-    # Update the display
-    pygame.display.flip()
-
-    # Wait a short period to control the speed of the movement (slows down the movement)
-    pygame.time.delay(20)  # Adjust this value to make it faster/slower
-
-# Quit Pygame
-pygame.quit()
+import os
+
+from runtime import NEON_COLORS, Scene, TextCache, run_scene
+from poetry_source import POETRYDB_URL, CorpusCache, PoetrySource, make_backend
+
+
+class PoetryScene(Scene):
+    caption = "Scrolling Neon Poetry"
+    target_fps = 50
+
+    # Font setup
+    font_name = 'Arial'
+    font_size = 32
+
+    # Rendered lines are cached per color, so recoloring on wrap is cheap
+    text_cache_bytes = 8 * 1024 * 1024
+    use_glyph_atlas = False  # Compose new lines from cached glyphs instead of font.render
+
+    # Poetry movement parameters
+    text_speed = 100  # How fast the text moves across the screen, in pixels per second
+    line_count = 30  # Lines on screen at once
+
+    # Where poems come from: an http(s) URL (PoetryDB or a local stub server) or a file
+    poetry_source = os.environ.get("POETRY_SOURCE", POETRYDB_URL)
+    corpus_dir = None  # On-disk poem cache; None uses the per-user cache directory
+    # Load lines on a background thread; off, they are loaded in order on the
+    # render thread, so offline runs with a seed repeat exactly
+    poetry_prefetch = True
+
+    def __init__(self):
+        super().__init__()
+        self.text_cache = TextCache(self.text_cache_bytes, self.use_glyph_atlas)
+
+    def prepare(self):
+        # Start prefetching in the background; nothing here waits on the network
+        self.source = PoetrySource(make_backend(self.poetry_source), CorpusCache(self.corpus_dir),
+                                   seed=self.seed, prefetch=self.poetry_prefetch)
+        self.source.start()
+
+    def load(self, size):
+        super().load(size)
+        self.source.start()
+
+        # Initialize the first set of text objects with random colors and initial positions
+        self.text_objects = []  # Store each text object with its position
+        for _ in range(self.line_count):
+            line = self.source.next_line()
+            color = self.random.choice(NEON_COLORS)
+            text_surface = self.render_line(line, color)
+            # Start each line off-screen on the right
+            start_x = self.width
+            start_y = self.random_y(text_surface)
+            self.text_objects.append({
+                "surface": text_surface,
+                "text": line,
+                "x": start_x,
+                "y": start_y,
+                "color": color
+            })
+
+    def resize(self, size):
+        # Keep the lines on screen; the prefetch thread keeps running
+        super().load(size)
+        for text_obj in self.text_objects:
+            text_obj["x"] = min(text_obj["x"], self.width)
+            text_obj["y"] = max(0, min(text_obj["y"], self.height - text_obj["surface"].get_height()))
+
+    def random_y(self, text_surface):
+        """A row for a line, 50 pixels clear of the edges where the screen allows"""
+        return self.random.randint(50, max(50, self.height - text_surface.get_height() - 50))
+
+    def render_line(self, line, color):
+        return self.text_cache.render(line, self.font_name, self.font_size, color, True, bold=True)
+
+    def update(self, dt):
+        # Move each line of poetry across the screen
+        for text_obj in self.text_objects:
+            # Move the text to the left by the speed value
+            text_obj["x"] -= self.text_speed * dt
+
+            # If the text moves off the left side of the screen, reset it to the right side
+            if text_obj["x"] + text_obj["surface"].get_width() < 0:
+                text_obj["x"] = self.width
+                text_obj["y"] = self.random_y(text_obj["surface"])
+                text_obj["color"] = self.random.choice(NEON_COLORS)  # Change the color on each reset
+                text_obj["text"] = self.source.next_line()  # And move on to a fresh line
+                text_obj["surface"] = self.render_line(text_obj["text"], text_obj["color"])
+
+    def draw(self, surface):
+        # Fill the screen with black to reset for the next frame
+        surface.fill(self.background)
+
+        for text_obj in self.text_objects:
+            surface.blit(text_obj["surface"], (text_obj["x"], text_obj["y"]))
+
+    def unload(self):
+        self.source.stop()
+
+
+if __name__ == "__main__":
+    run_scene(PoetryScene)
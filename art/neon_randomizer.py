@@ -1,74 +1,153 @@
 import pygame
 import random
+import sys
 
-# Initialize Pygame
-pygame.init()
-
-# Set up the display
-width, height = 800, 600
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("Randomized Neon Pattern")
-
-# Define some colors for the neon effect
-NEON_COLORS = [
-    (255, 0, 255),  # Magenta
-    (0, 255, 255),  # Cyan
-    (255, 255, 0),  # Yellow
-    (0, 255, 0),    # Lime
-    (0, 0, 255),    # Blue
-    (255, 165, 0),  # Orange
-    (255, 20, 147), # Pink
-]
+from runtime import NEON_COLORS, Scene, run_scene
 
 # Function to draw random shapes with neon effects
-def draw_neon_pattern():
+def draw_neon_pattern(surface, rng=random):
+    width, height = surface.get_size()
+    randint = rng.randint  # Looked up once per shape rather than once per draw
+
     # Choose a random color from the neon palette
-    color = random.choice(NEON_COLORS)
-    
+    color = rng.choice(NEON_COLORS)
+
     # Choose a random shape: circle, rectangle, or line
-    shape_type = random.choice(["circle", "rect", "line"])
-    
+    shape_type = rng.choice(["circle", "rect", "line"])
+
     if shape_type == "circle":
         # Randomize position and radius
-        pos = (random.randint(0, width), random.randint(0, height))
-        radius = random.randint(10, 100)
-        thickness = random.randint(1, 5)  # Line thickness
-        pygame.draw.circle(screen, color, pos, radius, thickness)
-    
+        pos = (randint(0, width), randint(0, height))
+        radius = randint(10, 100)
+        thickness = randint(1, 5)  # Line thickness
+        pygame.draw.circle(surface, color, pos, radius, thickness)
+
     elif shape_type == "rect":
         # Randomize rectangle dimensions and position
-        rect_width = random.randint(50, 200)
-        rect_height = random.randint(50, 200)
-        pos = (random.randint(0, width - rect_width), random.randint(0, height - rect_height))
-        thickness = random.randint(1, 5)  # Line thickness
-        pygame.draw.rect(screen, color, pygame.Rect(pos, (rect_width, rect_height)), thickness)
-    
+        rect_width = randint(50, 200)
+        rect_height = randint(50, 200)
+        # Kept on screen; on surfaces smaller than the rectangle it starts at the corner
+        pos = (randint(0, max(0, width - rect_width)), randint(0, max(0, height - rect_height)))
+        thickness = randint(1, 5)  # Line thickness
+        pygame.draw.rect(surface, color, pygame.Rect(pos, (rect_width, rect_height)), thickness)
+
     elif shape_type == "line":
         # Randomize start and end points for the line
-        start_pos = (random.randint(0, width), random.randint(0, height))
-        end_pos = (random.randint(0, width), random.randint(0, height))
-        thickness = random.randint(1, 5)  # Line thickness
-        pygame.draw.line(screen, color, start_pos, end_pos, thickness)
-
-# Main loop
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Fill the screen with black to reset for the next frame
-    screen.fill((0, 0, 0))
-    
-    # Draw neon patterns
-    for _ in range(50):  # Drawing multiple shapes for a more complex pattern
-        draw_neon_pattern()
-
-    # Update the display
-    pygame.display.flip()
-
-    # Limit the frame rate to make the pattern changes smooth
-    pygame.time.delay(100)
-
-# Quit Pygame
-pygame.quit()
+        start_pos = (randint(0, width), randint(0, height))
+        end_pos = (randint(0, width), randint(0, height))
+        thickness = randint(1, 5)  # Line thickness
+        pygame.draw.line(surface, color, start_pos, end_pos, thickness)
+
+
+class RandomizerScene(Scene):
+    caption = "Randomized Neon Pattern"
+    # A new pattern every frame, so keep the changes smooth rather than frantic
+    target_fps = 10
+    frame_independent = True
+
+    shape_count = 50  # Drawing multiple shapes for a more complex pattern
+
+    def draw(self, surface):
+        # Fill the screen with black to reset for the next frame
+        surface.fill(self.background)
+
+        for _ in range(self.shape_count):
+            draw_neon_pattern(surface, self.random)
+
+
+class AfterglowScene(RandomizerScene):
+    """Shapes that fade out slowly under a bloom halo.
+
+    New shapes go onto a persistent accumulation surface that is dimmed
+    once per frame instead of being cleared, by a BLEND_RGB_MULT blit of a
+    constant gray surface (blits take pygame's SIMD path; a blended fill
+    of the same size is about 25x slower). The multiply rounds up, so on
+    its own it leaves every trail stuck at a dim floor; a BLEND_RGB_SUB
+    blit of ``fade_floor`` after it takes them the rest of the way to
+    black. The glow is computed at a
+    fraction of the resolution: the accumulation surface is box-filtered
+    down a small pyramid (each smoothscale halving averages 2x2 pixels),
+    the levels are added back up, and the result is smoothly scaled to half
+    the screen size, doubled to full size and added over the shapes.
+    """
+
+    caption = "Neon Afterglow"
+    target_fps = 30
+    frame_independent = False  # Every frame builds on the last
+
+    shape_rate = 3000  # New shapes per second
+    half_life = 0.2  # Seconds for a shape to fade to half brightness
+    glow_downscale = 4  # The glow is computed at 1/4 of the screen size...
+    glow_levels = 3  # ...and blurred over this many halvings from there
+    glow_strength = 150  # Brightness of the halo, out of 255
+    fade_floor = 1  # Subtracted per frame after the multiply
+
+    def load(self, size):
+        super().load(size)
+        self.trails = pygame.Surface(size)
+        self.trails.fill(self.background)
+        self.fade = pygame.Surface(size)  # Constant gray the trails are multiplied by
+        self.fade_value = None
+        self.floor = pygame.Surface(size)  # Constant fade_floor, subtracted after the multiply
+        self.floor.fill((self.fade_floor,) * 3)
+        self.glow = pygame.Surface(size)
+        # Blurred enough that the last doubling can use nearest-neighbour scaling
+        self.glow_half = pygame.Surface((max(1, self.width // 2), max(1, self.height // 2)))
+
+        # Pyramid levels and the buffers each level is scaled up into
+        self.levels = []
+        width, height = max(1, self.width // self.glow_downscale), max(1, self.height // self.glow_downscale)
+        for _ in range(self.glow_levels):
+            self.levels.append(pygame.Surface((width, height)))
+            width, height = max(1, width // 2), max(1, height // 2)
+        self.upscaled = [pygame.Surface(level.get_size()) for level in self.levels[:-1]]
+        self.pending = 0.0
+        self.decay = 255
+
+    def update(self, dt):
+        self.pending += self.shape_rate * dt
+        # BLEND_MULT scales by value/256, so a value of 256 * factor
+        self.decay = min(255, int(256 * 0.5 ** (dt / self.half_life)))
+
+    def draw_glow(self):
+        levels = self.levels
+        pygame.transform.smoothscale(self.trails, levels[0].get_size(), levels[0])
+        for smaller, larger in zip(levels[1:], levels):
+            pygame.transform.smoothscale(larger, smaller.get_size(), smaller)
+        # Back up the pyramid, adding each blurrier level onto the next
+        for index in range(len(levels) - 1, 0, -1):
+            target = self.upscaled[index - 1]
+            pygame.transform.smoothscale(levels[index], target.get_size(), target)
+            levels[index - 1].blit(target, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+        levels[0].fill((self.glow_strength,) * 3, special_flags=pygame.BLEND_RGB_MULT)
+        pygame.transform.smoothscale(levels[0], self.glow_half.get_size(), self.glow_half)
+        pygame.transform.scale(self.glow_half, self.glow.get_size(), self.glow)
+
+    def draw(self, surface):
+        trails = self.trails
+        # Fade what is already there in a single pass
+        if self.decay != self.fade_value:
+            self.fade_value = self.decay
+            self.fade.fill((self.decay,) * 3)
+        trails.blit(self.fade, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        # (p * d + 255) >> 8 never takes p below 255 / (256 - d) by itself
+        trails.blit(self.floor, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+
+        count = int(self.pending)
+        self.pending -= count
+        rng = self.random
+        for _ in range(count):
+            draw_neon_pattern(trails, rng)
+
+        self.draw_glow()
+        surface.blit(trails, (0, 0))
+        surface.blit(self.glow, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
+
+    def unload(self):
+        self.trails = self.fade = self.floor = self.glow = self.glow_half = None
+        self.levels = self.upscaled = []
+
+
+if __name__ == "__main__":
+    # python neon_randomizer.py --afterglow for fading shapes with a glow
+    run_scene(AfterglowScene if "--afterglow" in sys.argv[1:] else RandomizerScene)
@@ -1,89 +1,144 @@
 import pygame
-import random
-import math
-
-# Initialize Pygame
-pygame.init()
-
-# Set up the display
-width, height = 800, 600
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("Randomized Moving Stock Charts")
-
-# Define neon-like colors for the stock lines
-NEON_COLORS = [
-    (255, 0, 255),  # Magenta
-    (0, 255, 255),  # Cyan
-    (255, 255, 0),  # Yellow
-    (0, 255, 0),    # Lime
-    (0, 0, 255),    # Blue
-    (255, 165, 0),  # Orange
-    (255, 20, 147), # Pink
-]
-
-# Define stock line parameters
-num_charts = 100  # Number of stock lines
-chart_length = 100  # Number of points in each stock chart
-line_speed = 2  # Speed of the moving charts
-
-# Initialize stock charts with random starting points
-stock_lines = []
-for _ in range(num_charts):
-    stock_data = []
-    start_x = random.randint(0, width // 2)  # Start somewhere on the left half of the screen
-    start_y = random.randint(100, height - 100)  # Random Y position for the starting point
-
-    for i in range(chart_length):
-        stock_data.append((start_x + i * line_speed, start_y))
-    stock_lines.append({
-        "points": stock_data,
-        "color": random.choice(NEON_COLORS),
-        "volatility": random.uniform(1, 5)  # Random volatility factor for each line
-    })
-
-# Function to update stock prices (simulate price changes)
-def update_stock_line(stock_line):
-    for i in range(1, len(stock_line["points"])):
-        # Shift x-axis points to the left (simulate forward movement)
-        stock_line["points"][i] = (stock_line["points"][i][0] - line_speed, stock_line["points"][i][1])
-
-        # Generate random stock price change (Y-axis) to simulate stock volatility
-        price_change = random.uniform(-stock_line["volatility"], stock_line["volatility"])
-        new_y = max(50, min(stock_line["points"][i][1] + price_change, height - 50))  # Keep within screen bounds
-        stock_line["points"][i] = (stock_line["points"][i][0], new_y)
-
-    # Add a new point to the end of the chart (simulating continuation)
-    new_x = stock_line["points"][-1][0] + line_speed
-    new_y = stock_line["points"][-1][1] + random.uniform(-stock_line["volatility"], stock_line["volatility"])
-    new_y = max(50, min(new_y, height - 50))  # Keep within screen bounds
-    stock_line["points"].append((new_x, new_y))
-
-    # Remove the first point to keep the line moving
-    stock_line["points"].pop(0)
-
-# Main loop
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-
-    # Fill the screen with black to reset for the next frame
-    screen.fill((0, 0, 0))
-
-    # Update and draw each stock line
-    for stock_line in stock_lines:
-        # Update stock line with new prices
-        update_stock_line(stock_line)
-
-        # Draw the stock line as a continuous line connecting its points
-        pygame.draw.lines(screen, stock_line["color"], False, stock_line["points"], 3)
-
-    # Update the display
-    pygame.display.flip()
-
-    # Limit the frame rate to make the movement smooth
-    pygame.time.delay(50)
-
-# Quit Pygame
-pygame.quit()
+
+from runtime import NEON_COLORS, Scene, run_scene
+
+# NumPy is optional: without it we fall back to the original per-point engine
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Vectorized engine: every chart lives in one (num_charts, chart_length) ring buffer
+class StockCharts:
+    def __init__(self, num_charts, chart_length, width, height, line_speed, rng=None):
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.num_charts = num_charts
+        self.chart_length = chart_length
+        self.low, self.high = 50, height - 50  # Keep within screen bounds
+
+        # The x coordinates never change (the shift and the appended point cancel
+        # out), so they are computed once and only the y values are simulated
+        start_x = self.rng.integers(0, width // 2, num_charts, endpoint=True)
+        self.xs = start_x[:, None] + np.arange(chart_length) * line_speed
+        start_y = self.rng.integers(100, max(100, height - 100), num_charts, endpoint=True)
+        self.ys = np.repeat(start_y[:, None].astype(np.float64), chart_length, axis=1)
+        self.volatility = self.rng.uniform(1, 5, num_charts)[:, None]
+        self.colors = [NEON_COLORS[i] for i in self.rng.integers(0, len(NEON_COLORS), num_charts)]
+
+        # Index of the oldest point in each row of the ring buffer
+        self.head = 0
+        self._noise = np.empty((num_charts, chart_length))
+        self._points = np.empty((num_charts, chart_length, 2))
+        self._points[:, :, 0] = self.xs
+
+    def update(self):
+        # One batched draw covers the jitter on every point plus the new point:
+        # the oldest column is about to be dropped, so its share of the noise
+        # is reused as the new point's price change
+        self.rng.random(out=self._noise)
+        self._noise *= 2.0
+        self._noise -= 1.0
+        self._noise *= self.volatility
+
+        self.ys += self._noise
+        np.clip(self.ys, self.low, self.high, out=self.ys)
+
+        # Overwrite the oldest point with the newest one
+        newest = (self.head - 1) % self.chart_length
+        new_y = self.ys[:, newest] + self._noise[:, self.head]
+        np.clip(new_y, self.low, self.high, out=self.ys[:, self.head])
+        self.head = (self.head + 1) % self.chart_length
+
+    def lines(self):
+        # Unroll the ring buffer so each chart's points run oldest to newest
+        order = (np.arange(self.chart_length) + self.head) % self.chart_length
+        self._points[:, :, 1] = self.ys[:, order]
+        return zip(self.colors, self._points.tolist())
+
+
+class StocksScene(Scene):
+    caption = "Randomized Moving Stock Charts"
+    # The simulation advances one step per frame, so this sets the scroll speed
+    target_fps = 20
+
+    # Define stock line parameters
+    num_charts = 100  # Number of stock lines
+    chart_length = 100  # Number of points in each stock chart
+    line_speed = 2  # Speed of the moving charts
+    use_numpy = np is not None  # Step every chart at once with NumPy when available
+
+    def load(self, size):
+        super().load(size)
+        if self.use_numpy:
+            self.stock_charts = StockCharts(
+                self.num_charts, self.chart_length, self.width, self.height, self.line_speed,
+                self.random.numpy
+            )
+        else:
+            self.stock_lines = self.init_stock_lines()
+
+    # Initialize stock charts with random starting points
+    def init_stock_lines(self):
+        rng = self.random
+        stock_lines = []
+        for _ in range(self.num_charts):
+            stock_data = []
+            start_x = rng.randint(0, self.width // 2)  # Start somewhere on the left half of the screen
+            start_y = rng.randint(100, max(100, self.height - 100))  # Random Y position for the starting point
+
+            for i in range(self.chart_length):
+                stock_data.append((start_x + i * self.line_speed, start_y))
+            stock_lines.append({
+                "points": stock_data,
+                "color": rng.choice(NEON_COLORS),
+                "volatility": rng.uniform(1, 5)  # Random volatility factor for each line
+            })
+        return stock_lines
+
+    # Function to update stock prices (simulate price changes)
+    def update_stock_line(self, stock_line):
+        line_speed = self.line_speed
+        height = self.height
+        uniform = self.random.uniform
+        for i in range(1, len(stock_line["points"])):
+            # Shift x-axis points to the left (simulate forward movement)
+            stock_line["points"][i] = (stock_line["points"][i][0] - line_speed, stock_line["points"][i][1])
+
+            # Generate random stock price change (Y-axis) to simulate stock volatility
+            price_change = uniform(-stock_line["volatility"], stock_line["volatility"])
+            new_y = max(50, min(stock_line["points"][i][1] + price_change, height - 50))  # Keep within screen bounds
+            stock_line["points"][i] = (stock_line["points"][i][0], new_y)
+
+        # Add a new point to the end of the chart (simulating continuation)
+        new_x = stock_line["points"][-1][0] + line_speed
+        new_y = stock_line["points"][-1][1] + uniform(-stock_line["volatility"], stock_line["volatility"])
+        new_y = max(50, min(new_y, height - 50))  # Keep within screen bounds
+        stock_line["points"].append((new_x, new_y))
+
+        # Remove the first point to keep the line moving
+        stock_line["points"].pop(0)
+
+    def update(self, dt):
+        if self.use_numpy:
+            # Step every chart with a single batched random draw
+            self.stock_charts.update()
+        else:
+            for stock_line in self.stock_lines:
+                self.update_stock_line(stock_line)
+
+    def draw(self, surface):
+        # Fill the screen with black to reset for the next frame
+        surface.fill(self.background)
+
+        # Draw each stock line as a continuous line connecting its points
+        if self.use_numpy:
+            for color, points in self.stock_charts.lines():
+                pygame.draw.lines(surface, color, False, points, 3)
+        else:
+            for stock_line in self.stock_lines:
+                pygame.draw.lines(surface, stock_line["color"], False, stock_line["points"], 3)
+
+
+if __name__ == "__main__":
+    run_scene(StocksScene)
@@ -2,54 +2,45 @@ import pygame
 import random
 import math
 
-# Initialize Pygame
-pygame.init()
-
-# Set up the display
-width, height = 800, 600
-screen = pygame.display.set_mode((width, height))
-pygame.display.set_caption("Randomized Synapse Pattern")
-
-# Define neon-like colors
-NEON_COLORS = [
-    (255, 0, 255),  # Magenta
-    (0, 255, 255),  # Cyan
-    (255, 255, 0),  # Yellow
-    (0, 255, 0),    # Lime
-    (0, 0, 255),    # Blue
-    (255, 165, 0),  # Orange
-    (255, 20, 147), # Pink
-]
+from runtime import NEON_COLORS, Scene, run_scene
+
+# NumPy is optional: without it every node and line is drawn one call at a time
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Function to draw circular nodes (representing neurons)
-def draw_node(pos, color):
-    radius = random.randint(10, 20)  # Neuron size (smaller for synapse)
-    pygame.draw.circle(screen, color, pos, radius)
+def draw_node(surface, pos, color, rng=random):
+    radius = rng.randint(10, 20)  # Neuron size (smaller for synapse)
+    pygame.draw.circle(surface, color, pos, radius)
 
 # Function to draw connecting lines (representing synapse connections)
-def draw_synapse_line(start_pos, end_pos, color):
-    thickness = random.randint(2, 5)  # Thickness of the connections
-    pygame.draw.line(screen, color, start_pos, end_pos, thickness)
+def draw_synapse_line(surface, start_pos, end_pos, color, rng=random):
+    thickness = rng.randint(2, 5)  # Thickness of the connections
+    pygame.draw.line(surface, color, start_pos, end_pos, thickness)
 
 # Function to create synapse-like patterns
-def draw_synapse_pattern():
+def draw_synapse_pattern(surface, rng=random):
+    width, height = surface.get_size()
+
     # Choose random colors for each pattern
-    node_color = random.choice(NEON_COLORS)
-    synapse_color = random.choice(NEON_COLORS)
+    node_color = rng.choice(NEON_COLORS)
+    synapse_color = rng.choice(NEON_COLORS)
 
     # Random starting point for a node (neuron)
-    start_pos = (random.randint(0, width), random.randint(0, height))
+    start_pos = (rng.randint(0, width), rng.randint(0, height))
 
     # Draw the node (neuron)
-    draw_node(start_pos, node_color)
+    draw_node(surface, start_pos, node_color, rng)
 
     # Create a random number of connected nodes (dendrites/axons)
-    num_connections = random.randint(2, 6)  # Number of synapse connections
+    num_connections = rng.randint(2, 6)  # Number of synapse connections
 
     for _ in range(num_connections):
         # Create the end position of the synapse connection
-        angle = random.uniform(0, 2 * math.pi)  # Random direction
-        distance = random.randint(50, 150)  # Random distance from the neuron
+        angle = rng.uniform(0, 2 * math.pi)  # Random direction
+        distance = rng.randint(50, 150)  # Random distance from the neuron
         end_pos = (
             start_pos[0] + int(math.cos(angle) * distance),
             start_pos[1] + int(math.sin(angle) * distance)
@@ -59,30 +50,359 @@ def draw_synapse_pattern():
         end_pos = (min(max(0, end_pos[0]), width), min(max(0, end_pos[1]), height))
 
         # Draw the connecting synapse line
-        draw_synapse_line(start_pos, end_pos, synapse_color)
+        draw_synapse_line(surface, start_pos, end_pos, synapse_color, rng)
 
         # Draw the next neuron at the end of the connection (for recursive effect)
-        draw_node(end_pos, node_color)
+        draw_node(surface, end_pos, node_color, rng)
+
+
+# Pre-rendered neuron sprites, one per (color, radius, glow) combination
+class NodeSprites:
+    glow_steps = 8  # Rings in the glow halo
+
+    def __init__(self, glow=False):
+        self.glow = glow
+        # Glow sprites are max-blended so overlapping halos merge without
+        # washing out; plain ones are color-keyed, which blits much faster
+        # than per-pixel alpha
+        self.blend = pygame.BLEND_RGB_MAX if glow else 0
+        self._sprites = {}
+
+    def padding(self, radius):
+        """Distance from the sprite's top-left corner to the node center"""
+        return radius * 2 if self.glow else radius
+
+    def get(self, color, radius):
+        key = (color, radius)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites[key] = self._render(color, radius)
+        return sprite
+
+    def _render(self, color, radius):
+        pad = self.padding(radius)
+        sprite = pygame.Surface((pad * 2 + 1, pad * 2 + 1))
+        if self.glow:
+            # Concentric rings from faint and wide to bright and tight
+            for step in range(self.glow_steps):
+                ring = pad - (pad - radius) * step // self.glow_steps
+                level = 20 + 100 * step // self.glow_steps
+                pygame.draw.circle(sprite, [c * level // 255 for c in color], (pad, pad), ring)
+        pygame.draw.circle(sprite, color, (pad, pad), radius)
+
+        if pygame.display.get_surface() is not None:
+            sprite = sprite.convert()  # Match the display format for faster blits
+        if not self.glow:
+            sprite.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+        return sprite
+
+
+# Generate the layout of many synapse structures at once as arrays
+def generate_synapse_layout(rng, count, width, height):
+    starts = np.column_stack((
+        rng.integers(0, width, count, endpoint=True),
+        rng.integers(0, height, count, endpoint=True),
+    ))
+    connections = rng.integers(2, 6, count, endpoint=True)  # Number of synapse connections
+    owners = np.repeat(np.arange(count), connections)
+
+    # Random direction and distance for every connection of every structure
+    angles = rng.uniform(0, 2 * math.pi, len(owners))
+    distances = rng.integers(50, 150, len(owners), endpoint=True)
+    ends = starts[owners] + np.column_stack((np.cos(angles), np.sin(angles))) * distances[:, None]
+    ends = ends.astype(int)  # Truncate like int() does
+
+    # Ensure the connections stay within the window bounds
+    np.clip(ends[:, 0], 0, width, out=ends[:, 0])
+    np.clip(ends[:, 1], 0, height, out=ends[:, 1])
+
+    return {
+        "starts": starts,
+        "ends": ends,
+        "connections": connections,
+        "owners": owners,
+        "node_colors": rng.integers(0, len(NEON_COLORS), count),
+        "synapse_colors": rng.integers(0, len(NEON_COLORS), count),
+        "thickness": rng.integers(2, 5, count, endpoint=True),
+        "start_radii": rng.integers(10, 20, count, endpoint=True),
+        "end_radii": rng.integers(10, 20, len(owners), endpoint=True),
+    }
+
+
+# Draw a layout with one lines call per structure and one blits call for all nodes
+def draw_synapse_layout(surface, layout, sprites):
+    starts = layout["starts"].tolist()
+    ends = layout["ends"].tolist()
+    synapse_colors = layout["synapse_colors"].tolist()
+    thickness = layout["thickness"].tolist()
+
+    # A star of connections is drawn as one polyline that returns to the
+    # neuron between branches, which looks the same as separate lines
+    first = 0
+    for index, count in enumerate(layout["connections"].tolist()):
+        start = starts[index]
+        path = []
+        for end in ends[first:first + count]:
+            path.append(start)
+            path.append(end)
+        first += count
+        pygame.draw.lines(surface, NEON_COLORS[synapse_colors[index]], False, path, thickness[index])
+
+    # Neurons at both ends of every connection, blitted in one batch
+    node_colors = layout["node_colors"]
+    colors = np.concatenate((node_colors, node_colors[layout["owners"]])).tolist()
+    radii = np.concatenate((layout["start_radii"], layout["end_radii"]))
+    centers = np.concatenate((layout["starts"], layout["ends"]))
+    pads = radii * 2 if sprites.glow else radii
+    corners = (centers - pads[:, None]).tolist()
+    blend = sprites.blend
+    surface.blits(
+        [(sprites.get(NEON_COLORS[color], radius), corner, None, blend)
+         for color, radius, corner in zip(colors, radii.tolist(), corners)],
+        doreturn=False,
+    )
+
+
+def _line_coordinates(start, delta, steps, counts, first):
+    """One coordinate of every pixel of every line, as a running sum
+
+    Works in 16.16 fixed point: each pixel adds its line's step, and the
+    first pixel of a line jumps from where the previous line ended to
+    where this one starts, so one cumsum walks all the lines.
+    """
+    step = (delta << 16) // np.maximum(steps, 1)
+    begin = (start << 16) + 0x8000  # Rounds to the nearest pixel
+    increments = np.repeat(step, counts)
+    increments[first[1:]] = begin[1:] - (begin[:-1] + steps[:-1] * step[:-1])
+    increments[0] = begin[0]
+    np.cumsum(increments, out=increments)
+    increments >>= 16
+    return increments
+
+
+# Rasterize many one-pixel lines at once straight into the surface's pixels
+def draw_segments(surface, starts, ends, colors):
+    """Draw a line from ``starts[i]`` to ``ends[i]`` in mapped color ``colors[i]``
+
+    Every line gets one pixel per step along its longer axis, like
+    pygame.draw.line, and all the pixels are written with one indexed
+    store, so the cost is a handful of array passes instead of one call
+    per line. Where lines cross, the later one wins. Needs a 32-bit surface.
+    """
+    width, height = surface.get_size()
+    limit = np.array([width - 1, height - 1], np.int32)
+    starts = np.clip(starts, 0, limit).astype(np.int32)
+    ends = np.clip(ends, 0, limit).astype(np.int32)
+    delta = ends - starts
+    steps = np.abs(delta).max(axis=1)
+    counts = steps + 1
+    first = np.cumsum(counts) - counts  # Index of each line's first pixel
+    x = _line_coordinates(starts[:, 0], delta[:, 0], steps, counts, first)
+    index = _line_coordinates(starts[:, 1], delta[:, 1], steps, counts, first)
+    index *= surface.get_pitch() // 4
+    index += x
+    buffer = surface.get_buffer()
+    try:
+        np.frombuffer(buffer, np.uint32)[index] = np.repeat(colors, counts)
+    finally:
+        del buffer  # Unlocks the surface
+
+
+class SynapseScene(Scene):
+    caption = "Randomized Synapse Pattern"
+    # A new pattern every frame, so keep the animation smooth rather than frantic
+    target_fps = 10
 
-# Main loop
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+    structure_count = 20  # Draw multiple synapse structures
+    glow = False  # Neon halo around each neuron
+    batched = np is not None  # Generate layouts as arrays and draw them in bulk
+    frame_independent = True
 
-    # Fill the screen with black to reset for the next frame
-    screen.fill((0, 0, 0))
+    def load(self, size):
+        super().load(size)
+        if self.batched:
+            self.sprites = NodeSprites(self.glow)
 
-    # Draw synapse patterns
-    for _ in range(20):  # Draw multiple synapse structures
-        draw_synapse_pattern()
+    def draw(self, surface):
+        # Fill the screen with black to reset for the next frame
+        surface.fill(self.background)
 
-    # Update the display
-    pygame.display.flip()
+        if self.batched:
+            layout = generate_synapse_layout(self.random.numpy, self.structure_count, self.width, self.height)
+            draw_synapse_layout(surface, layout, self.sprites)
+        else:
+            for _ in range(self.structure_count):
+                draw_synapse_pattern(surface, self.random)
+
+
+class DenseSynapseScene(SynapseScene):
+    caption = "Dense Neon Synapse Field"
+    structure_count = 200
+    glow = True
+
+
+class SynapseNetworkScene(Scene):
+    """A living network: neurons persist and drift, link up with every
+    neighbor within ``link_radius`` and send pulses along those links.
+
+    Links are re-found every frame through a uniform-grid spatial index,
+    so the cost grows with the number of nearby pairs rather than with
+    all pairs of neurons. Links are drawn in one batch rather than one
+    call each: every link gets a palette bucket (neuron color and
+    brightness step) and ``draw_segments`` rasterizes them all together.
+    """
+
+    caption = "Living Synapse Network"
+    target_fps = 30
+
+    node_count = 600
+    link_radius = 70  # Neurons closer than this are connected
+    drift_speed = 25  # Typical neuron speed in pixels per second
+    node_radius = 4
+    pulse_rate = 40  # New pulses per second
+    pulse_speed = 1.5  # Links crossed per second
+    max_pulses = 400
+    link_levels = 4  # Brightness steps for links, dimmer when longer
+
+    def prepare(self):
+        if np is None:
+            raise RuntimeError("the synapse network needs NumPy")
+        self.rng = self.random.numpy
+
+    def load(self, size):
+        super().load(size)
+        from runtime.spatial import UniformGrid  # Needs NumPy, so imported only here
+
+        self.bounds = np.array([self.width, self.height], float)
+        self.positions = self.rng.uniform(0, self.bounds, (self.node_count, 2))
+        angles = self.rng.uniform(0, 2 * math.pi, self.node_count)
+        self.velocities = np.column_stack((np.cos(angles), np.sin(angles))) * self.drift_speed
+        self.colors = self.rng.integers(0, len(NEON_COLORS), self.node_count)
+        self.grid = UniformGrid(self.link_radius)
+        self.links = (np.empty(0, np.int64), np.empty(0, np.int64))
+
+        # Pulses travel from neuron "source" to "target"; progress runs 0..1
+        self.pulse_source = np.empty(0, np.int64)
+        self.pulse_target = np.empty(0, np.int64)
+        self.pulse_progress = np.empty(0)
+
+        self.sprites = NodeSprites(glow=True)
+        self.pulse_sprite = NodeSprites(glow=True).get((255, 255, 255), 3)
+        # Link colors per neuron color and brightness step
+        self.link_palette = [
+            [tuple(c * (level + 1) // (self.link_levels + 1) for c in color)
+             for level in range(self.link_levels)]
+            for color in NEON_COLORS
+        ]
+        self.mapped_palette = None  # The palette in the target surface's pixel format
+
+    def resize(self, size):
+        # Stretch the network to the new size rather than growing a new one
+        scale = np.array(size, float) / self.bounds
+        super().load(size)
+        self.bounds = np.array([self.width, self.height], float)
+        self.positions *= scale
+
+    def update(self, dt):
+        # Drift: nudge velocities, keep their speed bounded and bounce off the edges
+        self.velocities += self.rng.normal(0, self.drift_speed, self.velocities.shape) * dt
+        speed = np.linalg.norm(self.velocities, axis=1, keepdims=True)
+        self.velocities *= np.minimum(1.0, 2 * self.drift_speed / np.maximum(speed, 1e-9))
+        self.positions += self.velocities * dt
+        outside = (self.positions < 0) | (self.positions > self.bounds)
+        self.velocities[outside] *= -1
+        np.clip(self.positions, 0, self.bounds, out=self.positions)
+
+        # Re-link every neuron to its neighbors within the radius
+        self.grid.update(self.positions)
+        self.links = self.grid.pairs_within(self.link_radius)
+        self.update_pulses(dt)
+
+    def update_pulses(self, dt):
+        first, second = self.links
+        source, target, progress = self.pulse_source, self.pulse_target, self.pulse_progress + self.pulse_speed * dt
+
+        # Pulses die when their link has stretched past the radius
+        delta = self.positions[source] - self.positions[target]
+        alive = np.einsum("ij,ij->i", delta, delta) < self.link_radius ** 2
+        source, target, progress = source[alive], target[alive], progress[alive]
+
+        # Pulses that arrive hop on along a random link of the neuron they reached
+        arrived = progress >= 1.0
+        if arrived.any() and len(first):
+            ends = np.concatenate((first, second))
+            starts = np.concatenate((second, first))
+            by_start = np.argsort(starts, kind="stable")
+            starts, ends = starts[by_start], ends[by_start]
+            at = target[arrived]
+            lo = np.searchsorted(starts, at, "left")
+            hi = np.searchsorted(starts, at, "right")
+            has_link = hi > lo
+            pick = lo[has_link] + (self.rng.random(has_link.sum()) * (hi - lo)[has_link]).astype(np.int64)
+            hop_source, hop_target = at[has_link], ends[pick]
+            keep = ~arrived
+            source = np.concatenate((source[keep], hop_source))
+            target = np.concatenate((target[keep], hop_target))
+            progress = np.concatenate((progress[keep], np.zeros(len(hop_source))))
+        else:
+            keep = ~arrived
+            source, target, progress = source[keep], target[keep], progress[keep]
+
+        # Fire new pulses along random links
+        spawn = min(self.rng.poisson(self.pulse_rate * dt), self.max_pulses - len(source), len(first))
+        if spawn > 0:
+            chosen = self.rng.integers(0, len(first), spawn)
+            source = np.concatenate((source, first[chosen]))
+            target = np.concatenate((target, second[chosen]))
+            progress = np.concatenate((progress, np.zeros(spawn)))
+
+        self.pulse_source, self.pulse_target, self.pulse_progress = source, target, progress
+
+    def draw_links(self, surface, starts, ends, buckets):
+        """Draw every link in one batch, colored by its palette bucket"""
+        key = (surface.get_bitsize(), surface.get_masks())
+        if self.mapped_palette is None or self.mapped_palette[0] != key:
+            mapped = [surface.map_rgb(color) for shades in self.link_palette for color in shades]
+            self.mapped_palette = (key, np.array(mapped, np.uint32))
+        # Dimmest bucket first, so brighter links end up on top where they cross
+        order = np.argsort(buckets % self.link_levels, kind="stable")
+        draw_segments(surface, starts[order], ends[order], self.mapped_palette[1][buckets[order]])
+
+    def draw(self, surface):
+        surface.fill(self.background)
+        first, second = self.links
+        points = self.positions.astype(int)
+
+        # Links, dimmer the longer they are
+        if len(first):
+            delta = self.positions[first] - self.positions[second]
+            length = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+            levels = ((1.0 - length / self.link_radius) * self.link_levels).astype(int)
+            np.clip(levels, 0, self.link_levels - 1, out=levels)
+            buckets = self.colors[first] * self.link_levels + levels
+            if surface.get_bytesize() == 4:
+                self.draw_links(surface, points[first], points[second], buckets)
+            else:
+                palette = [color for shades in self.link_palette for color in shades]
+                draw_line = pygame.draw.line
+                for bucket, start, end in zip(buckets.tolist(), points[first].tolist(), points[second].tolist()):
+                    draw_line(surface, palette[bucket], start, end)
+
+        # Neurons and pulses, each blitted in one batch
+        radius = self.node_radius
+        corners = (points - self.sprites.padding(radius)).tolist()
+        surface.blits(
+            [(self.sprites.get(NEON_COLORS[color], radius), corner, None, self.sprites.blend)
+             for color, corner in zip(self.colors.tolist(), corners)],
+            doreturn=False,
+        )
+        if len(self.pulse_source):
+            t = self.pulse_progress[:, None]
+            at = self.positions[self.pulse_source] * (1 - t) + self.positions[self.pulse_target] * t
+            corners = (at.astype(int) - self.pulse_sprite.get_width() // 2).tolist()
+            surface.blits([(self.pulse_sprite, corner, None, pygame.BLEND_RGB_MAX) for corner in corners],
+                          doreturn=False)
 
-    # Limit the frame rate to make the synapse animation smooth
-    pygame.time.delay(100)
 
-# Quit Pygame
-pygame.quit()
+if __name__ == "__main__":
+    run_scene(SynapseScene)
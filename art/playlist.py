@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Kiosk playlist for the art scenes.
+
+Keeps one window and one SDL context for the whole session and rotates
+through scenes on a timer or keypress. The next scene is warmed up on a
+background thread while the current one is on screen, and switches
+cross-fade from the last frame of the outgoing scene.
+
+Keys: RIGHT/SPACE next scene, LEFT previous scene, F3 profiler overlay,
+F4 cProfile capture, ESC quit.
+
+With --control-port the playlist also serves a small HTTP/JSON API:
+GET /health, GET /metrics, GET /config, PATCH /config (duration,
+transition, scenes), POST /scene/next and POST /scene {"name": ...}.
+"""
+
+import argparse
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from runtime import (SCENES, ControlServer, Display, FrameScheduler, HttpError, RenderScaler, SceneRandom,
+                     load_scene_class)
+from runtime.profiler import FrameProfiler
+from runtime.app import is_quit_event
+from runtime.framepool import pooled_from_env
+from runtime.cli import parse_size
+
+
+class Playlist:
+    def __init__(self, scene_names, duration=60.0, transition=0.5,
+                 size=(800, 600), fullscreen=False, seed=None, render_scale=None, smooth_scale=False):
+        self.scene_names = list(scene_names)
+        self.seed = seed  # Seed for every scene's random stream; None picks fresh ones
+        self.duration = duration  # Seconds per scene; 0 waits for a keypress
+        self.transition = transition  # Cross-fade length in seconds
+        # Render below the window resolution when asked to, or automatically
+        self.scaler = RenderScaler.from_setting(render_scale)
+        self.display = Display((0, 0) if fullscreen else size, "Raspberry Art", fullscreen,
+                               self.scaler.scale, smooth_scale)
+
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scene-preload")
+        self.preloading = {}  # name -> Future of (scene, warm-up ms)
+        self.prepared = {}  # name -> scene that is warmed up but not on screen
+
+        self.index = -1
+        self.current = None
+        self.current_name = None
+        self.scene_time = 0.0
+        self.snapshot = None  # Last frame of the outgoing scene while fading
+        self.fade_left = 0.0
+        self.switch_started = None
+
+        # Commands from the control API, run at the start of the next frame
+        self.commands = queue.SimpleQueue()
+        self.control = None
+        self.scheduler = None
+        self.profiler = FrameProfiler.from_env()  # F3 overlay, F4 cProfile capture
+
+    # Warm-up, run on the preload thread for upcoming scenes
+    def _prepare(self, name):
+        started = time.perf_counter()
+        scene = load_scene_class(name)()
+        if self.seed is not None:
+            scene.random = SceneRandom(self.seed)
+        # With ART_WORKERS, frame-independent scenes are drawn by a worker pool, as in run_scene
+        scene = pooled_from_env(scene)
+        scene.prepare()
+        return scene, (time.perf_counter() - started) * 1000.0
+
+    def preload(self, name):
+        """Start warming up ``name`` in the background if nothing has yet"""
+        if name not in self.prepared and name not in self.preloading:
+            self.preloading[name] = self.executor.submit(self._prepare, name)
+
+    def take_scene(self, name):
+        """Return a prepared scene, waiting for or running its warm-up"""
+        if name in self.prepared:
+            return self.prepared.pop(name)
+
+        future = self.preloading.pop(name, None)
+        scene, warmup_ms = future.result() if future else self._prepare(name)
+        print(f"[playlist] {name}: warm-up {warmup_ms:.1f} ms, seed {scene.random.seed_value}")
+        return scene
+
+    def switch_to(self, index):
+        self.switch_started = time.perf_counter()
+
+        # Skip over scenes that fail to warm up rather than going dark
+        for attempt in range(len(self.scene_names)):
+            index %= len(self.scene_names)
+            name = self.scene_names[index]
+            try:
+                scene = self.take_scene(name)
+                break
+            except Exception as e:
+                print(f"[playlist] {name}: failed to warm up: {e}")
+                index += 1
+        else:
+            self.switch_started = None
+            self.scene_time = 0.0
+            return
+
+        if self.current is not None:
+            if self.transition > 0:
+                self.snapshot = self.surface.copy()
+                self.fade_left = self.transition
+            self.current.unload()
+            self.prepared[self.current_name] = self.current
+
+        scene.load(self.surface.get_size())
+        self.current = scene
+        self.current_name = name
+        self.index = index
+        self.scene_time = 0.0
+        self.scheduler.set_target_fps(scene.target_fps)
+        self.profiler.budget_ms = self.scheduler.budget_ms
+        self.display.set_caption(scene.caption)
+
+        # Warm up whatever comes next while this scene is on screen
+        self.preload(self.scene_names[(index + 1) % len(self.scene_names)])
+
+    # Control API: handlers run on the render thread via self.commands
+    def serve_control(self, host, port, token=None):
+        self.control = ControlServer(self.commands.put, host, port, token)
+        self.control.route("GET", "/health", self.control_health, on_ui=False)
+        self.control.route("GET", "/metrics", self.control_metrics, on_ui=False)
+        self.control.route("GET", "/config", self.control_config, on_ui=False)
+        self.control.route("PATCH", "/config", self.control_update)
+        self.control.route("POST", "/scene/next", lambda request: self.control_switch(1))
+        self.control.route("POST", "/scene", self.control_scene)
+        self.control.start()
+
+    def control_health(self, request):
+        return {"status": "ok" if self.current is not None else "starting", "scene": self.current_name}
+
+    def control_metrics(self, request):
+        metrics = {"scene": self.current_name, "scene_time_s": round(self.scene_time, 1)}
+        if self.scheduler is not None:
+            metrics.update(fps=round(self.scheduler.fps, 1), work_ms=self.scheduler.work_ms,
+                           frames=self.scheduler.frames, overruns=self.scheduler.overruns)
+        metrics["render_scale"] = self.scaler.scale
+        metrics["control"] = self.control.stats()
+        return metrics
+
+    def control_config(self, request):
+        return {"scenes": self.scene_names, "duration": self.duration,
+                "transition": self.transition, "current": self.current_name}
+
+    def control_update(self, request):
+        changes = request.json()
+        for key in ("duration", "transition"):
+            if key in changes:
+                value = changes[key]
+                if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                    raise HttpError(400, f"{key} must be a number >= 0")
+        if "scenes" in changes:
+            scenes = changes["scenes"]
+            if not isinstance(scenes, list) or not scenes or any(name not in SCENES for name in scenes):
+                raise HttpError(400, f"scenes must be a non-empty list of: {', '.join(SCENES)}")
+
+        self.duration = changes.get("duration", self.duration)
+        self.transition = changes.get("transition", self.transition)
+        if "scenes" in changes:
+            self.scene_names = list(changes["scenes"])
+            # Carry on from the current scene if it is still in the list
+            if self.current_name in self.scene_names:
+                self.index = self.scene_names.index(self.current_name)
+            else:
+                self.switch_to(0)
+        return self.control_config(request)
+
+    def control_switch(self, step):
+        self.switch_to(self.index + step)
+        return {"scene": self.current_name}
+
+    def control_scene(self, request):
+        name = request.json().get("name")
+        if name not in self.scene_names:
+            raise HttpError(400, f"name must be one of: {', '.join(self.scene_names)}")
+        self.switch_to(self.scene_names.index(name))
+        return {"scene": self.current_name}
+
+    def run_commands(self):
+        while True:
+            try:
+                command = self.commands.get_nowait()
+            except queue.Empty:
+                return
+            command()
+
+    def draw_frame(self):
+        with self.profiler.span("draw"):
+            dirty = self.current.draw(self.surface)
+
+        if self.snapshot is not None:
+            # Fade the outgoing frame out over the incoming one
+            self.snapshot.set_alpha(int(255 * self.fade_left / self.transition))
+            self.surface.blit(self.snapshot, (0, 0))
+            self.current.invalidate()
+            dirty = None
+
+        dirty = self.profiler.draw_overlay(self.surface, dirty, self.current)
+        with self.profiler.span("present"):
+            self.display.present(dirty)
+
+        if self.switch_started is not None:
+            switch_ms = (time.perf_counter() - self.switch_started) * 1000.0
+            print(f"[playlist] {self.current_name}: switch {switch_ms:.1f} ms")
+            self.switch_started = None
+
+    def run(self):
+        self.surface = self.display.open()
+        self.scheduler = FrameScheduler(30)
+        self.switch_to(0)
+
+        dt = 0.0
+        running = True
+        try:
+            while running and self.current is not None:
+                profiler = self.profiler
+                with profiler.span("events"):
+                    self.run_commands()
+                    step = 0
+                    for event in pygame.event.get():
+                        if is_quit_event(event):
+                            running = False
+                        elif event.type == pygame.KEYDOWN and event.key in (pygame.K_RIGHT, pygame.K_SPACE):
+                            step = 1
+                        elif event.type == pygame.KEYDOWN and event.key == pygame.K_LEFT:
+                            step = -1
+                        elif not profiler.handle_event(event):
+                            self.current.handle_event(event)
+
+                self.scene_time += dt
+                if not step and self.duration and self.scene_time >= self.duration:
+                    step = 1
+                if step:
+                    self.switch_to(self.index + step)
+
+                with profiler.span("update"):
+                    self.current.update(dt)
+                self.draw_frame()
+
+                dt = self.scheduler.tick()
+                profiler.end_frame()
+                if self.scaler.update(self.scheduler.work_ms, self.scheduler.budget_ms):
+                    self.surface = self.display.set_render_scale(self.scaler.scale)
+                    self.snapshot = None  # Sized for the old surface
+                    self.current.resize(self.surface.get_size())
+                if self.snapshot is not None:
+                    self.fade_left -= dt
+                    if self.fade_left <= 0:
+                        self.snapshot = None
+        finally:
+            if self.current is not None:
+                self.current.unload()
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            if self.control is not None:
+                self.control.stop()
+            self.display.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rotate art scenes in one window")
+    parser.add_argument("scenes", nargs="*", default=list(SCENES),
+                        help=f"scenes to rotate through (default: {' '.join(SCENES)})")
+    parser.add_argument("--duration", type=float, default=60.0,
+                        help="seconds per scene, 0 to switch only on keypress (default: 60)")
+    parser.add_argument("--transition", type=float, default=0.5,
+                        help="cross-fade length in seconds, 0 to cut (default: 0.5)")
+    parser.add_argument("--size", type=parse_size, default=(800, 600),
+                        help="window size as WIDTHxHEIGHT (default: 800x600)")
+    parser.add_argument("--fullscreen", action="store_true",
+                        help="run fullscreen at the native resolution")
+    parser.add_argument("--render-scale", default=None,
+                        help="draw at this fraction of the window size and scale up, "
+                             "or 'auto' to adjust it to hold the frame rate (default: 1)")
+    parser.add_argument("--smooth-scale", action="store_true",
+                        help="smoothscale the upscaled frame instead of nearest-neighbour scaling")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="seed every scene's random stream for a reproducible run")
+    parser.add_argument("--control-port", type=int, default=0,
+                        help="serve the HTTP/JSON control API on this port (default: off)")
+    parser.add_argument("--control-host", default="127.0.0.1",
+                        help="address for the control API; 0.0.0.0 for remote access")
+    parser.add_argument("--control-token", default=None,
+                        help="bearer token required by every endpoint except /health")
+    args = parser.parse_args()
+
+    playlist = Playlist(args.scenes, args.duration, args.transition, args.size, args.fullscreen, args.seed,
+                        args.render_scale, args.smooth_scale)
+    if args.control_port:
+        playlist.serve_control(args.control_host, args.control_port, args.control_token)
+    playlist.run()
+
+
+if __name__ == "__main__":
+    main()
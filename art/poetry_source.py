@@ -0,0 +1,287 @@
+"""
+Poetry source for the neon poetry scene.
+
+Lines come from a pluggable backend (the PoetryDB HTTP API, a local stub
+server, or a local file), are kept in an on-disk compressed corpus, and are
+prefetched by a background thread into a bounded queue. The scroller only
+ever takes lines from memory, so it never waits on the network or the
+disk: when the queue runs dry it repeats a line from a small ring of
+recently loaded ones, and on a fresh install with no network from a small
+built-in set. While the backend is down the thread keeps the queue fed
+from the corpus.
+
+For offline runs that must repeat exactly (benchmarks, exports), pass a
+``seed`` and ``prefetch=False``: lines are then loaded on the caller's
+thread, only when the queue is empty, so timing cannot change the output.
+"""
+
+import json
+import os
+import queue
+import random
+import struct
+import threading
+import zlib
+from collections import deque
+
+POETRYDB_URL = "https://poetrydb.org/random/10/lines.json"
+
+# Shown only when neither the backend nor the corpus has anything yet
+FALLBACK_LINES = [
+    "Hope is the thing with feathers",
+    "That perches in the soul,",
+    "And sings the tune without the words,",
+    "And never stops at all,",
+]
+
+
+def default_cache_dir():
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "raspberry_art", "poetry")
+
+
+class HttpPoetryBackend:
+    """Fetches poems from PoetryDB or any server speaking its JSON format"""
+
+    def __init__(self, url=POETRYDB_URL, timeout=5.0):
+        self.url = url
+        self.timeout = timeout
+
+    def fetch(self):
+        """Return a list of poems, each a list of lines"""
+        import requests  # Only needed when poems come over HTTP
+
+        response = requests.get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        return [poem["lines"] for poem in response.json()]
+
+
+class FilePoetryBackend:
+    """Reads poems from a local file.
+
+    JSON files use the PoetryDB format (a list of objects with "lines");
+    anything else is read as plain text with poems separated by blank lines.
+    """
+
+    def __init__(self, path, seed=None):
+        self.path = path
+        self.random = random.Random(seed)
+
+    def fetch(self):
+        with open(self.path, encoding="utf-8") as f:
+            if self.path.endswith(".json"):
+                poems = [poem["lines"] for poem in json.load(f)]
+            else:
+                poems = [block.splitlines() for block in f.read().split("\n\n") if block.strip()]
+        self.random.shuffle(poems)
+        return poems
+
+
+class StaticPoetryBackend:
+    """Serves a fixed set of poems, for offline benchmarks and exports"""
+
+    def __init__(self, poems=(FALLBACK_LINES,)):
+        self.poems = [list(poem) for poem in poems]
+
+    def fetch(self):
+        return self.poems
+
+
+def make_backend(spec):
+    """Build a backend from a URL, a file path, or "builtin" for the fixed set"""
+    if spec == "builtin":
+        return StaticPoetryBackend()
+    if spec.startswith(("http://", "https://")):
+        return HttpPoetryBackend(spec)
+    return FilePoetryBackend(spec)
+
+
+class CorpusCache:
+    """Compressed, indexed on-disk store of poems.
+
+    Poems are appended as zlib-compressed records to ``poems.dat``;
+    ``poems.idx`` holds a fixed-size (offset, length, crc) entry per poem,
+    so a random poem is one seek and one read regardless of corpus size.
+    """
+
+    ENTRY = struct.Struct("<QII")
+
+    def __init__(self, directory=None, max_poems=5000):
+        self.directory = directory or default_cache_dir()
+        self.max_poems = max_poems
+        self.data_path = os.path.join(self.directory, "poems.dat")
+        self.index_path = os.path.join(self.directory, "poems.idx")
+        self._lock = threading.Lock()
+        self._entries = []
+        self._crcs = set()
+        self._load_index()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                raw = f.read()
+            data_size = os.path.getsize(self.data_path)
+        except OSError:
+            return
+
+        # Ignore a torn trailing entry or records past the end of the data file
+        usable = len(raw) - len(raw) % self.ENTRY.size
+        for offset, length, crc in self.ENTRY.iter_unpack(raw[:usable]):
+            if offset + length > data_size:
+                break
+            self._entries.append((offset, length))
+            self._crcs.add(crc)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, lines):
+        """Store a poem unless it is already cached or the cache is full"""
+        record = zlib.compress("\n".join(lines).encode("utf-8"))
+        crc = zlib.crc32(record)
+        with self._lock:
+            if crc in self._crcs or len(self._entries) >= self.max_poems:
+                return False
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(self.data_path, "ab") as data:
+                    offset = data.tell()
+                    data.write(record)
+                with open(self.index_path, "ab") as index:
+                    index.write(self.ENTRY.pack(offset, len(record), crc))
+            except OSError as e:
+                print(f"Error caching poem: {e}")
+                return False
+            self._entries.append((offset, len(record)))
+            self._crcs.add(crc)
+            return True
+
+    def random_poem(self, rng=random):
+        """Return a random cached poem as a list of lines, or None if empty"""
+        with self._lock:
+            if not self._entries:
+                return None
+            offset, length = self._entries[rng.randrange(len(self._entries))]
+            try:
+                with open(self.data_path, "rb") as data:
+                    data.seek(offset)
+                    record = data.read(length)
+                return zlib.decompress(record).decode("utf-8").split("\n")
+            except (OSError, zlib.error) as e:
+                print(f"Error reading cached poem: {e}")
+                return None
+
+
+class PoetrySource:
+    """Keeps a bounded queue of upcoming lines filled from a background thread"""
+
+    def __init__(self, backend=None, cache=None, queue_size=200, recent_size=500,
+                 retry_delay=5.0, max_retry_delay=300.0, seed=None, prefetch=True):
+        self.backend = backend or HttpPoetryBackend()
+        self.cache = cache if cache is not None else CorpusCache()
+        self.lines = queue.Queue(maxsize=queue_size)
+        # Lines loaded lately, repeated when the queue runs dry; appended by
+        # the prefetch thread only, so the render thread never takes a lock
+        self.recent = deque(maxlen=recent_size)
+        self.random = random.Random(seed)  # Render thread only
+        self._load_random = random.Random(None if seed is None else seed + 1)  # Picks corpus poems
+        self.prefetch = prefetch
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start prefetching; calling it while already running does nothing"""
+        if not self.prefetch:
+            return
+        if self._thread is not None and self._thread.is_alive() and not self._stop.is_set():
+            return
+        # A thread told to stop may still be finishing a fetch; it keeps its
+        # own stop event and exits on its own, so a new one starts alongside
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(self._stop,), name="poetry-prefetch",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def next_line(self):
+        """Return the next line without ever blocking"""
+        try:
+            return self.lines.get_nowait()
+        except queue.Empty:
+            if not self.prefetch and self._fill():
+                return self.lines.get_nowait()
+            recent = self.recent
+            if not recent:
+                return self.random.choice(FALLBACK_LINES)
+            return recent[self.random.randrange(len(recent))]  # The ring only grows until full
+
+    def _fetch(self):
+        try:
+            poems = self.backend.fetch()
+        except Exception as e:
+            print(f"Error fetching poetry: {e}")
+            return None
+        for poem in poems:
+            self.cache.add(poem)
+        return poems
+
+    def _put(self, line, stop):
+        # Block while the queue is full, but keep noticing stop requests
+        while not stop.is_set():
+            try:
+                self.lines.put(line, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _corpus_poems(self, rng, count=10):
+        return [self.cache.random_poem(rng) for _ in range(min(len(self.cache), count))]
+
+    def _remember(self, poems):
+        self.recent.extend(line for poem in poems for line in poem or () if line.strip())
+
+    def _load(self):
+        """Poems from the backend, or from the corpus while it is down; and whether it was up"""
+        poems = self._fetch()
+        if poems:
+            self._remember(poems)
+            return poems, True
+        # Keep the scroller fed from the corpus while the backend is down
+        poems = self._corpus_poems(self._load_random)
+        self._remember(poems)
+        return poems, False
+
+    def _fill(self):
+        """Load poems on this thread until the queue has lines; False if there are none"""
+        poems, _ = self._load()
+        for poem in poems:
+            for line in poem or ():
+                if line.strip():
+                    try:
+                        self.lines.put_nowait(line)
+                    except queue.Full:
+                        return True
+        return not self.lines.empty()
+
+    def _run(self, stop):
+        # Give the fallback ring something to repeat before the first fetch returns
+        self._remember(self._corpus_poems(self._load_random))
+        delay = self.retry_delay
+        while not stop.is_set():
+            poems, fetched = self._load()
+
+            for poem in poems:
+                for line in poem or ():
+                    if line.strip() and not self._put(line, stop):
+                        return
+
+            if fetched:
+                delay = self.retry_delay
+            else:
+                stop.wait(delay)
+                delay = min(delay * 2, self.max_retry_delay)
@@ -1,67 +1,178 @@
 import pygame
 import random
+import math
+import sys
 
-# Initialize Pygame
-pygame.init()
+from runtime import Scene, run_scene
 
-# Screen dimensions
-ROWS, COLS = 6, 8  # Number of rows and columns in the grid
+# NumPy is optional and only needed for the fading grid
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Create a function to generate a random RGB color
-def random_color():
+def random_color(rng=random):
     """Generate a random RGB color."""
-    return random.randint(50, 255), random.randint(50, 255), random.randint(50, 255)
+    return rng.randint(50, 255), rng.randint(50, 255), rng.randint(50, 255)
 
 # Create a color grid
-def generate_color_grid(rows, cols):
-    """Generate a grid of random colors."""
-    return [[random_color() for _ in range(cols)] for _ in range(rows)]
-
-# Initialize the screen in fullscreen mode
-screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-WIDTH, HEIGHT = screen.get_size()  # Get the actual screen size
-RECT_WIDTH = WIDTH // COLS
-RECT_HEIGHT = HEIGHT // ROWS
-pygame.display.set_caption("Abstract Mood Art")
-
-# Main loop
-running = True
-color_grid = generate_color_grid(ROWS, COLS)
-
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
-
-while running:
-    # Handle events
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:  # Exit fullscreen on ESC
-                running = False
-
-    # Clear the screen
-    screen.fill((200, 200, 200))  # Background gray
-
-    # Draw rectangles
-    for row in range(ROWS):
-        for col in range(COLS):
-            color = color_grid[row][col]
-            x = col * RECT_WIDTH
-            y = row * RECT_HEIGHT
-            pygame.draw.rect(screen, color, (x, y, RECT_WIDTH, RECT_HEIGHT))
-
-    # Update colors in the grid gradually
-    for row in range(ROWS):
-        for col in range(COLS):
-            if random.random() < 0.1:  # Occasionally update a color
-                color_grid[row][col] = random_color()
-
-    # Update the display
-    pygame.display.flip()
-
-    # Limit frame rate
-    clock.tick(10)  # Adjust for slower/faster updates
-
-# Quit Pygame
-pygame.quit()
\ No newline at end of file
+def generate_color_grid(rows, cols, rng=random):
+    """Generate a grid of random colors, stored row by row in a flat list."""
+    return [random_color(rng) for _ in range(rows * cols)]
+
+def sample_changed_cells(count, chance, rng=random):
+    """Pick each of ``count`` cells with probability ``chance``.
+
+    Skips ahead by geometrically distributed gaps instead of rolling once
+    per cell, so the cost is proportional to the cells picked.
+    """
+    if chance <= 0:
+        return []
+    if chance >= 1:
+        return list(range(count))
+
+    log_miss = math.log(1.0 - chance)
+    uniform = rng.random
+    picked = []
+    index = -1
+    while True:
+        index += 1 + int(math.log(1.0 - uniform()) / log_miss)
+        if index >= count:
+            return picked
+        picked.append(index)
+
+
+class MoodArtScene(Scene):
+    caption = "Abstract Mood Art"
+    # Fullscreen at the native resolution
+    size = (0, 0)
+    fullscreen = True
+    target_fps = 10  # Adjust for slower/faster updates
+    background = (200, 200, 200)  # Background gray
+
+    ROWS, COLS = 6, 8  # Number of rows and columns in the grid
+    change_chance = 0.1  # Chance that a cell picks a new color each frame
+
+    def load(self, size):
+        super().load(size)
+        self.rect_width = self.width // self.COLS
+        self.rect_height = self.height // self.ROWS
+        self.color_grid = generate_color_grid(self.ROWS, self.COLS, self.random)
+        self.changed = []  # Cells recolored since the last draw
+        self.full_redraw = True
+
+    def resize(self, size):
+        # Keep the colors, just lay the cells out again
+        Scene.load(self, size)
+        self.rect_width = self.width // self.COLS
+        self.rect_height = self.height // self.ROWS
+        self.full_redraw = True
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def cell_rect(self, index):
+        row, col = divmod(index, self.COLS)
+        return pygame.Rect(col * self.rect_width, row * self.rect_height,
+                           self.rect_width, self.rect_height)
+
+    def update(self, dt):
+        # Update colors in the grid gradually
+        for index in sample_changed_cells(len(self.color_grid), self.change_chance, self.random):
+            self.color_grid[index] = random_color(self.random)
+            self.changed.append(index)
+
+    def draw(self, surface):
+        if self.full_redraw:
+            # Clear the screen and draw every rectangle
+            surface.fill(self.background)
+            for index, color in enumerate(self.color_grid):
+                surface.fill(color, self.cell_rect(index))
+            self.full_redraw = False
+            self.changed.clear()
+            return None
+
+        # Only redraw and upload the cells that changed
+        dirty = []
+        for index in self.changed:
+            rect = self.cell_rect(index)
+            surface.fill(self.color_grid[index], rect)
+            dirty.append(rect)
+        self.changed.clear()
+        return dirty
+
+
+class FadingMoodArtScene(Scene):
+    """Mood art where every cell eases toward a new color instead of jumping.
+
+    Grid state lives in NumPy arrays (current color, target color and
+    velocity per cell) and is stepped in one vectorized spring update,
+    solved exactly for the step so long frames cannot make it blow up. The
+    grid is rendered one pixel per cell into a low-res surface that is
+    scaled up to the screen once per frame.
+    """
+
+    caption = "Abstract Mood Art"
+    # Fullscreen at the native resolution
+    size = (0, 0)
+    fullscreen = True
+    target_fps = 60
+
+    ROWS, COLS = 25, 40  # Number of rows and columns in the grid
+    change_chance = 0.3  # Chance per second that a cell picks a new target color
+    fade_seconds = 1.5  # Roughly how long a cell takes to settle on its target
+
+    def prepare(self):
+        if np is None:
+            raise RuntimeError("the fading mood grid needs NumPy")
+        self.rng = self.random.numpy
+
+    def load(self, size):
+        super().load(size)
+        shape = (self.COLS, self.ROWS, 3)  # Column-major to match surfarray
+        self.current = self.rng.integers(50, 256, shape).astype(np.float32)
+        self.target = self.current.copy()
+        self.velocity = np.zeros(shape, np.float32)
+        self.pixels = np.empty(shape, np.uint8)
+        self.low_res = pygame.Surface((self.COLS, self.ROWS))
+
+        # Critically damped spring (stiffness omega**2, damping 2 * omega):
+        # no overshoot, settles in about fade_seconds
+        self.omega = 8.0 / self.fade_seconds
+
+    def resize(self, size):
+        # The grid is scaled to whatever surface it is drawn on
+        Scene.load(self, size)
+
+    def update(self, dt):
+        # Occasionally give cells a new color to fade toward
+        picked = self.rng.random((self.COLS, self.ROWS)) < self.change_chance * dt
+        self.target[picked] = self.rng.integers(50, 256, (int(picked.sum()), 3))
+
+        # Ease every cell toward its target with the closed-form critically
+        # damped solution, x(t) = (x0 + (v0 + omega * x0) * t) * exp(-omega * t),
+        # which is stable for any dt (semi-implicit Euler diverges past ~0.19 s)
+        omega = self.omega
+        decay = math.exp(-omega * dt)
+        offset = self.current - self.target
+        carry = self.velocity + omega * offset
+        self.current[:] = self.target + (offset + carry * dt) * decay
+        self.velocity -= omega * dt * carry
+        self.velocity *= decay
+
+        # A cell still moving fast from an old target may overshoot; stop it at the edge
+        clamped = (self.current < 0) | (self.current > 255)
+        if clamped.any():
+            np.clip(self.current, 0, 255, out=self.current)
+            self.velocity[clamped] = 0.0
+
+    def draw(self, surface):
+        self.pixels[:] = self.current
+        pygame.surfarray.blit_array(self.low_res, self.pixels)
+        pygame.transform.scale(self.low_res, surface.get_size(), surface)
+
+
+if __name__ == "__main__":
+    # python rand.py --fade for the smoothly fading variant
+    run_scene(FadingMoodArtScene if "--fade" in sys.argv[1:] else MoodArtScene)
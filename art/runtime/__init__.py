@@ -0,0 +1,37 @@
+"""Shared pygame runtime for the art scenes.
+
+Every script in ``art/`` is a :class:`Scene` plugin; the runtime owns the
+display, the event loop and frame pacing so those live in one place.
+"""
+
+from .colors import NEON_COLORS
+from .display import Display
+from .rng import SceneRandom
+from .scene import Scene
+from .scheduler import FrameScheduler
+from .app import run_scene
+from .registry import SCENES, load_scene_class
+from .textcache import GlyphAtlas, TextCache
+from .control import ControlServer, HttpError
+from .profiler import FrameProfiler
+from .renderscale import RenderScaler
+from .framepool import FramePool, PooledScene
+
+__all__ = [
+    "NEON_COLORS",
+    "Display",
+    "SceneRandom",
+    "Scene",
+    "FrameScheduler",
+    "run_scene",
+    "SCENES",
+    "load_scene_class",
+    "GlyphAtlas",
+    "TextCache",
+    "ControlServer",
+    "HttpError",
+    "FrameProfiler",
+    "RenderScaler",
+    "FramePool",
+    "PooledScene",
+]
@@ -0,0 +1,73 @@
+import os
+
+import pygame
+
+from .display import Display
+from .framepool import pooled_from_env
+from .profiler import FrameProfiler
+from .renderscale import RenderScaler
+from .rng import finish_stream, stream_from_env
+from .scheduler import FrameScheduler
+
+
+def is_quit_event(event):
+    """True for window close and the ESC key"""
+    return event.type == pygame.QUIT or (
+        event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE
+    )
+
+
+def run_scene(scene):
+    """Open a display and run ``scene`` (a Scene class or instance) until quit"""
+    if isinstance(scene, type):
+        scene = scene()
+
+    # ART_SEED / ART_REPLAY / ART_RECORD reproduce or capture a session
+    scene.random = stream_from_env(scene.seed)
+    print(f"[{scene.caption}] seed {scene.seed}")
+
+    # ART_WORKERS=n (or "auto" for one per core) draws frame-independent
+    # scenes ahead of time in worker processes
+    scene = pooled_from_env(scene)
+
+    # ART_FULLSCREEN=1 runs any scene at the native resolution, and
+    # ART_RENDER_SCALE renders it smaller and scales it up (see renderscale.py)
+    fullscreen = scene.fullscreen or bool(os.environ.get("ART_FULLSCREEN"))
+    scaler = RenderScaler.from_env()
+    display = Display((0, 0) if fullscreen else scene.size, scene.caption, fullscreen,
+                      scaler.scale, os.environ.get("ART_RENDER_FILTER") == "smooth")
+    surface = display.open()
+    scene.prepare()
+    scene.load(surface.get_size())
+    scheduler = FrameScheduler(scene.target_fps)
+    # F3 overlay, F4 cProfile capture; next to free while switched off
+    profiler = FrameProfiler.from_env()
+    profiler.budget_ms = scheduler.budget_ms
+
+    dt = 0.0
+    running = True
+    try:
+        while running:
+            with profiler.span("events"):
+                for event in pygame.event.get():
+                    if is_quit_event(event):
+                        running = False
+                    elif not profiler.handle_event(event):
+                        scene.handle_event(event)
+
+            with profiler.span("update"):
+                scene.update(dt)
+            with profiler.span("draw"):
+                dirty = scene.draw(surface)
+            dirty = profiler.draw_overlay(surface, dirty, scene)
+            with profiler.span("present"):
+                display.present(dirty)
+            dt = scheduler.tick()
+            profiler.end_frame()
+            if scaler.update(scheduler.work_ms, scheduler.budget_ms):
+                surface = display.set_render_scale(scaler.scale)
+                scene.resize(surface.get_size())
+    finally:
+        scene.unload()
+        display.close()
+        finish_stream(scene.random)
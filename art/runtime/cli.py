@@ -0,0 +1,40 @@
+"""Command-line helpers shared by the art scripts."""
+
+import argparse
+
+
+def parse_size(text):
+    """Parse WIDTHxHEIGHT (e.g. ``800x600``) into a (width, height) tuple
+
+    Meant as an argparse ``type``, so bad input gives a usage error.
+    """
+    width, _, height = text.lower().partition("x")
+    try:
+        size = int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, e.g. 800x600, not {text!r}") from None
+    if min(size) <= 0:
+        raise argparse.ArgumentTypeError(f"width and height must be positive, not {text!r}")
+    return size
+
+
+def positive_float(text):
+    """argparse ``type`` for a number greater than zero"""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number, not {text!r}") from None
+    if not value > 0:  # Also rejects nan
+        raise argparse.ArgumentTypeError(f"must be greater than zero, not {text!r}")
+    return value
+
+
+def positive_int(text):
+    """argparse ``type`` for a whole number greater than zero"""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, not {text!r}") from None
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than zero, not {text!r}")
+    return value
@@ -0,0 +1,10 @@
+# Define neon-like colors shared by every scene
+NEON_COLORS = [
+    (255, 0, 255),  # Magenta
+    (0, 255, 255),  # Cyan
+    (255, 255, 0),  # Yellow
+    (0, 255, 0),    # Lime
+    (0, 0, 255),    # Blue
+    (255, 165, 0),  # Orange
+    (255, 20, 147), # Pink
+]
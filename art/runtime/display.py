@@ -0,0 +1,63 @@
+import pygame
+
+
+class Display:
+    """Owns pygame initialisation and the window surface
+
+    With a render scale below 1 scenes draw into a smaller internal
+    surface, which ``present`` scales up to the window in one pass.
+    """
+
+    def __init__(self, size=(800, 600), caption="Raspberry Art", fullscreen=False,
+                 render_scale=1.0, smooth=False):
+        self.size = size
+        self.caption = caption
+        self.fullscreen = fullscreen
+        self.render_scale = render_scale
+        self.smooth = smooth  # smoothscale instead of nearest-neighbour scaling
+        self.window = None
+        self.surface = None
+
+    def open(self):
+        """Initialize pygame and create the window, returning the surface to draw on"""
+        pygame.init()
+        flags = pygame.FULLSCREEN if self.fullscreen else 0
+        self.window = pygame.display.set_mode(self.size, flags)
+        pygame.display.set_caption(self.caption)
+        self.surface = self._render_surface()
+        return self.surface
+
+    def _render_surface(self):
+        if self.render_scale >= 1.0:
+            return self.window
+        width, height = self.window.get_size()
+        size = (max(1, int(width * self.render_scale)), max(1, int(height * self.render_scale)))
+        return pygame.Surface(size).convert()
+
+    def set_render_scale(self, scale):
+        """Draw at ``scale`` times the window size from now on; returns the new surface"""
+        self.render_scale = scale
+        self.surface = self._render_surface()
+        return self.surface
+
+    def set_caption(self, caption):
+        self.caption = caption
+        pygame.display.set_caption(caption)
+
+    def present(self, rects=None):
+        """Show the frame, uploading only ``rects`` when given"""
+        if self.surface is not self.window:
+            # Scaled: any change means one upscale of the whole frame
+            if rects is not None and not rects:
+                return
+            scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+            scale(self.surface, self.window.get_size(), self.window)
+            pygame.display.flip()
+        elif rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
+
+    def close(self):
+        self.surface = self.window = None
+        pygame.quit()
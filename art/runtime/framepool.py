@@ -0,0 +1,279 @@
+"""Generate frames ahead of time on every core.
+
+A scene whose frames do not depend on each other (``frame_independent``)
+can be drawn by a pool of worker processes while the render loop only
+blits. Each worker runs its own copy of the scene and draws straight into
+a slot of a shared-memory ring (a ``pygame.image.frombuffer`` surface over
+``multiprocessing.shared_memory``), so pixels are never pickled or
+copied between processes; the render loop blits finished slots in frame
+order and hands them back for reuse.
+
+Frame ``n`` is drawn from a random stream seeded with ``frame_seed(seed,
+n)``, so the output does not depend on which worker drew which frame.
+``resize`` swaps in a ring of the new size and keeps the workers and the
+frame count, so a render-scale change does not restart the scene.
+
+    pool = FramePool(RandomizerScene, (800, 600), seed=1234, workers=4)
+    ...
+    if pool.blit_next(surface):
+        pygame.display.flip()
+    ...
+    pool.close()
+
+``PooledScene`` wraps a scene so the runtime can use a pool without
+knowing about it; ``pooled_from_env`` does that for ART_WORKERS=n (or
+"auto"), for ``run_scene`` and the playlist alike.
+"""
+
+import multiprocessing
+import os
+import queue
+import time
+from collections import deque
+from multiprocessing import shared_memory
+
+import pygame
+
+from .rng import SceneRandom, fresh_seed
+from .scene import Scene
+
+# Workers inherit the environment: one pygame banner is enough
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+PIXEL_FORMAT = "RGBX"  # 32 bits, no per-pixel alpha, so blits stay plain copies
+BYTES_PER_PIXEL = 4
+
+
+def frame_seed(seed, index):
+    """Seed for frame ``index`` of a run seeded with ``seed``"""
+    return seed * 2 ** 32 + index
+
+
+def _slot_surfaces(buffer, size, slots):
+    frame_bytes = size[0] * size[1] * BYTES_PER_PIXEL
+    return [pygame.image.frombuffer(buffer[slot * frame_bytes:(slot + 1) * frame_bytes], size, PIXEL_FORMAT)
+            for slot in range(slots)]
+
+
+def _worker(scene_class, seed, slots, tasks, results):
+    """Draw the frames named in ``tasks`` into their ring slots
+
+    A task names the ring it is for; when that changes (the pool was
+    resized) the worker attaches to the new ring and resizes its scene.
+    Tasks left over from before a resize are skipped.
+    """
+    shm = surfaces = None
+    current = -1  # Generation of the ring the worker is attached to
+    scene = scene_class()
+    scene.random = SceneRandom(seed)
+    scene.prepare()
+    try:
+        while True:
+            task = tasks.get()
+            if task is None:
+                break
+            index, slot, generation, size, shm_name = task
+            if generation < current:
+                continue
+            if generation > current:
+                try:
+                    ring = shared_memory.SharedMemory(name=shm_name)
+                except FileNotFoundError:
+                    continue  # Already replaced by a later resize
+                if shm is not None:
+                    # The surfaces hold views of the shared memory, which must go first
+                    surfaces = None
+                    shm.close()
+                shm = ring
+                surfaces = _slot_surfaces(shm.buf, size, slots)
+                scene.random = SceneRandom(seed)
+                if current < 0:
+                    scene.load(size)
+                else:
+                    scene.resize(size)
+                current = generation
+                dt = 1.0 / scene.target_fps
+            started = time.perf_counter()
+            scene.random = SceneRandom(frame_seed(seed, index))
+            scene.update(dt)
+            scene.draw(surfaces[slot])
+            results.put((index, slot, generation, time.perf_counter() - started))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if current >= 0:
+            scene.unload()
+        surfaces = None
+        if shm is not None:
+            shm.close()
+
+
+class FramePool:
+    def __init__(self, scene_class, size, seed=None, workers=None, slots=None):
+        if not getattr(scene_class, "frame_independent", False):
+            raise ValueError(f"{scene_class.__name__} draws frames that depend on earlier ones")
+        self.seed = fresh_seed() if seed is None else seed
+        self.workers = workers or os.cpu_count() or 1
+        self.slots = slots or 2 * self.workers + 2  # Enough to keep every worker busy
+        self.shown = 0
+        self.misses = 0  # Frames where the next frame was not ready yet
+        self.draw_seconds = 0.0  # Worker time spent drawing, over all frames
+        self.generation = 0  # Bumped by resize; older results are dropped
+        self._open_ring(size)
+
+        # Spawned, not forked: the parent's SDL state must not leak into workers
+        context = multiprocessing.get_context("spawn")
+        self.tasks = context.Queue()
+        self.results = context.Queue()
+        self.processes = [
+            context.Process(target=_worker, name=f"frame-worker-{number}", daemon=True,
+                            args=(scene_class, self.seed, self.slots, self.tasks, self.results))
+            for number in range(self.workers)
+        ]
+        for process in self.processes:
+            process.start()
+
+        self.free = deque(range(self.slots))
+        self.ready = {}  # frame index -> slot, finished but not yet shown
+        self.next_task = 0
+        self.next_frame = 0
+        self._submit()
+
+    def _open_ring(self, size):
+        self.size = size
+        frame_bytes = size[0] * size[1] * BYTES_PER_PIXEL
+        self.shm = shared_memory.SharedMemory(create=True, size=frame_bytes * self.slots)
+        self.surfaces = _slot_surfaces(self.shm.buf, size, self.slots)
+
+    def _close_ring(self):
+        self.surfaces = []
+        self.shm.close()
+        # Workers still drawing into it keep their mapping until they move on
+        self.shm.unlink()
+
+    def _drop_queued_tasks(self):
+        try:
+            while True:
+                self.tasks.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _submit(self):
+        while self.free:
+            self.tasks.put((self.next_task, self.free.popleft(), self.generation, self.size, self.shm.name))
+            self.next_task += 1
+
+    def _collect(self, block):
+        try:
+            while True:
+                index, slot, generation, seconds = self.results.get(block, 1.0) if block else self.results.get_nowait()
+                block = False
+                if generation != self.generation:
+                    continue  # Drawn at the old size before a resize
+                self.ready[index] = slot
+                self.draw_seconds += seconds
+        except queue.Empty:
+            if block and not all(process.is_alive() for process in self.processes):
+                raise RuntimeError("a frame worker died") from None
+
+    def blit_next(self, surface, wait=False):
+        """Blit the next frame in order onto ``surface``; False if it is not ready
+
+        With ``wait`` the call blocks until it is.
+        """
+        self._collect(False)
+        while wait and self.next_frame not in self.ready:
+            self._collect(True)
+        slot = self.ready.pop(self.next_frame, None)
+        if slot is None:
+            self.misses += 1
+            return False
+        surface.blit(self.surfaces[slot], (0, 0))
+        self.next_frame += 1
+        self.shown += 1
+        self.free.append(slot)
+        self._submit()
+        return True
+
+    def resize(self, size):
+        """Draw at ``size`` from the next frame on, keeping the workers and the frame count
+
+        Frames already drawn at the old size are thrown away and drawn
+        again at the new one.
+        """
+        if size == self.size:
+            return
+        self._drop_queued_tasks()
+        self._close_ring()
+        self._open_ring(size)
+        self.generation += 1
+        self.ready.clear()
+        self.free = deque(range(self.slots))
+        self.next_task = self.next_frame
+        self._submit()
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "slots": self.slots,
+            "shown": self.shown,
+            "misses": self.misses,
+            "ready": len(self.ready),
+            "draw_ms": round(1000.0 * self.draw_seconds / max(1, self.shown + len(self.ready)), 2),
+        }
+
+    def close(self):
+        # Drop frames nobody will show, so workers reach the stop markers
+        self._drop_queued_tasks()
+        for _ in self.processes:
+            self.tasks.put(None)
+        for process in self.processes:
+            process.join(2)
+            if process.is_alive():
+                process.terminate()
+        self._close_ring()
+
+
+class PooledScene(Scene):
+    """Shows a frame-independent scene drawn by a FramePool"""
+
+    def __init__(self, scene, workers=None):
+        super().__init__()
+        self.scene = scene
+        self.workers = workers
+        self.random = scene.random  # Same seed as the scene would have used
+        self.caption = scene.caption
+        self.size = scene.size
+        self.fullscreen = scene.fullscreen
+        self.target_fps = scene.target_fps
+        self.background = scene.background
+        self.pool = None
+
+    def load(self, size):
+        super().load(size)
+        self.pool = FramePool(type(self.scene), size, self.seed, self.workers)
+
+    def resize(self, size):
+        # Same workers and frame numbers, new ring
+        Scene.load(self, size)
+        self.pool.resize(size)
+
+    def draw(self, surface):
+        # Nothing new yet: keep the last frame on screen rather than stall
+        return None if self.pool.blit_next(surface) else []
+
+    def unload(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+
+def pooled_from_env(scene):
+    """``scene`` in a PooledScene if ART_WORKERS is set and its frames are independent
+
+    ART_WORKERS=n uses n worker processes, "auto" one per core.
+    """
+    workers = os.environ.get("ART_WORKERS")
+    if not workers or not scene.frame_independent:
+        return scene
+    return PooledScene(scene, None if workers == "auto" else int(workers))
@@ -0,0 +1,126 @@
+import os
+import random
+import time
+
+import pygame
+
+from .registry import load_scene_class
+from .rng import SceneRandom
+
+# pygame.draw functions counted as draw calls by CountingSurface.count_draw_calls
+_DRAW_FUNCTIONS = ("line", "lines", "aaline", "aalines", "rect", "circle",
+                   "ellipse", "arc", "polygon")
+
+# Per-scene settings that keep offline runs (bench, export) off the network
+OFFLINE_OVERRIDES = {
+    "poetry": {"poetry_source": "builtin", "poetry_prefetch": False},
+}
+
+
+def open_headless(size):
+    """Initialize pygame without a real display
+
+    Uses SDL's dummy video driver unless another driver was requested, so
+    scenes that convert surfaces to the display format still work.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    pygame.init()
+    return pygame.display.set_mode(size)
+
+
+def load_offline_scene(name, work_dir):
+    """A new ``name`` scene that runs offline and keeps its files in ``work_dir``
+
+    Nothing is fetched over the network and no user cache is read, so
+    runs with the same seed produce the same frames.
+    """
+    scene = load_scene_class(name)()
+    for attribute, value in OFFLINE_OVERRIDES.get(name, {}).items():
+        setattr(scene, attribute, value)
+    if hasattr(scene, "corpus_dir"):
+        scene.corpus_dir = work_dir
+    return scene
+
+
+class CountingSurface(pygame.Surface):
+    """Offscreen surface that counts the drawing calls a scene makes
+
+    ``calls`` counts each blit, blits and fill on this surface once, so a
+    batched ``blits`` is one call however many images it draws (those are
+    counted in ``blit_items``). With ``count_draw_calls``, pygame.draw
+    calls count too, on any surface, so scenes that draw onto surfaces of
+    their own are not undercounted.
+    """
+
+    def __init__(self, size):
+        super().__init__(size)
+        self.calls = 0
+        self.blit_items = 0  # Images drawn by blit and blits
+
+    def blit(self, *args, **kwargs):
+        self.calls += 1
+        self.blit_items += 1
+        return super().blit(*args, **kwargs)
+
+    def blits(self, blit_sequence, *args, **kwargs):
+        blit_sequence = list(blit_sequence)
+        self.calls += 1
+        self.blit_items += len(blit_sequence)
+        return super().blits(blit_sequence, *args, **kwargs)
+
+    def fill(self, *args, **kwargs):
+        self.calls += 1
+        return super().fill(*args, **kwargs)
+
+    def count_draw_calls(self):
+        """Count pygame.draw calls on any surface until restore() is called"""
+        originals = {name: getattr(pygame.draw, name) for name in _DRAW_FUNCTIONS}
+
+        def counting(function):
+            def wrapper(surface, *args, **kwargs):
+                self.calls += 1
+                return function(surface, *args, **kwargs)
+            return wrapper
+
+        for name, function in originals.items():
+            setattr(pygame.draw, name, counting(function))
+
+        def restore():
+            for name, function in originals.items():
+                setattr(pygame.draw, name, function)
+        return restore
+
+
+def render_frames(scene, size, frames, dt, seed=None, surface=None, on_frame=None, stream=None):
+    """Run ``scene`` offscreen for ``frames`` fixed steps of ``dt`` seconds
+
+    Gives the scene a random stream seeded with ``seed`` (or ``stream``,
+    e.g. a replay) and seeds the global ``random`` module too, then calls
+    ``on_frame(index, surface, seconds)`` after every frame with the time
+    that frame's update and draw took.
+    """
+    if isinstance(scene, type):
+        scene = scene()
+    if stream is not None:
+        scene.random = stream
+    elif seed is not None:
+        scene.random = SceneRandom(seed)
+    if scene.seed is not None:
+        random.seed(scene.seed)
+    if surface is None:
+        surface = pygame.Surface(size)
+
+    scene.prepare()
+    scene.load(size)
+    try:
+        for index in range(frames):
+            started = time.perf_counter()
+            scene.update(dt)
+            scene.draw(surface)
+            elapsed = time.perf_counter() - started
+            if on_frame is not None:
+                on_frame(index, surface, elapsed)
+    finally:
+        scene.unload()
+    return scene
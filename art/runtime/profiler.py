@@ -0,0 +1,251 @@
+"""Frame-time profiling for the art scenes.
+
+The runtime wraps each part of a frame in a named span (events, update,
+draw, present) and calls ``end_frame`` once per frame:
+
+    with profiler.span("draw"):
+        dirty = scene.draw(surface)
+
+While profiling is off, ``span`` hands back one shared no-op context
+manager and ``end_frame`` returns at once, so an idle profiler costs a few
+attribute lookups per frame.
+
+Keys (also for scenes run by the playlist):
+    F3  show or hide the overlay: FPS, time per span and a frame-time graph
+    F4  run cProfile over the next ``capture_frames`` frames and print
+        the top functions; the full stats go to a .prof file
+
+Environment:
+    ART_PROFILE=1        start with the overlay shown
+    ART_PROFILE_LOG=path  append a summary every ``dump_interval`` seconds
+                          to a rotating log
+    ART_PROFILE_FRAMES=n  frames per F4 capture (default 300)
+"""
+
+import cProfile
+import json
+import logging
+import os
+import pstats
+import time
+from collections import deque
+from logging.handlers import RotatingFileHandler
+
+import pygame
+
+OVERLAY_SIZE = (260, 110)
+OVERLAY_BACKGROUND = (0, 0, 0)
+OVERLAY_TEXT = (0, 255, 0)
+GRAPH_COLOR = (0, 255, 255)
+BUDGET_COLOR = (255, 0, 0)
+
+
+class _NullSpan:
+    """What ``span`` returns while profiling is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("totals", "name", "started")
+
+    def __init__(self, totals, name):
+        self.totals = totals
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        # A span may be entered several times in one frame; the times add up
+        self.totals[self.name] += time.perf_counter() - self.started
+        return False
+
+
+class FrameProfiler:
+    def __init__(self, history=240, log_path=None, dump_interval=10.0, capture_frames=300):
+        self.history = history  # Frames kept for the graph and the summaries
+        self.dump_interval = dump_interval
+        self.capture_frames = capture_frames
+        self.budget_ms = None  # Frame budget drawn as a line in the graph
+
+        self.enabled = False
+        self.overlay = False
+        self.frame_ms = deque(maxlen=history)
+        self.span_ms = {}  # name -> deque of ms per frame
+        self._totals = {}  # name -> seconds in the current frame
+        self._spans = {}
+        self._last_frame = None
+        self._hidden = False  # Overlay just hidden, so the scene must redraw under it
+        self._font = None
+        self._panel = None
+
+        self._profile = None
+        self._capture_left = 0
+
+        self.logger = None
+        self._next_dump = None
+        if log_path:
+            self.logger = logging.getLogger(f"art.profiler.{log_path}")
+            self.logger.propagate = False
+            handler = RotatingFileHandler(log_path, maxBytes=1024 * 1024, backupCount=3)
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            self.logger.addHandler(handler)
+            self.logger.setLevel(logging.INFO)
+            self.set_enabled(True)
+
+    @classmethod
+    def from_env(cls):
+        profiler = cls(log_path=os.environ.get("ART_PROFILE_LOG") or None,
+                       capture_frames=int(os.environ.get("ART_PROFILE_FRAMES") or 300))
+        if os.environ.get("ART_PROFILE"):
+            profiler.show_overlay(True)
+        return profiler
+
+    def set_enabled(self, enabled):
+        if enabled and not self.enabled:
+            # Start from a clean frame rather than timing the gap since last time
+            self._last_frame = None
+            for name in self._totals:
+                self._totals[name] = 0.0
+            if self.logger is not None:
+                self._next_dump = time.monotonic() + self.dump_interval
+        self.enabled = enabled
+
+    def show_overlay(self, visible):
+        self._hidden = self.overlay and not visible
+        self.overlay = visible
+        self.set_enabled(visible or self.logger is not None)
+
+    # Measuring
+
+    def span(self, name):
+        """Context manager timing one part of the frame"""
+        if not self.enabled:
+            return _NULL_SPAN
+        span = self._spans.get(name)
+        if span is None:
+            span = self._spans[name] = _Span(self._totals, name)
+            self._totals[name] = 0.0
+            self.span_ms[name] = deque(maxlen=self.history)
+        return span
+
+    def end_frame(self):
+        """Close the current frame; call once per frame after pacing"""
+        if self._capture_left:
+            self._capture_left -= 1
+            if not self._capture_left:
+                self.finish_capture()
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if self._last_frame is not None:
+            self.frame_ms.append((now - self._last_frame) * 1000.0)
+            for name, seconds in self._totals.items():
+                self.span_ms[name].append(seconds * 1000.0)
+                self._totals[name] = 0.0
+        self._last_frame = now
+
+        if self._next_dump is not None and time.monotonic() >= self._next_dump:
+            self._next_dump += self.dump_interval
+            self.logger.info(json.dumps(self.summary()))
+
+    def summary(self):
+        """FPS, frame time and mean time per span over the kept history"""
+        frames = sorted(self.frame_ms)
+        if not frames:
+            return {"frames": 0}
+        mean = sum(frames) / len(frames)
+        return {
+            "frames": len(frames),
+            "fps": round(1000.0 / mean, 1) if mean else 0.0,
+            "frame_ms": round(mean, 2),
+            "p95_ms": round(frames[min(len(frames) - 1, int(0.95 * len(frames)))], 2),
+            "spans_ms": {name: round(sum(values) / len(values), 3)
+                         for name, values in self.span_ms.items() if values},
+        }
+
+    # cProfile capture
+
+    def start_capture(self, frames=None):
+        if self._profile is not None:
+            return
+        self._capture_left = frames or self.capture_frames
+        print(f"[profiler] profiling the next {self._capture_left} frames")
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+
+    def finish_capture(self):
+        profile, self._profile = self._profile, None
+        profile.disable()
+        path = time.strftime("art-profile-%Y%m%d-%H%M%S.prof")
+        profile.dump_stats(path)
+        print(f"[profiler] wrote {path}; top functions by cumulative time:")
+        pstats.Stats(profile).sort_stats("cumulative").print_stats(15)
+
+    # Keys and overlay
+
+    def handle_event(self, event):
+        """React to F3/F4; returns True when the event was used"""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == pygame.K_F3:
+            self.show_overlay(not self.overlay)
+            return True
+        if event.key == pygame.K_F4:
+            self.start_capture()
+            return True
+        return False
+
+    def draw_overlay(self, surface, dirty, scene):
+        """Draw the overlay over the frame; returns the rects to present"""
+        if self._hidden:
+            # Let the scene paint over where the overlay was
+            self._hidden = False
+            scene.invalidate()
+            return None
+        if not self.overlay:
+            return dirty
+
+        if self._font is None:
+            self._font = pygame.font.Font(None, 18)
+            self._panel = pygame.Surface(OVERLAY_SIZE)
+        panel = self._panel
+        panel.fill(OVERLAY_BACKGROUND)
+        width, height = OVERLAY_SIZE
+
+        stats = self.summary()
+        lines = [f"{stats.get('fps', 0):5.1f} fps  {stats.get('frame_ms', 0):5.1f} ms"
+                 f"  p95 {stats.get('p95_ms', 0):5.1f}"]
+        lines.append("  ".join(f"{name} {ms:.1f}" for name, ms in stats.get("spans_ms", {}).items()))
+        y = 2
+        for line in lines:
+            panel.blit(self._font.render(line, True, OVERLAY_TEXT), (4, y))
+            y += self._font.get_linesize()
+
+        # Frame times, newest on the right; twice the budget fills the graph
+        graph_top = y + 2
+        graph_height = height - graph_top - 2
+        scale_ms = 2 * (self.budget_ms or 33.3)
+        if self.budget_ms:
+            budget_y = graph_top + graph_height // 2
+            pygame.draw.line(panel, BUDGET_COLOR, (0, budget_y), (width, budget_y))
+        frames = list(self.frame_ms)[-width:]
+        if len(frames) > 1:
+            offset = width - len(frames)
+            points = [(offset + x, graph_top + graph_height - min(graph_height, int(ms / scale_ms * graph_height)))
+                      for x, ms in enumerate(frames)]
+            pygame.draw.lines(panel, GRAPH_COLOR, False, points)
+
+        rect = surface.blit(panel, (0, 0))
+        return None if dirty is None else list(dirty) + [rect]
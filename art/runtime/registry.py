@@ -0,0 +1,28 @@
+import importlib
+
+# Scene name -> "module:Class"; modules are imported on first use so a
+# launcher only pays for the scenes it actually shows
+SCENES = {
+    "stocks": "neon_stocks:StocksScene",
+    "poetry": "neon_poetry:PoetryScene",
+    "randomizer": "neon_randomizer:RandomizerScene",
+    "randomizer-glow": "neon_randomizer:AfterglowScene",
+    "turtle": "turtle_art:TurtleScene",
+    "synapses": "neon_synapeses:SynapseScene",
+    "synapses-dense": "neon_synapeses:DenseSynapseScene",
+    "synapse-network": "neon_synapeses:SynapseNetworkScene",
+    "mood": "rand:MoodArtScene",
+    "mood-fade": "rand:FadingMoodArtScene",
+}
+
+
+def load_scene_class(name):
+    """Import and return the Scene class registered as ``name``
+
+    ``name`` may also be a "module:Class" path for scenes not in SCENES.
+    """
+    target = SCENES.get(name, name)
+    module_name, _, class_name = target.partition(":")
+    if not class_name:
+        raise KeyError(f"Unknown scene: {name}")
+    return getattr(importlib.import_module(module_name), class_name)
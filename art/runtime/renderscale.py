@@ -0,0 +1,79 @@
+"""Automatic render scale: trade resolution for frame rate.
+
+Scenes draw into an internal surface of ``render scale`` times the window
+size, which the display scales up once per frame (see
+:class:`~runtime.display.Display`). :class:`RenderScaler` watches how long
+frames take and moves the scale with hysteresis: it steps down when
+frames run close to the budget (straight to an estimate when far over),
+steps up one step at a time only when they have plenty of room, and
+waits a while after every change so the frame times settle before it
+looks again.
+
+Environment:
+    ART_RENDER_SCALE=auto   adjust automatically (start at full resolution)
+    ART_RENDER_SCALE=0.5    fixed scale
+    ART_RENDER_FILTER=smooth  smoothscale the upscale (default: nearest,
+                              which costs far less at large window sizes)
+"""
+
+import math
+import os
+from collections import deque
+
+
+class RenderScaler:
+    def __init__(self, scale=1.0, auto=False, min_scale=0.4, max_scale=1.0, step=0.1,
+                 high=0.9, low=0.55, window=20, cooldown=30):
+        self.scale = scale
+        self.auto = auto
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self.step = step
+        self.high = high  # Step down above this fraction of the budget...
+        self.low = low  # ...and up below this one
+        self.cooldown = cooldown  # Frames to ignore after a change
+        self.samples = deque(maxlen=window)
+        self._cooldown_left = cooldown
+
+    @classmethod
+    def from_env(cls):
+        return cls.from_setting(os.environ.get("ART_RENDER_SCALE"))
+
+    @classmethod
+    def from_setting(cls, setting):
+        """A scaler for "auto", a fixed scale such as "0.5", or None for full resolution"""
+        setting = (setting or "").strip().lower()
+        if setting == "auto":
+            return cls(auto=True)
+        if setting:
+            return cls(scale=min(1.0, max(0.1, float(setting))))
+        return cls()
+
+    def update(self, work_ms, budget_ms):
+        """Note one frame's work time; returns True when the scale changed"""
+        if not self.auto:
+            return False
+        self.samples.append(work_ms)
+        if self._cooldown_left:
+            self._cooldown_left -= 1
+            return False
+        if len(self.samples) < self.samples.maxlen:
+            return False
+
+        # The median ignores the odd stall (GC, a slow event)
+        typical = sorted(self.samples)[len(self.samples) // 2]
+        if typical > budget_ms * self.high and self.scale > self.min_scale:
+            # Frame time goes roughly with the pixel count, so a frame far
+            # over budget jumps straight to about the right scale
+            estimate = self.scale * math.sqrt(budget_ms * self.high / typical)
+            scale = max(self.min_scale, min(self.scale - self.step, math.floor(estimate / self.step) * self.step))
+        elif typical < budget_ms * self.low and self.scale < self.max_scale:
+            scale = min(self.max_scale, self.scale + self.step)
+        else:
+            return False
+
+        self.scale = round(scale, 3)
+        self.samples.clear()
+        self._cooldown_left = self.cooldown
+        print(f"[render] scale {self.scale:.0%} (typical frame {typical:.1f} ms, budget {budget_ms:.1f} ms)")
+        return True
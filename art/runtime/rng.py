@@ -0,0 +1,153 @@
+"""Seeded, recordable random streams for the art scenes.
+
+Every scene gets its own :class:`SceneRandom` (``scene.random``) instead of
+sharing the global ``random`` module, so a run is reproduced exactly by its
+seed. It is a ``random.Random`` whose uniform numbers are served from
+blocks drawn in bulk from a NumPy Generator (or from the Mersenne Twister
+when NumPy is missing), which keeps per-call overhead down in hot loops.
+``randint`` and ``choice`` take one number from the block each, and so
+does every integer draw behind ``randrange``, ``shuffle`` and ``sample``.
+Only ``getrandbits``/``randbytes`` still come straight from the Mersenne
+Twister; they are not recorded.
+
+The scalar stream can be recorded and replayed, so a session can be
+regenerated frame for frame from a file (bug reports, pixel-diff tests)
+even if the generator changes between versions. Array-heavy scenes use
+``scene.random.numpy``, a second Generator derived from the same seed;
+replays reproduce it from the seed stored in the recording.
+"""
+
+import json
+import os
+import random
+import secrets
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def fresh_seed():
+    return secrets.randbits(32)
+
+
+class SceneRandom(random.Random):
+    block_size = 4096  # Uniform numbers drawn per refill
+
+    def __init__(self, seed=None):
+        self.seed_value = fresh_seed() if seed is None else seed
+        super().__init__(self.seed_value)
+        if np is not None:
+            # Independent streams for the scalar blocks and for array draws
+            self._generator = np.random.default_rng([self.seed_value, 0])
+            self.numpy = np.random.default_rng([self.seed_value, 1])
+        else:
+            self._generator = None
+            self.numpy = None
+        self._block = []
+        self._position = 0
+        self._recording = None  # Blocks served so far, while recording
+        self._replay = None  # Recorded blocks still to serve
+
+    # Core stream
+
+    def _draw_block(self):
+        if self._generator is not None:
+            return self._generator.random(self.block_size)
+        draw = super().random
+        return array("d", (draw() for _ in range(self.block_size)))
+
+    def _refill(self):
+        # Always advance the generator, so a replay that runs out carries on
+        # exactly where the recorded session would have
+        block = self._draw_block()
+        if self._replay:
+            block = self._replay.pop(0)
+        if self._recording is not None:
+            self._recording.append(block)
+        self._block = block.tolist()
+        self._position = 0
+
+    def random(self):
+        """Uniform float in [0, 1) from the current block"""
+        if self._position >= len(self._block):
+            self._refill()
+        value = self._block[self._position]
+        self._position += 1
+        return value
+
+    def randint(self, a, b):
+        """Integer in [a, b], from a single uniform draw"""
+        if b < a:
+            raise ValueError(f"empty range in randint({a}, {b})")
+        return a + int(self.random() * (b - a + 1))
+
+    def _randbelow(self, n):
+        # Behind randrange, shuffle and sample; one uniform draw, so they
+        # are recorded and replayed like everything else (exact for n < 2**53)
+        return int(self.random() * n)
+
+    def choice(self, seq):
+        return seq[int(self.random() * len(seq))]
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    # Record and replay
+
+    def start_recording(self):
+        """Keep every block served from now on for :meth:`save_recording`"""
+        self._recording = []
+        # Restart the block so the recording holds everything drawn from here
+        self._position = len(self._block)
+
+    def save_recording(self, path):
+        """Write the seed and the recorded blocks to ``path``"""
+        blocks = self._recording or []
+        header = {"seed": self.seed_value, "block_size": self.block_size, "blocks": len(blocks)}
+        with open(path, "wb") as f:
+            f.write(json.dumps(header).encode("utf-8") + b"\n")
+            for block in blocks:
+                f.write(array("d", block).tobytes())
+
+    @classmethod
+    def replay(cls, path):
+        """A stream that serves the blocks recorded in ``path``, then carries on from its seed"""
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            payload = f.read()
+        stream = cls(header["seed"])
+        stream.block_size = header["block_size"]
+        values = array("d")
+        values.frombytes(payload)
+        size = stream.block_size
+        stream._replay = [values[start:start + size] for start in range(0, len(values), size)]
+        return stream
+
+
+def stream_from_env(seed=None):
+    """A stream set up from the environment, for scripts run by hand
+
+    ``ART_REPLAY=path`` replays a recording, ``ART_SEED=n`` fixes the seed
+    (otherwise ``seed``, or a fresh one) and ``ART_RECORD=path`` records
+    the session; see :func:`finish_stream`.
+    """
+    replay = os.environ.get("ART_REPLAY")
+    if replay:
+        stream = SceneRandom.replay(replay)
+    else:
+        env_seed = os.environ.get("ART_SEED")
+        stream = SceneRandom(int(env_seed) if env_seed else seed)
+    if os.environ.get("ART_RECORD"):
+        stream.start_recording()
+    return stream
+
+
+def finish_stream(stream):
+    """Save the recording started by :func:`stream_from_env`, if any"""
+    path = os.environ.get("ART_RECORD")
+    if path:
+        stream.save_recording(path)
+        print(f"[rng] recorded seed {stream.seed_value} to {path}")
@@ -0,0 +1,86 @@
+from .rng import SceneRandom
+
+
+class Scene:
+    """Base class for an art scene.
+
+    Subclasses set the class attributes below and override ``update`` and
+    ``draw``. The runtime calls ``prepare`` once for slow warm-up work,
+    ``load`` once the display size is known, then
+    ``handle_event``/``update``/``draw`` every frame, and ``unload`` when
+    the scene is stopped. A scene may be loaded again after ``unload``.
+    """
+
+    caption = "Raspberry Art"
+    size = (800, 600)  # Window size; (0, 0) means the native resolution
+    fullscreen = False
+    target_fps = 30
+    background = (0, 0, 0)
+    seed = None  # Fixed seed for reproducible runs; None picks a fresh one
+    # True when every frame is drawn from scratch out of ``random`` alone, so
+    # frames can be drawn out of order by worker processes (see framepool.py)
+    frame_independent = False
+    _random = None
+
+    def __init__(self):
+        self.width, self.height = self.size
+
+    @property
+    def random(self):
+        """This scene's own random stream, created from ``seed`` on first use
+
+        Use it (and ``random.numpy`` for array draws) instead of the global
+        ``random`` module, so that runs can be reproduced and replayed.
+        """
+        if self._random is None:
+            self._random = SceneRandom(self.seed)
+        return self._random
+
+    @random.setter
+    def random(self, stream):
+        # Install a seeded or replayed stream before ``prepare``
+        self._random = stream
+        self.seed = stream.seed_value
+
+    def prepare(self):
+        """Do slow warm-up work (I/O, precomputation) ahead of ``load``
+
+        This may run on a background thread while another scene is on
+        screen, so it must not touch the display or render fonts.
+        """
+
+    def load(self, size):
+        """Prepare the scene for a surface of the given size"""
+        self.width, self.height = size
+
+    def resize(self, size):
+        """The surface changed size, e.g. because the render scale changed
+
+        The default starts the scene afresh at the new size; scenes with
+        state worth keeping override this.
+        """
+        self.unload()
+        self.load(size)
+
+    def handle_event(self, event):
+        """React to a pygame event the runtime did not consume"""
+
+    def update(self, dt):
+        """Advance the scene by ``dt`` seconds"""
+
+    def draw(self, surface):
+        """Render the current frame onto ``surface``
+
+        Returning a list of rects asks the display to upload only those
+        areas; returning None presents the whole surface.
+        """
+        surface.fill(self.background)
+
+    def invalidate(self):
+        """Something else drew over the surface; redraw all of it next frame
+
+        Only scenes that return dirty rects from ``draw`` need to care.
+        """
+
+    def unload(self):
+        """Release anything the scene allocated in ``load``"""
@@ -0,0 +1,41 @@
+import pygame
+
+
+class FrameScheduler:
+    """Paces the main loop with ``pygame.time.Clock.tick``.
+
+    Unlike a fixed ``pygame.time.delay`` the clock subtracts the time the
+    frame already took, so the real frame rate holds at ``target_fps``
+    until the work itself exceeds the frame-time budget.
+    """
+
+    # Longest step handed to a scene, so a stall does not teleport motion
+    max_dt = 0.25
+
+    def __init__(self, target_fps, budget_ms=None):
+        self.clock = pygame.time.Clock()
+        self.set_target_fps(target_fps, budget_ms)
+        self.frames = 0
+        self.overruns = 0  # Frames whose work alone exceeded the budget
+
+    def set_target_fps(self, target_fps, budget_ms=None):
+        """Change the pace, e.g. when a different scene takes over the display"""
+        self.target_fps = target_fps
+        self.budget_ms = budget_ms if budget_ms is not None else 1000.0 / target_fps
+
+    def tick(self):
+        """Wait for the next frame and return the elapsed time in seconds"""
+        elapsed_ms = self.clock.tick(self.target_fps)
+        self.frames += 1
+        if self.clock.get_rawtime() > self.budget_ms:
+            self.overruns += 1
+        return min(elapsed_ms / 1000.0, self.max_dt)
+
+    @property
+    def fps(self):
+        return self.clock.get_fps()
+
+    @property
+    def work_ms(self):
+        """Time the last frame spent before waiting, in milliseconds"""
+        return self.clock.get_rawtime()
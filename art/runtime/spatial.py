@@ -0,0 +1,85 @@
+import numpy as np
+
+# Cell offsets that cover every neighboring pair of cells exactly once
+_HALF_NEIGHBORHOOD = ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1))
+
+
+class UniformGrid:
+    """Uniform-grid spatial index for finding pairs of nearby points.
+
+    Points are bucketed into square cells and kept sorted by cell. The sort
+    order carries over between ``update`` calls, so when points drift a
+    little per frame re-sorting is close to linear, and frames where no
+    point changed cell skip it entirely. Pair searches only compare points
+    in the same or adjacent cells, all in vectorized NumPy.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = float(cell_size)
+        self.positions = None
+        self.order = None  # Point indices sorted by cell
+        self.keys = None  # Cell key of every point
+
+    def update(self, positions):
+        """Re-bucket points after they moved; ``positions`` is an (n, 2) array"""
+        self.positions = positions
+        cells = np.floor(positions / self.cell_size).astype(np.int64)
+        # Offset so keys are non-negative and adjacent columns never collide
+        cells -= cells.min(axis=0) - 1
+        self._stride = int(cells[:, 1].max()) + 2
+        keys = cells[:, 0] * self._stride + cells[:, 1]
+
+        if self.order is None or len(self.order) != len(keys):
+            self.order = np.argsort(keys, kind="stable")
+        elif not np.array_equal(keys, self.keys):
+            # The previous order is nearly sorted already, which the stable
+            # (merge/timsort) sort handles in close to linear time
+            self.order = self.order[np.argsort(keys[self.order], kind="stable")]
+        self.keys = keys
+
+        sorted_keys = keys[self.order]
+        self._cells, self._starts, self._counts = np.unique(
+            sorted_keys, return_index=True, return_counts=True
+        )
+
+    def pairs_within(self, radius):
+        """Return index arrays (i, j) of every pair of points closer than ``radius``
+
+        ``radius`` must not exceed the cell size.
+        """
+        if radius > self.cell_size:
+            raise ValueError("radius must not exceed the grid cell size")
+
+        cells, starts, counts = self._cells, self._starts, self._counts
+        firsts, seconds = [], []
+        for dx, dy in _HALF_NEIGHBORHOOD:
+            # Pair every occupied cell with its occupied neighbor at (dx, dy)
+            wanted = cells + dx * self._stride + dy
+            match = np.searchsorted(cells, wanted)
+            match[match == len(cells)] = 0
+            found = np.nonzero(cells[match] == wanted)[0]
+            if not len(found):
+                continue
+            a, b = found, match[found]
+
+            # Expand every cell pair into all of its point pairs
+            sizes = counts[a] * counts[b]
+            pair = np.repeat(np.arange(len(a)), sizes)
+            local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            first = starts[a][pair] + local // counts[b][pair]
+            second = starts[b][pair] + local % counts[b][pair]
+            if dx == 0 and dy == 0:
+                keep = first < second  # Each pair inside a cell once
+                first, second = first[keep], second[keep]
+            firsts.append(first)
+            seconds.append(second)
+
+        if not firsts:
+            empty = np.empty(0, np.int64)
+            return empty, empty
+
+        first = self.order[np.concatenate(firsts)]
+        second = self.order[np.concatenate(seconds)]
+        delta = self.positions[first] - self.positions[second]
+        close = np.einsum("ij,ij->i", delta, delta) < radius * radius
+        return first[close], second[close]
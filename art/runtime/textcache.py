@@ -0,0 +1,120 @@
+from collections import OrderedDict
+
+import pygame
+
+
+def surface_bytes(surface):
+    """Approximate pixel memory held by a surface"""
+    return surface.get_pitch() * surface.get_height()
+
+
+class GlyphAtlas:
+    """Per-glyph surfaces that whole lines are composed from.
+
+    Each character is rendered once per font/color/antialias combination,
+    so a new line of text costs a handful of blits instead of a full
+    ``font.render``. Kerning is not applied between cached glyphs.
+    """
+
+    def __init__(self):
+        self._glyphs = {}
+        self.bytes_held = 0
+
+    def glyph(self, font, font_key, char, color, antialias):
+        key = (font_key, char, color, antialias)
+        surface = self._glyphs.get(key)
+        if surface is None:
+            surface = font.render(char, antialias, color)
+            self._glyphs[key] = surface
+            self.bytes_held += surface_bytes(surface)
+        return surface
+
+    def compose(self, font, font_key, text, color, antialias):
+        width, height = font.size(text)
+        surface = pygame.Surface((max(width, 1), height), pygame.SRCALPHA)
+        x = 0
+        for char, metrics in zip(text, font.metrics(text)):
+            if metrics is None:  # Character missing from the font
+                continue
+            surface.blit(self.glyph(font, font_key, char, color, antialias), (x, 0))
+            x += metrics[4]  # Horizontal advance
+        return surface
+
+    def clear(self):
+        self._glyphs.clear()
+        self.bytes_held = 0
+
+
+class TextCache:
+    """Rendered text surfaces with a memory cap and LRU eviction.
+
+    Surfaces are keyed by (text, font name, size, bold, color, antialias),
+    so re-rendering a line in a color it has had before is a dict lookup.
+    ``stats()`` reports hits, misses, evictions and bytes held, which is
+    what to watch when sizing ``max_bytes`` for a long-running kiosk.
+    """
+
+    def __init__(self, max_bytes=8 * 1024 * 1024, use_glyph_atlas=False):
+        self.max_bytes = max_bytes
+        self.atlas = GlyphAtlas() if use_glyph_atlas else None
+        self._fonts = {}
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes_held = 0
+
+    def font(self, name, size, bold=False):
+        """Return a shared SysFont, loading it on first use"""
+        key = (name, size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            font = self._fonts[key] = pygame.font.SysFont(name, size, bold=bold)
+        return font
+
+    def render(self, text, name, size, color, antialias=True, bold=False):
+        """Return the surface for ``text``, rendering it only on a miss"""
+        color = tuple(color)
+        key = (text, name, size, bold, color, antialias)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        font = self.font(name, size, bold)
+        if self.atlas is not None:
+            surface = self.atlas.compose(font, (name, size, bold), text, color, antialias)
+        else:
+            surface = font.render(text, antialias, color)
+        self._store(key, surface)
+        return surface
+
+    def _store(self, key, surface):
+        self._surfaces[key] = surface
+        self.bytes_held += surface_bytes(surface)
+
+        # Evict least recently used surfaces, always keeping the newest one
+        while self.bytes_held > self.max_bytes and len(self._surfaces) > 1:
+            _, evicted = self._surfaces.popitem(last=False)
+            self.bytes_held -= surface_bytes(evicted)
+            self.evictions += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._surfaces),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes_held": self.bytes_held,
+            "glyph_bytes": self.atlas.bytes_held if self.atlas is not None else 0,
+        }
+
+    def clear(self):
+        self._surfaces.clear()
+        self.bytes_held = 0
+        if self.atlas is not None:
+            self.atlas.clear()
@@ -1,25 +1,207 @@
-import turtle
-import random
-
-# Set up the turtle
-turtle.bgcolor('black')
-turtle.colormode(255)
-turtle.speed(0)
-
-while True:  # Infinite loop to keep repeating
-    # Forward drawing
-    for x in range(500):
-        r, g, b = random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)
-        turtle.pencolor(r, g, b)
-        turtle.fd(x + 50)
-        turtle.rt(91)
-    
-    # Reverse drawing
-    for x in range(500, 0, -1):
-        r, g, b = random.randint(0, 255), random.randint(0, 255), random.randint(0, 255)
-        turtle.pencolor(r, g, b)
-        turtle.bk(x + 50)
-        turtle.lt(91)
-
-# Keep the window open until clicked
-turtle.exitonclick()
+"""
+Turtle spiral: a line that turns 91 degrees after every step, growing and
+then shrinking again, in a new random color per segment.
+
+    python turtle_art.py            # Tk turtle window
+    python turtle_art.py --pygame   # the same spiral as a runtime scene
+
+The path is worked out with plain trigonometry (``spiral_path``) instead
+of driving a turtle, so both backends share it. The Tk backend turns the
+tracer off, draws straight onto the turtle canvas in batches at a fixed
+frame rate, and keeps the canvas small by flattening the line items into
+a single image every so often, so it runs for days without slowing down.
+"""
+
+import base64
+import math
+import sys
+
+import pygame
+
+from runtime import Scene, run_scene
+from runtime.rng import stream_from_env
+
+STEPS = 500  # Segments per half cycle
+TURN = 91  # Degrees turned after every segment
+BASE_LENGTH = 50
+
+# Headings are always whole degrees, so their directions come from a table
+_COS = [math.cos(math.radians(angle)) for angle in range(360)]
+_SIN = [math.sin(math.radians(angle)) for angle in range(360)]
+
+
+def spiral_path(rng, recenter=True):
+    """Yield (x0, y0, x1, y1, (r, g, b)) segments forever, in turtle coordinates
+
+    Follows the original turtle program: forward ``x + 50`` then right 91
+    degrees for x = 0..499, then back ``x + 50`` and left 91 degrees for
+    x = 500..1. The origin is the screen center and y points up. A cycle
+    does not end where it started (it drifts by about 590 pixels), so with
+    ``recenter`` every cycle starts from the center again instead of
+    wandering off screen after the second one.
+    """
+    randint = rng.randint
+    cos, sin = _COS, _SIN
+    x = y = 0.0
+    heading = 0  # East, like a new turtle
+    while True:
+        if recenter:
+            x = y = 0.0
+            heading = 0
+        # Forward drawing
+        for step in range(STEPS):
+            color = (randint(0, 255), randint(0, 255), randint(0, 255))
+            length = step + BASE_LENGTH
+            next_x, next_y = x + length * cos[heading], y + length * sin[heading]
+            yield x, y, next_x, next_y, color
+            x, y = next_x, next_y
+            heading = (heading - TURN) % 360
+
+        # Reverse drawing
+        for step in range(STEPS, 0, -1):
+            color = (randint(0, 255), randint(0, 255), randint(0, 255))
+            length = step + BASE_LENGTH
+            next_x, next_y = x - length * cos[heading], y - length * sin[heading]
+            yield x, y, next_x, next_y, color
+            x, y = next_x, next_y
+            heading = (heading + TURN) % 360
+
+
+class CanvasFlattener:
+    """Folds the turtle canvas's line items into one image now and then
+
+    Every segment drawn is also remembered here; ``flatten`` draws them
+    onto an offscreen pygame raster of the visible area, swaps the raster
+    in as the canvas's background image and deletes the line items.
+    """
+
+    def __init__(self, canvas, width, height, background=(0, 0, 0)):
+        import tkinter
+
+        self.tkinter = tkinter
+        self.canvas = canvas
+        self.raster = pygame.Surface((width, height))
+        self.raster.fill(background)
+        self.center = (width / 2, height / 2)
+        self.pending = []  # Segments drawn as canvas items since the last flatten
+        self.photo = None  # Keep a reference, or Tk drops the image
+        self.image_item = canvas.create_image(0, 0, anchor="center")
+        canvas.tag_lower(self.image_item)
+
+    def add(self, segment):
+        self.pending.append(segment)
+
+    def flatten(self):
+        cx, cy = self.center
+        draw_line = pygame.draw.line
+        raster = self.raster
+        for x0, y0, x1, y1, color in self.pending:
+            draw_line(raster, color, (cx + x0, cy - y0), (cx + x1, cy - y1))
+        self.pending.clear()
+
+        # Uncompressed PPM: a third of the time PNG encoding takes
+        width, height = raster.get_size()
+        ppm = b"P6\n%d %d\n255\n" % (width, height) + pygame.image.tobytes(raster, "RGB")
+        self.photo = self.tkinter.PhotoImage(data=base64.b64encode(ppm), format="ppm")
+        self.canvas.itemconfigure(self.image_item, image=self.photo)
+        self.canvas.delete("segment")
+
+
+def run_turtle(fps=30, segments_per_second=600, max_items=3000):
+    """Draw the spiral in a turtle window until it is clicked"""
+    import turtle
+
+    rng = stream_from_env()
+    print(f"[turtle_art] seed {rng.seed_value}")
+    path = spiral_path(rng)
+
+    screen = turtle.Screen()
+    screen.bgcolor('black')
+    screen.title("Turtle Spiral")
+    # No redraw per segment: the canvas is updated once per batch
+    screen.tracer(0)
+    turtle.hideturtle()
+    canvas = screen.getcanvas()
+    flattener = CanvasFlattener(canvas, screen.window_width(), screen.window_height())
+
+    per_frame = max(1, segments_per_second // fps)
+    delay_ms = 1000 // fps
+
+    def frame():
+        create_line = canvas.create_line
+        for _ in range(per_frame):
+            segment = next(path)
+            x0, y0, x1, y1, color = segment
+            # Canvas y runs down, turtle y up
+            create_line(x0, -y0, x1, -y1, fill="#%02x%02x%02x" % color, tags="segment")
+            flattener.add(segment)
+        if len(flattener.pending) >= max_items:
+            flattener.flatten()
+        screen.update()
+        screen.ontimer(frame, delay_ms)
+
+    frame()
+    # Keep the window open until clicked
+    screen.exitonclick()
+
+
+class TurtleScene(Scene):
+    """The turtle spiral as a runtime scene, built on the same path generator"""
+
+    caption = "Turtle Spiral"
+    target_fps = 30
+
+    segments_per_second = 600
+
+    def load(self, size):
+        super().load(size)
+        self.path = spiral_path(self.random)
+        self.canvas = pygame.Surface(size)  # Everything drawn so far
+        self.canvas.fill(self.background)
+        self.pending = 0.0
+        self.new_segments = []
+        self.full_redraw = True
+
+    def resize(self, size):
+        # Carry the picture over, centered, instead of starting again
+        old = self.canvas
+        Scene.load(self, size)
+        self.canvas = pygame.Surface(size)
+        self.canvas.fill(self.background)
+        self.canvas.blit(old, old.get_rect(center=self.canvas.get_rect().center))
+        self.full_redraw = True
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def update(self, dt):
+        self.pending += self.segments_per_second * dt
+        count = int(self.pending)
+        self.pending -= count
+        path = self.path
+        self.new_segments.extend(next(path) for _ in range(count))
+
+    def draw(self, surface):
+        cx, cy = self.width / 2, self.height / 2
+        canvas = self.canvas
+        draw_line = pygame.draw.line
+        dirty = []
+        for x0, y0, x1, y1, color in self.new_segments:
+            dirty.append(draw_line(canvas, color, (cx + x0, cy - y0), (cx + x1, cy - y1)))
+        self.new_segments.clear()
+
+        if self.full_redraw:
+            self.full_redraw = False
+            surface.blit(canvas, (0, 0))
+            return None
+        # Only the new segments' bounding boxes go to the screen
+        dirty = [rect.clip(canvas.get_rect()) for rect in dirty]
+        surface.blits([(canvas, rect, rect) for rect in dirty], doreturn=False)
+        return dirty
+
+
+if __name__ == "__main__":
+    if "--pygame" in sys.argv[1:]:
+        run_scene(TurtleScene)
+    else:
+        run_turtle()
@@ -0,0 +1,148 @@
+"""
+Crash-safe, debounced JSON config persistence for the countdown app.
+
+Saves are written to a temporary file, fsynced and renamed over the real
+one, so a power cut leaves either the old or the new config on disk, never
+a torn file. The config that was replaced is kept as ``<path>.bak`` (a
+rename, so it costs no extra writes) and is used when the main file does
+not load. Bursts of saves are coalesced into a single write after a short
+delay, and identical contents are not rewritten at all, which keeps SD card
+wear down.
+"""
+
+import json
+import os
+import threading
+
+
+class ConfigStore:
+    def __init__(self, path, schema, delay=2.0):
+        # schema maps key -> (allowed types, default[, check]); check is a
+        # callable that raises or returns False for values it rejects
+        self.path = path
+        self.backup_path = path + '.bak'
+        self.schema = schema
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._timer = None
+        self._pending = None  # Serialized config waiting to be written
+        self._written = None  # Serialized config currently on disk
+
+    def defaults(self):
+        return {key: spec[1] for key, spec in self.schema.items()}
+
+    def check(self, key, value):
+        """Return why ``value`` is not valid for ``key``, or None if it is"""
+        spec = self.schema[key]
+        types = spec[0] if isinstance(spec[0], tuple) else (spec[0],)
+        check = spec[2] if len(spec) > 2 else None
+        # bool is an int subclass, so only accept it where bool is allowed
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            return f"{key} must be {' or '.join(t.__name__ for t in types)}, not {value!r}"
+        if check is not None:
+            try:
+                if check(value) is False:
+                    return f"invalid value for {key}: {value!r}"
+            except (TypeError, ValueError) as e:
+                return f"invalid value for {key}: {e}"
+        return None
+
+    def validate(self, data):
+        """Return ``data`` with missing or invalid keys set to their defaults"""
+        if not isinstance(data, dict):
+            raise ValueError("config is not a JSON object")
+        config = dict(data)
+        for key, spec in self.schema.items():
+            default = spec[1]
+            if key not in config:
+                config[key] = default
+                continue
+            error = self.check(key, config[key])
+            if error:
+                print(f"Invalid config value ({error}), using {default!r}")
+                config[key] = default
+        return config
+
+    def _read(self, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return self.validate(json.load(f))
+
+    def load(self):
+        """Load the config, falling back to the last-known-good copy, then defaults"""
+        for path in (self.path, self.backup_path):
+            if not os.path.exists(path):
+                continue
+            try:
+                config = self._read(path)
+            except (OSError, ValueError) as e:
+                print(f"Error loading config from {path}: {e}")
+                continue
+            if path == self.path:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._written = f.read()
+            else:
+                print(f"Recovered config from {path}")
+                # Put the recovered copy back in place on the next write
+                self.save(config)
+            return config
+
+        config = self.defaults()
+        self.save(config, immediate=True)
+        return config
+
+    def save(self, config, immediate=False):
+        """Queue ``config`` to be written; only the latest of a burst is written"""
+        # Serialize now so later changes by the caller cannot race the writer
+        payload = json.dumps(config, indent=2)
+        with self._lock:
+            if payload == self._written:
+                self._pending = None
+                return
+            self._pending = payload
+            if self._timer is None and not immediate:
+                self._timer = threading.Timer(self.delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if immediate:
+            self.flush()
+
+    def flush(self):
+        """Write any pending config now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            payload, self._pending = self._pending, None
+            if payload is None:
+                return
+            try:
+                self._write(payload)
+                self._written = payload
+            except OSError as e:
+                print(f"Error saving config: {e}")
+
+    def _write(self, payload):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Only a file that loaded cleanly (or that we wrote) becomes the backup
+        if self._written is not None and os.path.exists(self.path):
+            os.replace(self.path, self.backup_path)
+        os.replace(tmp, self.path)
+        self._sync_directory()
+
+    def _sync_directory(self):
+        # Make the renames themselves durable
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
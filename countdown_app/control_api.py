@@ -0,0 +1,256 @@
+"""
+Embedded HTTP/JSON control API for the countdown app.
+
+Lets a fleet of kiosks be managed remotely: read and update the config,
+skip to the next quote, and poll health and metrics. The server runs on
+its own thread and asyncio loop (stdlib only), so requests never hold up
+the display; handlers that touch app state are handed to the renderer's
+``dispatch`` (a job queue the Tk or framebuffer loop is woken to drain)
+and the request waits for the result. The HTTP part is kept in step with
+``art/runtime/control.py``; the countdown is deployed on its own, without
+the art tree, so it carries its own copy.
+
+    GET   /health       no token needed
+    GET   /metrics
+    GET   /config
+    PATCH /config       {"low_power": true, "countdowns": [...], ...}
+    POST  /quote/next
+
+Enable it with "control_port" in the config; set "control_host" to
+"0.0.0.0" for remote access and "control_token" to require
+"Authorization: Bearer <token>".
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+
+MAX_BODY = 64 * 1024
+UI_TIMEOUT = 5.0  # Seconds a request waits for the UI thread
+
+REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found",
+           405: "Method Not Allowed", 408: "Request Timeout", 413: "Payload Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    """Raise from a handler to answer with ``status`` and an error message"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class Request:
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+        self._json = None
+
+    def json(self):
+        """The request body as a JSON object ({} when empty)"""
+        if self._json is None:
+            try:
+                data = json.loads(self.body) if self.body else {}
+            except ValueError as e:
+                raise HttpError(400, f"invalid JSON: {e}") from None
+            if not isinstance(data, dict):
+                raise HttpError(400, "expected a JSON object")
+            self._json = data
+        return self._json
+
+
+class ControlServer:
+    def __init__(self, dispatch, host="127.0.0.1", port=8080, token=None):
+        self.dispatch = dispatch  # Runs a callable on the UI thread
+        self.host = host
+        self.port = port
+        self.token = token or None
+        self.routes = {}  # (method, path) -> (handler, on_ui)
+        self.public = {"/health"}  # Paths that need no token
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self._loop = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    def route(self, method, path, handler, on_ui=True):
+        """Answer ``method path`` with ``handler(request)``, which returns JSON data
+
+        Handlers run on the UI thread unless ``on_ui`` is False, which is
+        only safe for handlers that read thread-safe state.
+        """
+        self.routes[(method, path)] = (handler, on_ui)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._serve, name="control-api", daemon=True)
+        self._thread.start()
+        self._ready.wait(5)
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _serve(self):
+        self._loop = asyncio.new_event_loop()
+        try:
+            server = self._loop.run_until_complete(
+                asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as e:
+            print(f"[control] cannot listen on {self.host}:{self.port}: {e}")
+            self._ready.set()
+            return
+        self.port = server.sockets[0].getsockname()[1]
+        print(f"[control] listening on http://{self.host}:{self.port}")
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            server.close()
+            self._loop.close()
+
+    def call_on_ui(self, function, *args):
+        """Run ``function`` through ``dispatch`` and return an awaitable result"""
+        future = concurrent.futures.Future()
+
+        def call():
+            if not future.set_running_or_notify_cancel():
+                return
+            try:
+                future.set_result(function(*args))
+            except BaseException as e:
+                future.set_exception(e)
+
+        self.dispatch(call)
+        return asyncio.wrap_future(future)
+
+    async def _handle(self, reader, writer):
+        status, payload = 500, {"error": "internal error"}
+        try:
+            request = await self._read_request(reader)
+            status, payload = 200, await self._respond(request)
+        except HttpError as e:
+            status, payload = e.status, {"error": str(e)}
+        except asyncio.TimeoutError:
+            status, payload = 503, {"error": "UI thread busy"}
+        except Exception as e:
+            print(f"[control] error handling request: {e}")
+            payload = {"error": str(e)}
+        finally:
+            self.requests += 1
+            if status >= 400:
+                self.errors += 1
+            body = json.dumps(payload, indent=2).encode("utf-8") + b"\n"
+            writer.write(f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                         f"Content-Type: application/json\r\n"
+                         f"Content-Length: {len(body)}\r\n"
+                         f"Connection: close\r\n\r\n".encode("latin-1") + body)
+            try:
+                await writer.drain()
+                writer.close()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader):
+        try:
+            return await asyncio.wait_for(self._parse_request(reader), 10)
+        except asyncio.TimeoutError:
+            raise HttpError(408, "request timed out") from None
+        except asyncio.IncompleteReadError:
+            raise HttpError(400, "truncated request") from None
+
+    async def _parse_request(self, reader):
+        try:
+            request_line = await reader.readline()
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "malformed request line") from None
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "bad Content-Length") from None
+        if length > MAX_BODY:
+            raise HttpError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        path, _, query = target.partition("?")
+        return Request(method.upper(), path, query, headers, body)
+
+    async def _respond(self, request):
+        if self.token and request.path not in self.public:
+            if request.headers.get("authorization") != f"Bearer {self.token}":
+                raise HttpError(401, "missing or wrong bearer token")
+
+        entry = self.routes.get((request.method, request.path))
+        if entry is None:
+            if any(path == request.path for _, path in self.routes):
+                raise HttpError(405, f"{request.method} not allowed on {request.path}")
+            raise HttpError(404, f"no such endpoint {request.path}")
+
+        handler, on_ui = entry
+        if not on_ui:
+            return handler(request)
+        # Parse the body here, off the UI thread
+        request.json()
+        return await asyncio.wait_for(self.call_on_ui(handler, request), UI_TIMEOUT)
+
+    def stats(self):
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "requests": self.requests,
+            "errors": self.errors,
+        }
+
+
+def serve_countdown(core, dispatch):
+    """Start the control API for ``core`` if the config enables it; returns the server or None"""
+    config = core.config
+    if not config.get('control_port'):
+        return None
+    server = ControlServer(dispatch, config.get('control_host') or "127.0.0.1",
+                           config['control_port'], config.get('control_token'))
+
+    def health(request):
+        return {"status": "ok"}
+
+    def metrics(request):
+        return dict(core.metrics(), control=server.stats())
+
+    def read_config(request):
+        config = dict(core.config)
+        if config.get('control_token'):
+            config['control_token'] = "***"
+        return config
+
+    def update_config(request):
+        try:
+            core.apply_config(request.json())
+        except ValueError as e:
+            raise HttpError(400, str(e)) from None
+        return read_config(request)
+
+    def next_quote(request):
+        core.update_daily_quote()
+        return {"quote": core.current_quote}
+
+    server.route("GET", "/health", health, on_ui=False)
+    server.route("GET", "/metrics", metrics, on_ui=False)
+    server.route("GET", "/config", read_config)
+    server.route("PATCH", "/config", update_config)
+    server.route("POST", "/quote/next", next_quote)
+    server.start()
+    return server
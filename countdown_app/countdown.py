@@ -3,16 +3,24 @@
 Life Countdown Timer Application for Raspberry Pi
 A full-screen countdown timer showing life expectancy and themed countdowns
 with daily quotes that update at 4 AM.
+
+This is the Tk front end. Units without X can use the pygame framebuffer
+and PNG renderers in countdown_fb.py, which share countdown_core.py.
 """
 
+# Taken first, so --measure includes the cost of importing Tk
+import time
+STARTED = time.perf_counter()
+
+import argparse
+import os
+import queue
+import sys
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
-import json
-import os
-from datetime import datetime, timedelta
-import threading
-import time
-import random
+
+from countdown_core import CountdownCore, report_startup
+
 
 class LifeCountdownApp:
     def __init__(self):
@@ -25,99 +33,62 @@ class LifeCountdownApp:
         self.root.bind('<Escape>', self.toggle_fullscreen)
         self.root.bind('<F11>', self.toggle_fullscreen)
         
-        # Configuration file
-        self.config_file = 'countdown_config.json'
-        self.quotes_file = 'daily_quotes.json'
-        
-        # Load configuration
-        self.load_config()
-        self.load_quotes()
-        
-        # Variables for countdown calculations
-        self.life_end_date = None
-        self.theme_end_date = None
-        self.current_quote = ""
-        self.last_quote_date = None
+        # Countdowns, quotes, config and scheduled jobs
+        self.core = CountdownCore('countdown_config.json', 'daily_quotes.json')
+        self.core.on_change = self.update_display
+        self.core.on_rebuild = self.on_rebuild
         
-        # Calculate dates
-        self.calculate_dates()
+        # Display state: last text shown per label, so unchanged labels are not touched
+        self.label_texts = {}
+        self.tick_job = None
+        self.countdown_rows = []  # (frame, title label, countdown label) per countdown
         
         # Setup GUI
         self.setup_gui()
+        self.refresh_static_text()
+        
+        # Any input wakes the display from low-power mode
+        for sequence in ('<Any-KeyPress>', '<Motion>', '<Button>'):
+            self.root.bind_all(sequence, self.on_input, add='+')
         
         # Start the update loop
         self.update_display()
         
-        # Start quote update thread
-        self.start_quote_thread()
-    
-    def load_config(self):
-        """Load configuration from JSON file"""
-        default_config = {
-            "birth_date": "1990-01-01",
-            "life_expectancy_years": 80,
-            "theme_name": "Next Vacation",
-            "theme_end_date": "2025-12-31",
-            "last_quote_update": "",
-            "current_quote": "Anicca|Change, Dukkha|Suffering, Anatta|Non-Self, Sati|Mindfulness, Equanimity|Observation, Sila|Morality, Samadhi|Concentration."
-        }
-        
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r') as f:
-                    self.config = json.load(f)
-            else:
-                self.config = default_config
-                self.save_config()
-        except Exception as e:
-            print(f"Error loading config: {e}")
-            self.config = default_config
+        # Start the scheduler for quote rotation and countdown milestones once
+        # the main loop runs. Its jobs, and the control API's requests, are
+        # queued for the Tk loop to run, so they may touch widgets and the
+        # config freely; Tk itself must not be called from their threads.
+        # A byte on a pipe that Tk watches wakes the loop only when a job
+        # is queued, so nothing polls in between
+        self.jobs = queue.Queue()
+        self.wake_read, self.wake_write = os.pipe()
+        os.set_blocking(self.wake_read, False)
+        self.root.tk.createfilehandler(self.wake_read, tk.READABLE, self.run_jobs)
+        self.root.after(0, self.core.start_scheduler, self.dispatch)
+        self.core.start_control(self.dispatch)
     
-    def save_config(self):
-        """Save configuration to JSON file"""
-        try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
-        except Exception as e:
-            print(f"Error saving config: {e}")
-    
-    def load_quotes(self):
-        """Load quotes from JSON file"""
-        default_quotes = [
-            "Anicca (Impermanence): This is the fundamental teaching that everything is constantly changing, in a perpetual state of flux.",
-            "Dukkha (Suffering/Unsatisfactoriness): Often translated as 'suffering,' dukkha encompasses a broader sense of unsatisfactoriness, dis-ease, or inherent instability in conditioned existence.",
-            "Anatta (Non-Self): This teaching asserts that there is no permanent, unchanging 'self' or 'soul.'"
-        ]
-        
-        try:
-            if os.path.exists(self.quotes_file):
-                with open(self.quotes_file, 'r') as f:
-                    self.quotes = json.load(f)
-            else:
-                self.quotes = default_quotes
-                with open(self.quotes_file, 'w') as f:
-                    json.dump(self.quotes, f, indent=2)
-        except Exception as e:
-            print(f"Error loading quotes: {e}")
-            self.quotes = default_quotes
+    def dispatch(self, callback):
+        """Queue ``callback`` for the UI thread; safe to call from any thread"""
+        self.jobs.put(callback)
+        os.write(self.wake_write, b'\0')
     
-    def calculate_dates(self):
-        """Calculate end dates for countdowns"""
+    def run_jobs(self, fd=None, mask=None):
+        """Run the jobs other threads have queued for the UI thread"""
         try:
-            birth_date = datetime.strptime(self.config['birth_date'], '%Y-%m-%d')
-            life_expectancy = self.config['life_expectancy_years']
-            self.life_end_date = birth_date + timedelta(days=life_expectancy * 365.25)
-            
-            self.theme_end_date = datetime.strptime(self.config['theme_end_date'], '%Y-%m-%d')
-            
-            # Set current quote
-            self.current_quote = self.config.get('current_quote', 'Anicca|Change, Dukkha|Suffering, Anatta|Non-Self, Sati|Mindfulness, Equanimity|Observation, Sila|Morality, Samadhi|Concentration.')
-            
-        except Exception as e:
-            print(f"Error calculating dates: {e}")
-            # Set default dates if there's an error
-            self.life_end_date = datetime.now() + timedelta(days=365 * 30)  # 30 years default
-            self.theme_end_date = datetime.now() + timedelta(days=365)  # 1 year default
+            while os.read(self.wake_read, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        while True:
+            try:
+                job = self.jobs.get_nowait()
+            except queue.Empty:
+                return
+            # One failing job must not hold up the rest
+            try:
+                job()
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
     
     def setup_gui(self):
         """Setup the GUI elements"""
@@ -131,31 +102,10 @@ class LifeCountdownApp:
                               fg='red', bg='black')
         title_label.pack(pady=(0, 30))
         
-        # Life countdown section
-        life_frame = tk.Frame(main_frame, bg='black', relief='raised', bd=2)
-        life_frame.pack(fill='x', pady=10)
-        
-        tk.Label(life_frame, text="⚰️ LIFE EXPECTANCY COUNTDOWN ⚰️", 
-                font=('Arial', 18, 'bold'), fg='red', bg='black').pack(pady=10)
-        
-        self.life_countdown_label = tk.Label(life_frame, text="Loading...", 
-                                           font=('Courier', 16, 'bold'), 
-                                           fg='red', bg='black')
-        self.life_countdown_label.pack(pady=10)
-        
-        # Theme countdown section
-        theme_frame = tk.Frame(main_frame, bg='black', relief='raised', bd=2)
-        theme_frame.pack(fill='x', pady=10)
-        
-        self.theme_title_label = tk.Label(theme_frame, text="", 
-                                         font=('Arial', 18, 'bold'), 
-                                         fg='cyan', bg='black')
-        self.theme_title_label.pack(pady=10)
-        
-        self.theme_countdown_label = tk.Label(theme_frame, text="Loading...", 
-                                            font=('Courier', 16, 'bold'), 
-                                            fg='cyan', bg='black')
-        self.theme_countdown_label.pack(pady=10)
+        # Countdown sections, one per configured countdown
+        self.countdown_frame = tk.Frame(main_frame, bg='black')
+        self.countdown_frame.pack(fill='x')
+        self.build_countdown_rows()
         
         # Quote section
         quote_frame = tk.Frame(main_frame, bg='black', relief='raised', bd=2)
@@ -185,78 +135,83 @@ class LifeCountdownApp:
                            font=('Arial', 12), bg='darkred', fg='white')
         exit_btn.pack(side='right', padx=10)
     
-    def format_countdown(self, target_date):
-        """Format countdown to show years, days, hours, minutes, seconds"""
-        now = datetime.now()
-        if target_date <= now:
-            return "⚠️ TIME'S UP! ⚠️"
-        
-        diff = target_date - now
-        
-        # Calculate years, days, hours, minutes, seconds
-        years = diff.days // 365
-        remaining_days = diff.days % 365
-        hours = diff.seconds // 3600
-        minutes = (diff.seconds % 3600) // 60
-        seconds = diff.seconds % 60
-        
-        if years > 0:
-            return f"{years}Y {remaining_days}D {hours:02d}:{minutes:02d}:{seconds:02d}"
-        else:
-            return f"{remaining_days}D {hours:02d}:{minutes:02d}:{seconds:02d}"
+    def build_countdown_rows(self):
+        """(Re)create a title and a countdown label for every countdown"""
+        for frame, title_label, countdown_label in self.countdown_rows:
+            self.label_texts.pop(title_label, None)
+            self.label_texts.pop(countdown_label, None)
+            frame.destroy()
+        self.countdown_rows = []
+        
+        # The original roomy sections for a few countdowns, compact rows for many
+        compact = len(self.core.model) > 3
+        for countdown in self.core.model.countdowns:
+            frame = tk.Frame(self.countdown_frame, bg='black', relief='raised', bd=2)
+            if compact:
+                frame.pack(fill='x', pady=2)
+                title_label = tk.Label(frame, text="", font=('Arial', 12, 'bold'),
+                                       fg=countdown.color, bg='black', anchor='w')
+                title_label.pack(side='left', padx=10)
+                countdown_label = tk.Label(frame, text="Loading...", font=('Courier', 12, 'bold'),
+                                           fg=countdown.color, bg='black')
+                countdown_label.pack(side='right', padx=10)
+            else:
+                frame.pack(fill='x', pady=10)
+                title_label = tk.Label(frame, text="", font=('Arial', 18, 'bold'),
+                                       fg=countdown.color, bg='black')
+                title_label.pack(pady=10)
+                countdown_label = tk.Label(frame, text="Loading...", font=('Courier', 16, 'bold'),
+                                           fg=countdown.color, bg='black')
+                countdown_label.pack(pady=10)
+            self.countdown_rows.append((frame, title_label, countdown_label))
+    
+    def refresh_static_text(self, now_ts=None):
+        """Show each countdown's title, or its milestone announcement"""
+        now_ts = now_ts or int(time.time())
+        for index, (_, title_label, _) in enumerate(self.countdown_rows):
+            self.set_label_text(title_label, self.core.title(index, now_ts))
+    
+    def set_label_text(self, label, text):
+        """Reconfigure a label only when its text actually changed"""
+        if self.label_texts.get(label) != text:
+            self.label_texts[label] = text
+            label.config(text=text)
     
     def update_display(self):
         """Update the countdown displays"""
-        if self.life_end_date:
-            life_countdown = self.format_countdown(self.life_end_date)
-            self.life_countdown_label.config(text=life_countdown)
+        # Also called out of band (new quote, expiry), so never keep two tick chains
+        if self.tick_job is not None:
+            self.root.after_cancel(self.tick_job)
+            self.tick_job = None
+        now_ts = int(time.time())
         
-        if self.theme_end_date:
-            theme_countdown = self.format_countdown(self.theme_end_date)
-            self.theme_countdown_label.config(text=theme_countdown)
-            
-            # Update theme title
-            theme_title = f"🎯 {self.config['theme_name'].upper()} COUNTDOWN 🎯"
-            self.theme_title_label.config(text=theme_title)
+        # The model only reports the countdowns whose text changed
+        for index, text in self.core.tick(now_ts):
+            self.set_label_text(self.countdown_rows[index][2], text)
+        self.refresh_static_text(now_ts)
         
-        # Update quote
-        self.quote_label.config(text=f'"{self.current_quote}"')
+        # Update quote, which changes once a day at most
+        self.set_label_text(self.quote_label, self.core.quote)
         
-        # Schedule next update in 1 second
-        self.root.after(1000, self.update_display)
+        self.schedule_tick()
     
-    def start_quote_thread(self):
-        """Start the thread that checks for quote updates at 4 AM"""
-        def quote_updater():
-            while True:
-                now = datetime.now()
-                if now.hour == 4 and now.minute == 0:
-                    # Check if we haven't updated today
-                    today_str = now.strftime('%Y-%m-%d')
-                    if self.config.get('last_quote_update') != today_str:
-                        self.update_daily_quote()
-                        self.config['last_quote_update'] = today_str
-                        self.save_config()
-                
-                # Sleep for 60 seconds before checking again
-                time.sleep(60)
-        
-        quote_thread = threading.Thread(target=quote_updater, daemon=True)
-        quote_thread.start()
+    def schedule_tick(self):
+        """Schedule the next update right after the next second (or minute) boundary"""
+        period_ms = self.core.tick_period() * 1000
+        now_ms = int(time.time() * 1000)
+        # A few ms past the boundary so the new second is already current
+        delay = period_ms - now_ms % period_ms + 5
+        self.tick_job = self.root.after(delay, self.update_display)
     
-    def update_daily_quote(self):
-        """Update to a new random quote"""
-        if self.quotes:
-            new_quote = random.choice(self.quotes)
-            # Make sure it's different from current quote if possible
-            attempts = 0
-            while new_quote == self.current_quote and len(self.quotes) > 1 and attempts < 5:
-                new_quote = random.choice(self.quotes)
-                attempts += 1
-            
-            self.current_quote = new_quote
-            self.config['current_quote'] = new_quote
-            self.save_config()
+    def on_rebuild(self):
+        """Recreate the countdown rows after the configured countdowns changed"""
+        self.build_countdown_rows()
+        self.update_display()
+    
+    def on_input(self, event=None):
+        """Note user activity and leave idle low-power mode straight away"""
+        if self.core.note_input():
+            self.update_display()
     
     def open_settings(self):
         """Open settings dialog"""
@@ -266,32 +221,38 @@ class LifeCountdownApp:
         settings_window.configure(bg='black')
         settings_window.grab_set()  # Make modal
         
+        # The dialog edits the first life and dated countdowns; any others
+        # are edited in the "countdowns" list of the config file
+        life = self.core.primary_countdown('life', {"name": "Life expectancy", "birth_date": "1990-01-01",
+                                                    "life_expectancy_years": 80})
+        theme = self.core.primary_countdown('date', {"name": "Next Vacation", "date": "2025-12-31"})
+        
         # Birth date
         tk.Label(settings_window, text="Birth Date (YYYY-MM-DD):", 
                 fg='white', bg='black').pack(pady=5)
         birth_entry = tk.Entry(settings_window)
-        birth_entry.insert(0, self.config['birth_date'])
+        birth_entry.insert(0, life['birth_date'])
         birth_entry.pack(pady=5)
         
         # Life expectancy
         tk.Label(settings_window, text="Life Expectancy (years):", 
                 fg='white', bg='black').pack(pady=5)
         life_exp_entry = tk.Entry(settings_window)
-        life_exp_entry.insert(0, str(self.config['life_expectancy_years']))
+        life_exp_entry.insert(0, str(life['life_expectancy_years']))
         life_exp_entry.pack(pady=5)
         
         # Theme name
         tk.Label(settings_window, text="Theme Name:", 
                 fg='white', bg='black').pack(pady=5)
         theme_name_entry = tk.Entry(settings_window)
-        theme_name_entry.insert(0, self.config['theme_name'])
+        theme_name_entry.insert(0, theme['name'])
         theme_name_entry.pack(pady=5)
         
         # Theme end date
         tk.Label(settings_window, text="Theme End Date (YYYY-MM-DD):", 
                 fg='white', bg='black').pack(pady=5)
         theme_date_entry = tk.Entry(settings_window)
-        theme_date_entry.insert(0, self.config['theme_end_date'])
+        theme_date_entry.insert(0, theme['date'])
         theme_date_entry.pack(pady=5)
         
         # Buttons
@@ -300,13 +261,11 @@ class LifeCountdownApp:
         
         def save_settings():
             try:
-                self.config['birth_date'] = birth_entry.get()
-                self.config['life_expectancy_years'] = int(life_exp_entry.get())
-                self.config['theme_name'] = theme_name_entry.get()
-                self.config['theme_end_date'] = theme_date_entry.get()
-                
-                self.save_config()
-                self.calculate_dates()
+                life['birth_date'] = birth_entry.get()
+                life['life_expectancy_years'] = int(life_exp_entry.get())
+                theme['name'] = theme_name_entry.get()
+                theme['date'] = theme_date_entry.get()
+                self.core.update_countdowns((life, theme))
                 settings_window.destroy()
                 messagebox.showinfo("Success", "Settings saved successfully!")
                 
@@ -320,7 +279,7 @@ class LifeCountdownApp:
         
         # New quote button
         tk.Button(settings_window, text="Get New Quote Now", 
-                 command=self.update_daily_quote,
+                 command=self.core.update_daily_quote,
                  bg='blue', fg='white').pack(pady=10)
     
     def toggle_fullscreen(self, event=None):
@@ -328,10 +287,24 @@ class LifeCountdownApp:
         current_state = self.root.attributes('-fullscreen')
         self.root.attributes('-fullscreen', not current_state)
     
-    def run(self):
+    def run(self, measure=False):
         """Start the application"""
-        self.root.mainloop()
+        if measure:
+            # Draw the first frame before taking the measurement
+            self.root.update()
+            report_startup('tk', STARTED)
+        try:
+            self.root.mainloop()
+        finally:
+            self.core.close()
+            self.root.tk.deletefilehandler(self.wake_read)
+            os.close(self.wake_read)
+            os.close(self.wake_write)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Life countdown timer (Tk)")
+    parser.add_argument('--measure', action='store_true',
+                        help="print startup time and memory once the first frame is shown")
+    args = parser.parse_args()
     app = LifeCountdownApp()
-    app.run()
\ No newline at end of file
+    app.run(measure=args.measure)
\ No newline at end of file
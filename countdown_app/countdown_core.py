@@ -0,0 +1,342 @@
+"""
+Toolkit-independent core of the countdown display.
+
+``CountdownCore`` owns everything the countdown screen shows apart from the
+widgets: the config and quote stores, the countdown model, the scheduler
+for quote rotation and milestones, milestone announcements and low-power
+mode. Renderers (the Tk app in ``countdown.py``, the pygame framebuffer and
+PNG renderers in ``countdown_fb.py``) call ``tick`` once per second, draw
+``titles``/``texts``/``quote``, and hand in a ``dispatch`` function that
+queues a callable for the renderer's own loop: the scheduler and the
+control API wait on threads of their own, but their jobs always run on the
+UI thread.
+"""
+
+import json
+import os
+import resource
+import time
+from datetime import datetime
+
+from config_store import ConfigStore
+from countdowns import Countdown, CountdownModel, migrate_legacy_config
+from quote_store import QuoteStore
+from scheduler import Scheduler
+
+# When the daily quote rotates
+QUOTE_ROTATION_TIME = (4, 0)
+# How long a milestone announcement replaces the countdown's title
+ANNOUNCEMENT_SECONDS = 60
+
+DEFAULT_QUOTE = "Anicca|Change, Dukkha|Suffering, Anatta|Non-Self, Sati|Mindfulness, Equanimity|Observation, Sila|Morality, Samadhi|Concentration."
+
+DEFAULT_QUOTES = [
+    "Anicca (Impermanence): This is the fundamental teaching that everything is constantly changing, in a perpetual state of flux.",
+    "Dukkha (Suffering/Unsatisfactoriness): Often translated as 'suffering,' dukkha encompasses a broader sense of unsatisfactoriness, dis-ease, or inherent instability in conditioned existence.",
+    "Anatta (Non-Self): This teaching asserts that there is no permanent, unchanging 'self' or 'soul.'"
+]
+
+
+def time_zone(name):
+    """The zoneinfo zone called ``name``, or None for the system local time"""
+    if not name:
+        return None
+    from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"unknown time zone {name!r}") from e
+
+
+# Config keys: (allowed types, default, optional check)
+CONFIG_SCHEMA = {
+    # None until migrated from the old fixed life/theme keys; entries are
+    # validated one by one when the countdown model is built
+    "countdowns": ((list, type(None)), None),
+    # IANA zone name for the countdown dates; empty means the system zone
+    "timezone": (str, "", time_zone),
+    "last_quote_update": (str, ""),
+    "low_power": (bool, False),
+    "low_power_idle_minutes": ((int, float), 0, lambda minutes: minutes >= 0),
+    "quote_tag": (str, ""),
+    "quote_cycle": ((dict, type(None)), None),
+    "current_quote": (str, DEFAULT_QUOTE),
+    # HTTP control API (see control_api.py); port 0 turns it off. Read at start-up
+    "control_port": (int, 0, lambda port: 0 <= port < 65536),
+    "control_host": (str, "127.0.0.1"),
+    "control_token": (str, ""),
+}
+
+
+def memory_report():
+    """Current and peak resident memory of this process, in MB"""
+    current = None
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    current = int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return current, peak
+
+
+def report_startup(backend, started):
+    """Print the time from ``started`` (perf_counter) to now and the memory in use"""
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    current, peak = memory_report()
+    current_text = f"{current:.1f} MB" if current is not None else "n/a"
+    print(f"[{backend}] first frame after {elapsed_ms:.0f} ms, rss {current_text}, peak rss {peak:.1f} MB",
+          flush=True)
+
+
+class CountdownCore:
+    def __init__(self, config_file='countdown_config.json', quotes_file='daily_quotes.json'):
+        self.config_file = config_file
+        self.quotes_file = quotes_file
+        self.on_change = None  # Called when something changes outside the regular tick
+        self.on_rebuild = None  # Called after the countdown model was rebuilt
+        self.scheduler = None
+        self.milestone_job = None
+        self.control = None
+        self.ticks = 0
+        self.last_tick_ms = 0.0
+
+        self.load_config()
+        self.load_quotes()
+        self.current_quote = self.config['current_quote']
+
+        # Power state
+        self.last_input = time.monotonic()
+        self.low_power = False
+
+        # Announcement text and expiry timestamp per countdown index
+        self.announcements = {}
+        self.build_model()
+
+    # Persistence
+
+    def load_config(self):
+        """Load configuration, recovering from a damaged file if needed"""
+        self.config_store = ConfigStore(self.config_file, CONFIG_SCHEMA)
+        self.config = self.config_store.load()
+        if self.config['countdowns'] is None:
+            self.config['countdowns'] = migrate_legacy_config(self.config)
+            self.save_config()
+
+    def save_config(self):
+        """Queue the configuration to be saved (writes are atomic and debounced)"""
+        self.config_store.save(self.config)
+
+    def load_quotes(self):
+        """Open the quote library, creating the default one if missing"""
+        try:
+            if not os.path.exists(self.quotes_file):
+                with open(self.quotes_file, 'w') as f:
+                    json.dump(DEFAULT_QUOTES, f, indent=2)
+            # Indexed on first use; only the quote being shown is ever read
+            self.quote_store = QuoteStore(self.quotes_file)
+        except Exception as e:
+            print(f"Error loading quotes: {e}")
+            self.quote_store = None
+
+    def close(self):
+        if self.scheduler is not None:
+            self.scheduler.stop()
+        if self.control is not None:
+            self.control.stop()
+        # Write out any change still waiting for its debounce delay
+        self.config_store.flush()
+
+    # Countdowns
+
+    def build_model(self):
+        """Build the countdown model from the configured countdowns"""
+        self.model = CountdownModel.from_config(self.config['countdowns'],
+                                                tz=time_zone(self.config['timezone']))
+        self.announcements = {}
+
+    def primary_countdown(self, kind, default):
+        """The first configured countdown of ``kind``, or a new entry to add"""
+        for entry in self.config['countdowns']:
+            if entry.get('kind', 'date') == kind:
+                return entry
+        return dict(default, kind=kind)
+
+    def update_countdowns(self, entries):
+        """Store edited countdown entries and rebuild everything that depends on them"""
+        for entry in entries:
+            if entry not in self.config['countdowns']:
+                self.config['countdowns'].append(entry)
+        self.save_config()
+        self.rebuild()
+
+    def rebuild(self):
+        self.build_model()
+        if self.scheduler is not None:
+            self.schedule_milestone_job()
+        if self.on_rebuild is not None:
+            self.on_rebuild()
+
+    def apply_config(self, changes):
+        """Validate and apply a partial config update; raises ValueError if any of it is bad"""
+        for key, value in changes.items():
+            if key not in CONFIG_SCHEMA:
+                raise ValueError(f"unknown config key {key!r}")
+            error = self.config_store.check(key, value)
+            if error:
+                raise ValueError(error)
+        if 'countdowns' in changes:
+            if changes['countdowns'] is None:
+                raise ValueError("countdowns must be a list")
+            for entry in changes['countdowns']:
+                Countdown.from_config(entry)
+
+        self.config.update(changes)
+        self.save_config()
+        if 'countdowns' in changes or 'timezone' in changes:
+            self.rebuild()
+        if 'current_quote' in changes:
+            self.current_quote = self.config['current_quote']
+        self.changed()
+
+    def tick(self, now_ts):
+        """Advance to ``now_ts``; returns [(index, text)] for countdowns that changed"""
+        started = time.perf_counter()
+        self.update_power_mode()
+        changed = self.model.tick(now_ts, show_seconds=not self.low_power)
+        self.ticks += 1
+        self.last_tick_ms = (time.perf_counter() - started) * 1000
+        return changed
+
+    def title(self, index, now_ts):
+        """The title of countdown ``index``, or its milestone announcement"""
+        announcement = self.announcements.get(index)
+        if announcement is not None:
+            text, until = announcement
+            if now_ts < until:
+                return text
+            del self.announcements[index]
+        return self.model.countdowns[index].title()
+
+    @property
+    def quote(self):
+        return f'"{self.current_quote}"'
+
+    def tick_period(self):
+        """Seconds between display updates"""
+        return 60 if self.low_power else 1
+
+    def metrics(self):
+        """Counters for the control API; safe to read from any thread"""
+        current, peak = memory_report()
+        return {
+            "countdowns": len(self.model),
+            "quotes": len(self.quote_store) if self.quote_store is not None else 0,
+            "low_power": self.low_power,
+            "ticks": self.ticks,
+            "last_tick_ms": round(self.last_tick_ms, 3),
+            "next_milestone": self.model.next_milestone(),
+            "scheduled_jobs": len(self.scheduler.pending()) if self.scheduler is not None else 0,
+            "rss_mb": current,
+            "peak_rss_mb": peak,
+        }
+
+    # Power
+
+    def update_power_mode(self):
+        """Drop to minute granularity when forced in the config or left idle"""
+        idle_minutes = self.config.get('low_power_idle_minutes', 0)
+        idle = bool(idle_minutes) and time.monotonic() - self.last_input > idle_minutes * 60
+        self.low_power = bool(self.config.get('low_power')) or idle
+
+    def note_input(self):
+        """Note user activity; returns True when this leaves idle low-power mode"""
+        self.last_input = time.monotonic()
+        return self.low_power and not self.config.get('low_power')
+
+    # Scheduled jobs
+
+    def start_scheduler(self, dispatch):
+        """Schedule the daily quote and countdown jobs; ``dispatch`` runs them on the UI thread"""
+        self.scheduler = Scheduler(dispatch=dispatch)
+        hour, minute = QUOTE_ROTATION_TIME
+        self.scheduler.daily(hour, minute, self.rotate_daily_quote, name='daily-quote')
+
+        # Catch up on a rotation missed while the kiosk was off
+        now = datetime.now()
+        if now >= now.replace(hour=hour, minute=minute, second=0, microsecond=0):
+            self.scheduler.schedule_at(now, self.rotate_daily_quote, name='missed-daily-quote')
+
+        self.schedule_milestone_job()
+        self.scheduler.start()
+
+    def start_control(self, dispatch):
+        """Serve the HTTP control API if the config enables it"""
+        if not self.config.get('control_port'):
+            return
+        # Imported here, so asyncio and the server code load only when used
+        from control_api import serve_countdown
+        self.control = serve_countdown(self, dispatch)
+
+    def schedule_milestone_job(self):
+        """Wake up for the earliest pending milestone of any countdown"""
+        if self.milestone_job is not None:
+            self.scheduler.cancel(self.milestone_job)
+            self.milestone_job = None
+
+        when = self.model.next_milestone()
+        if when is not None:
+            self.milestone_job = self.scheduler.schedule_at(
+                datetime.fromtimestamp(when), self.on_milestones, name='countdown-milestone')
+
+    def on_milestones(self):
+        """Announce every milestone that is due, then wait for the next one"""
+        self.milestone_job = None
+        now_ts = int(time.time())
+        for index, days in self.model.pop_milestones(now_ts):
+            self.announce_milestone(index, days, now_ts)
+        # Show expiries and roll-overs straight away, even in low-power mode
+        self.changed()
+        self.schedule_milestone_job()
+
+    def announce_milestone(self, index, days, now_ts):
+        """Show a milestone in the countdown's title for a minute"""
+        countdown = self.model.countdowns[index]
+        if days > 0:
+            unit = 'DAY' if days == 1 else 'DAYS'
+            text = f"🎉 {days} {unit} LEFT: {countdown.name.upper()} 🎉"
+        elif countdown.repeats:
+            text = f"🎂 TODAY: {countdown.name.upper()} 🎂"
+        else:
+            return
+        self.announcements[index] = (text, now_ts + ANNOUNCEMENT_SECONDS)
+
+    def rotate_daily_quote(self):
+        """Pick the day's quote once per calendar day"""
+        today_str = datetime.now().strftime('%Y-%m-%d')
+        if self.config.get('last_quote_update') != today_str:
+            self.config['last_quote_update'] = today_str
+            self.update_daily_quote()
+
+    def update_daily_quote(self):
+        """Update to the next quote of the no-repeat shuffle"""
+        if self.quote_store is None:
+            return
+        # The cycle state is a few integers, so it persists across restarts
+        tag = self.config.get('quote_tag') or None
+        new_quote, cycle = self.quote_store.next_quote(self.config.get('quote_cycle'), tag)
+        if new_quote is None:
+            return
+
+        self.current_quote = new_quote
+        self.config['current_quote'] = new_quote
+        self.config['quote_cycle'] = cycle
+        self.save_config()
+        self.changed()
+
+    def changed(self):
+        if self.on_change is not None:
+            self.on_change()
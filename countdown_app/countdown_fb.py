@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Countdown display without Tk or X: pygame renderers sharing countdown_core.
+
+    python countdown_fb.py                      # KMS/DRM framebuffer, full screen
+    python countdown_fb.py --backend sdl        # whatever SDL picks (desktop testing)
+    python countdown_fb.py --backend png --output countdown.png --size 800x480
+    python countdown_fb.py --measure            # print startup time and memory
+
+The framebuffer renderer only initializes pygame's display and font modules,
+sleeps in the event queue until the next second (or a scheduled job), and
+updates just the rectangles whose text changed.
+"""
+
+# Taken first, so --measure includes the cost of importing pygame
+import time
+STARTED = time.perf_counter()
+
+import argparse
+import os
+import queue
+import re
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+import pygame
+
+from countdown_core import CountdownCore, report_startup
+
+BACKGROUND = (0, 0, 0)
+HEADER = "LIFE COUNTDOWN"
+QUOTE_HEADER = "DAILY INSPIRATION"
+
+# Emoji and dingbats that the Tk labels use but pygame's fonts cannot draw
+_SYMBOLS = re.compile("[⌀-⏿☀-➿️\U0001f000-\U0001faff]")
+
+
+def plain(text):
+    return " ".join(_SYMBOLS.sub("", text).split())
+
+
+def wrap(font, text, width):
+    """Split ``text`` into lines no wider than ``width`` pixels"""
+    lines = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if line and font.size(candidate)[0] > width:
+            lines.append(line)
+            line = word
+        else:
+            line = candidate
+    if line:
+        lines.append(line)
+    return lines
+
+
+class CountdownRenderer:
+    """Lays the countdown screen out on a pygame surface and redraws what changed"""
+
+    def __init__(self, core, size):
+        self.core = core
+        self.width, self.height = size
+        self.shown = {}  # slot -> text currently drawn there
+        self.layout()
+
+    def layout(self):
+        """Work out fonts and the rectangle of every text slot for the current model"""
+        scale = self.height / 600
+        count = len(self.core.model)
+        compact = count > 3
+
+        def font(points, bold=False, italic=False):
+            # pygame's bundled font: no fontconfig scan at start-up. Its pixel
+            # size runs smaller than Tk's points, hence the extra factor
+            loaded = pygame.font.Font(None, max(8, int(points * 1.8 * scale)))
+            loaded.set_bold(bold)
+            loaded.set_italic(italic)
+            return loaded
+
+        self.header_font = font(24, bold=True)
+        self.title_font = font(12 if compact else 18, bold=True)
+        self.text_font = font(12 if compact else 16, bold=True)
+        self.quote_font = font(14, italic=True)
+        self.quote_header_font = font(16, bold=True)
+        self.shown = {}
+
+        margin = int(20 * scale)
+        y = margin
+        self.header_rect = pygame.Rect(0, y, self.width, self.header_font.get_linesize())
+        y = self.header_rect.bottom + int(20 * scale)
+
+        # One (title rect, text rect) pair per countdown
+        self.rows = []
+        for _ in range(count):
+            if compact:
+                line = max(self.title_font.get_linesize(), self.text_font.get_linesize())
+                half = (self.width - 2 * margin) // 2
+                self.rows.append((pygame.Rect(margin, y, half, line),
+                                  pygame.Rect(margin + half, y, half, line)))
+                y += line + int(4 * scale)
+            else:
+                title = pygame.Rect(0, y, self.width, self.title_font.get_linesize())
+                text = pygame.Rect(0, title.bottom + int(8 * scale), self.width, self.text_font.get_linesize())
+                self.rows.append((title, text))
+                y = text.bottom + int(20 * scale)
+
+        self.quote_header_rect = pygame.Rect(0, y, self.width, self.quote_header_font.get_linesize())
+        y = self.quote_header_rect.bottom + int(8 * scale)
+        self.quote_rect = pygame.Rect(margin, y, self.width - 2 * margin, max(0, self.height - y - margin))
+
+    def draw_text(self, surface, slot, text, font, color, rect, align="center"):
+        """Draw ``text`` into ``rect`` if it changed; returns the dirty rect or None"""
+        if self.shown.get(slot) == text:
+            return None
+        self.shown[slot] = text
+        surface.fill(BACKGROUND, rect)
+        image = font.render(plain(text), True, color, BACKGROUND)
+        anchor = {"left": "midleft", "right": "midright"}.get(align, "center")
+        position = image.get_rect(**{anchor: getattr(rect, anchor)})
+        surface.blit(image, position, area=pygame.Rect(0, 0, rect.width, rect.height))
+        return rect
+
+    def draw_quote(self, surface, quote):
+        if self.shown.get("quote") == quote:
+            return None
+        self.shown["quote"] = quote
+        surface.fill(BACKGROUND, self.quote_rect)
+        y = self.quote_rect.top
+        line_height = self.quote_font.get_linesize()
+        for line in wrap(self.quote_font, plain(quote), self.quote_rect.width):
+            if y + line_height > self.quote_rect.bottom:
+                break
+            image = self.quote_font.render(line, True, pygame.Color("yellow"), BACKGROUND)
+            surface.blit(image, image.get_rect(midtop=(self.quote_rect.centerx, y)))
+            y += line_height
+        return self.quote_rect
+
+    def draw(self, surface, now_ts, full=False):
+        """Bring ``surface`` up to ``now_ts``; returns the list of changed rects"""
+        if full:
+            self.shown = {}
+            surface.fill(BACKGROUND)
+        dirty = [
+            self.draw_text(surface, "header", HEADER, self.header_font, pygame.Color("red"), self.header_rect),
+            self.draw_text(surface, "quote-header", QUOTE_HEADER, self.quote_header_font,
+                           pygame.Color("yellow"), self.quote_header_rect),
+        ]
+        compact = len(self.rows) > 3
+        changed = self.core.tick(now_ts)
+        if full:
+            # The model only reports changes, so take every current text
+            changed = [(index, text) for index, text in enumerate(self.core.model.texts) if text is not None]
+        for index, text in changed:
+            color = pygame.Color(self.core.model.countdowns[index].color)
+            dirty.append(self.draw_text(surface, ("text", index), text, self.text_font, color,
+                                        self.rows[index][1], "right" if compact else "center"))
+        for index, countdown in enumerate(self.core.model.countdowns):
+            # Unchanged titles cost a dictionary lookup
+            dirty.append(self.draw_text(surface, ("title", index), self.core.title(index, now_ts),
+                                        self.title_font, pygame.Color(countdown.color),
+                                        self.rows[index][0], "left" if compact else "center"))
+        dirty.append(self.draw_quote(surface, self.core.quote))
+        return [rect for rect in dirty if rect is not None]
+
+
+def run_display(core, driver=None, measure=False):
+    """Show the countdown full screen until Escape or Q is pressed"""
+    if driver:
+        os.environ["SDL_VIDEODRIVER"] = driver
+    # Only the modules we use: no audio, joystick or camera start-up cost
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+    pygame.display.set_caption("Life Countdown Timer")
+    pygame.mouse.set_visible(False)
+
+    # Scheduled jobs are queued for this thread, with an event to wake it up
+    jobs = queue.SimpleQueue()
+    wake = pygame.event.custom_type()
+
+    def dispatch(callback):
+        jobs.put(callback)
+        pygame.event.post(pygame.event.Event(wake))
+
+    renderer = CountdownRenderer(core, screen.get_size())
+    # After a config change from the control API, lay out and draw afresh
+    rebuilt = []
+    core.on_rebuild = lambda: rebuilt.append(True)
+    core.start_scheduler(dispatch)
+    core.start_control(dispatch)
+
+    renderer.draw(screen, int(time.time()), full=True)
+    pygame.display.flip()
+    if measure:
+        report_startup(driver or "sdl", STARTED)
+
+    running = True
+    try:
+        while running:
+            # Sleep until just past the next second (or minute) boundary
+            period_ms = core.tick_period() * 1000
+            delay = period_ms - int(time.time() * 1000) % period_ms + 5
+            events = [pygame.event.wait(delay)] + pygame.event.get()
+            for event in events:
+                if event.type == pygame.QUIT or (
+                        event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_q)):
+                    running = False
+                elif event.type in (pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION,
+                                    pygame.FINGERDOWN):
+                    core.note_input()
+            while not jobs.empty():
+                jobs.get()()
+
+            if rebuilt:
+                rebuilt.clear()
+                renderer.layout()
+                renderer.draw(screen, int(time.time()), full=True)
+                pygame.display.flip()
+                continue
+            rects = renderer.draw(screen, int(time.time()))
+            if rects:
+                pygame.display.update(rects)
+    finally:
+        core.close()
+        pygame.quit()
+
+
+def render_png(core, path, size, measure=False):
+    """Render the current countdown screen to a PNG file, without any display"""
+    pygame.font.init()
+    surface = pygame.Surface(size)
+    CountdownRenderer(core, size).draw(surface, int(time.time()), full=True)
+    pygame.image.save(surface, path)
+    if measure:
+        report_startup("png", STARTED)
+    core.close()
+
+
+def parse_size(text):
+    """Parse WIDTHxHEIGHT for argparse; the art scripts have the same in runtime/cli.py"""
+    width, _, height = text.lower().partition("x")
+    try:
+        size = int(width), int(height)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, e.g. 800x600, not {text!r}") from None
+    if min(size) <= 0:
+        raise argparse.ArgumentTypeError(f"width and height must be positive, not {text!r}")
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Life countdown timer without Tk")
+    parser.add_argument("--backend", choices=("kmsdrm", "sdl", "png"), default="kmsdrm",
+                        help="kmsdrm: Linux framebuffer (default); sdl: SDL's default "
+                             "video driver; png: render one frame to --output")
+    parser.add_argument("--output", default="countdown.png", help="PNG path for --backend png")
+    parser.add_argument("--size", type=parse_size, default=(800, 600),
+                        help="WIDTHxHEIGHT for --backend png")
+    parser.add_argument("--measure", action="store_true",
+                        help="print startup time and memory once the first frame is shown")
+    args = parser.parse_args()
+
+    core = CountdownCore("countdown_config.json", "daily_quotes.json")
+    if args.backend == "png":
+        render_png(core, args.output, args.size, args.measure)
+    else:
+        run_display(core, "kmsdrm" if args.backend == "kmsdrm" else None, args.measure)
+
+
+if __name__ == "__main__":
+    main()
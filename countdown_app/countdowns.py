@@ -0,0 +1,229 @@
+"""
+Countdown model for the countdown app: any number of user-defined targets.
+
+Each config entry in ``countdowns`` describes one target:
+
+    {"kind": "date", "name": "Next Vacation", "date": "2025-12-31"}
+    {"kind": "life", "name": "Life expectancy", "birth_date": "1990-01-01",
+     "life_expectancy_years": 80}
+    {"kind": "annual", "name": "Mum's birthday", "date": "1961-05-04"}
+
+plus optional ``color`` and ``milestones`` (days left at which an event is
+raised). Annual countdowns roll over to the next occurrence instead of
+expiring.
+
+Live targets are kept sorted by end time, so expired ones are found with a
+bisect and dropped from the per-tick work for good. The next milestone of
+every countdown sits in a heap, so the app only has to wake up for the
+earliest one. ``tick`` takes a single timestamp for every countdown, so
+they never disagree, and reports only the countdowns whose text changed;
+the calendar arithmetic lives in ``timemath``.
+"""
+
+import heapq
+from bisect import bisect_right, insort
+from datetime import datetime, timedelta
+
+from timemath import CountdownText, add_years
+
+TIMES_UP = "⚠️ TIME'S UP! ⚠️"
+
+# Days-left milestones per kind, used when an entry does not list its own
+DEFAULT_MILESTONES = {
+    'date': (365, 100, 30, 7, 1),
+    'life': (365, 100),
+    'annual': (7, 1),
+}
+DEFAULT_COLORS = {'date': 'cyan', 'life': 'red', 'annual': 'magenta'}
+TITLE_ICONS = {'date': '🎯', 'life': '⚰️', 'annual': '🎂'}
+
+
+def _parse_date(text, tz=None):
+    # Midnight local time, or in ``tz`` when the config names a time zone
+    return datetime.strptime(text, '%Y-%m-%d').replace(tzinfo=tz)
+
+
+def _next_anniversary(date, after):
+    """The first anniversary of ``date`` strictly after ``after``"""
+    for year in (after.year, after.year + 1):
+        try:
+            candidate = date.replace(year=year)
+        except ValueError:
+            # 29 February in a common year
+            candidate = date.replace(year=year, day=28)
+        if candidate > after:
+            return candidate
+    raise AssertionError("unreachable")
+
+
+def migrate_legacy_config(config):
+    """Build a ``countdowns`` list from the old fixed life/theme keys"""
+    return [
+        {
+            "kind": "life",
+            "name": "Life expectancy",
+            "birth_date": config.pop('birth_date', "1990-01-01"),
+            "life_expectancy_years": config.pop('life_expectancy_years', 80),
+        },
+        {
+            "kind": "date",
+            "name": config.pop('theme_name', "Next Vacation"),
+            "date": config.pop('theme_end_date', "2025-12-31"),
+        },
+    ]
+
+
+class Countdown:
+    def __init__(self, name, target, kind='date', color=None, milestones=None):
+        self.name = name
+        self.kind = kind
+        self.color = color or DEFAULT_COLORS.get(kind, 'cyan')
+        # Largest first, and always a milestone when the target is reached
+        days = DEFAULT_MILESTONES.get(kind, ()) if milestones is None else milestones
+        self.milestones = tuple(sorted(set(days) | {0}, reverse=True))
+        self.anniversary = None  # Original date of an annual countdown
+        self.set_target(target)
+
+    @classmethod
+    def from_config(cls, entry, now=None, tz=None):
+        """Build a countdown from a config entry; raises ValueError if it is invalid"""
+        try:
+            kind = entry.get('kind', 'date')
+            if kind == 'life':
+                birth_date = _parse_date(entry['birth_date'], tz)
+                years = float(entry['life_expectancy_years'])
+                # Whole years on the calendar, any fraction in mean-year days
+                whole_years = int(years)
+                target = add_years(birth_date, whole_years) + timedelta(days=(years - whole_years) * 365.2425)
+            elif kind == 'annual':
+                anniversary = _parse_date(entry['date'], tz)
+                target = _next_anniversary(anniversary, now or datetime.now(tz))
+            elif kind == 'date':
+                target = _parse_date(entry['date'], tz)
+            else:
+                raise ValueError(f"unknown countdown kind {kind!r}")
+            countdown = cls(entry.get('name', kind.title()), target, kind,
+                            entry.get('color'), entry.get('milestones'))
+            if kind == 'annual':
+                countdown.anniversary = anniversary
+            return countdown
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError(f"invalid countdown {entry!r}: {e}") from None
+
+    @property
+    def repeats(self):
+        return self.kind == 'annual'
+
+    def set_target(self, target):
+        self.target = target
+        self.text = CountdownText(target)
+        self.target_ts = self.text.target_ts
+
+    def advance(self):
+        """Move an annual countdown on to its next occurrence"""
+        # From the original date, so 29 February comes back in leap years
+        self.set_target(_next_anniversary(self.anniversary or self.target, self.target))
+
+    def title(self):
+        icon = TITLE_ICONS.get(self.kind, '🎯')
+        return f"{icon} {self.name.upper()} COUNTDOWN {icon}"
+
+    def milestone_after(self, now_ts):
+        """(timestamp, days) of the first milestone still ahead, or None"""
+        for days in self.milestones:
+            # Whole calendar days before the target, in local wall-clock time
+            when = int((self.target - timedelta(days=days)).timestamp())
+            if when > now_ts:
+                return when, days
+        return None
+
+
+class CountdownModel:
+    def __init__(self, countdowns, now_ts):
+        self.countdowns = list(countdowns)  # Display order, as configured
+        self.texts = [None] * len(self.countdowns)
+        # Live countdowns as (target_ts, index), soonest first
+        self._live = []
+        # One (when_ts, index, days) entry per countdown with a milestone ahead
+        self._milestones = []
+        self._queued = [False] * len(self.countdowns)
+
+        for index, countdown in enumerate(self.countdowns):
+            insort(self._live, (countdown.target_ts, index))
+            self._queue_milestone(index, now_ts)
+
+    @classmethod
+    def from_config(cls, entries, now=None, tz=None):
+        """Build a model from config entries, skipping (and reporting) invalid ones"""
+        now = now or datetime.now(tz)
+        countdowns = []
+        for entry in entries:
+            try:
+                countdowns.append(Countdown.from_config(entry, now, tz))
+            except ValueError as e:
+                print(f"Skipping countdown: {e}")
+        return cls(countdowns, int(now.timestamp()))
+
+    def __len__(self):
+        return len(self.countdowns)
+
+    def _queue_milestone(self, index, now_ts):
+        if self._queued[index]:
+            return
+        milestone = self.countdowns[index].milestone_after(now_ts)
+        if milestone is not None:
+            heapq.heappush(self._milestones, (milestone[0], index, milestone[1]))
+            self._queued[index] = True
+
+    def next_milestone(self):
+        """Timestamp of the earliest pending milestone, or None"""
+        return self._milestones[0][0] if self._milestones else None
+
+    def pop_milestones(self, now_ts):
+        """Return [(index, days)] for every milestone due by ``now_ts``"""
+        events = []
+        while self._milestones and self._milestones[0][0] <= now_ts:
+            _, index, days = heapq.heappop(self._milestones)
+            self._queued[index] = False
+            countdown = self.countdowns[index]
+            if countdown.repeats and days == 0 and countdown.target_ts <= now_ts:
+                self._roll_over(index, now_ts)
+            events.append((index, days))
+            self._queue_milestone(index, now_ts)
+        return events
+
+    def _roll_over(self, index, now_ts):
+        self._live.remove((self.countdowns[index].target_ts, index))
+        self._reinsert(index, now_ts)
+
+    def _reinsert(self, index, now_ts):
+        countdown = self.countdowns[index]
+        while countdown.target_ts <= now_ts:
+            countdown.advance()
+        insort(self._live, (countdown.target_ts, index))
+        self._queue_milestone(index, now_ts)
+
+    def tick(self, now_ts, show_seconds=True):
+        """Return [(index, text)] for the countdowns whose text changed"""
+        changed = []
+
+        # Everything before the first target still ahead has just run out;
+        # one-off countdowns never change again, so they leave the live list
+        expired = bisect_right(self._live, (now_ts, len(self.countdowns)))
+        if expired:
+            done = self._live[:expired]
+            del self._live[:expired]
+            for _, index in done:
+                if self.countdowns[index].repeats:
+                    self._reinsert(index, now_ts)
+                elif self.texts[index] != TIMES_UP:
+                    self.texts[index] = TIMES_UP
+                    changed.append((index, TIMES_UP))
+
+        countdowns = self.countdowns
+        for _, index in self._live:
+            text = countdowns[index].text.format(now_ts, show_seconds)
+            if text != self.texts[index]:
+                self.texts[index] = text
+                changed.append((index, text))
+        return changed
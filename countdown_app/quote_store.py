@@ -0,0 +1,253 @@
+"""
+Indexed, streaming quote store for the countdown app.
+
+Quotes are read from either a JSON list (the original ``daily_quotes.json``)
+or a JSON-lines file with one quote per line, given as a plain string or as
+``{"text": ..., "tags": [...], "lang": "en"}``. On first use the store
+builds an on-disk index next to the source:
+
+- ``<source>.data``  quotes as JSON lines (JSON-lines sources are used as is)
+- ``<source>.idx``   one little-endian uint64 byte offset per quote
+- ``<source>.tags``  uint32 quote numbers grouped by tag
+- ``<source>.meta``  counts, tag ranges and the source size/mtime
+
+The index files are memory-mapped, so picking a quote is O(1) and the
+corpus is never loaded into RAM. A no-repeat shuffle cycle is driven by a
+full-period generator whose whole state is a few integers, which the app
+persists in its config so the cycle survives restarts.
+"""
+
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+
+OFFSET = struct.Struct('<Q')
+NUMBER = struct.Struct('<I')
+
+
+def _parse_quote(record):
+    """Return (text, tags) for a quote given as a string or an object"""
+    if isinstance(record, str):
+        return record, []
+    tags = list(record.get('tags', []))
+    if record.get('lang'):
+        tags.append(f"lang:{record['lang']}")
+    return record['text'], tags
+
+
+class ShuffleCycle:
+    """Visits every number below ``size`` once, in scrambled order.
+
+    Uses a full-period linear congruential generator modulo the next power
+    of two, scrambled by a fixed bijection and cycle-walked down to
+    ``size``. The whole state is (seed, x, emitted), so persisting it is
+    free regardless of how many quotes there are.
+    """
+
+    def __init__(self, size, seed=None, x=None, emitted=0):
+        self.size = size
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        bits = max(2, (size - 1).bit_length())
+        self.modulus = 1 << bits
+        self.mask = self.modulus - 1
+        self.half = max(1, bits // 2)
+
+        rng = random.Random(self.seed)
+        self.a = 4 * rng.randrange(self.modulus // 4) + 1  # a = 1 mod 4
+        self.c = 2 * rng.randrange(self.modulus // 2) + 1  # c odd
+        self.x = x if x is not None else rng.randrange(self.modulus)
+        self.emitted = emitted
+
+    def _scramble(self, x):
+        # xorshift followed by an odd multiply: both are bijections mod 2**bits
+        x ^= x >> self.half
+        return (x * 0x9E3779B1) & self.mask
+
+    def __next__(self):
+        if self.emitted >= self.size:
+            raise StopIteration
+        while True:
+            self.x = (self.a * self.x + self.c) & self.mask
+            value = self._scramble(self.x)
+            if value < self.size:
+                self.emitted += 1
+                return value
+
+    def __iter__(self):
+        return self
+
+    def state(self):
+        return {'seed': self.seed, 'x': self.x, 'emitted': self.emitted, 'size': self.size}
+
+
+class QuoteStore:
+    def __init__(self, source_path):
+        self.source_path = source_path
+        self.meta_path = source_path + '.meta'
+        self.index_path = source_path + '.idx'
+        self.tags_path = source_path + '.tags'
+        self.data_path = source_path if source_path.endswith('.jsonl') else source_path + '.data'
+        self._files = []
+
+        if not self._index_is_current():
+            self.build_index()
+        self._open()
+
+    # Index building
+
+    def _source_stamp(self):
+        stat = os.stat(self.source_path)
+        return {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    def _index_is_current(self):
+        try:
+            with open(self.meta_path) as f:
+                meta = json.load(f)
+            return meta.get('source') == self._source_stamp() and os.path.exists(self.index_path)
+        except (OSError, ValueError):
+            return False
+
+    def _json_list_records(self):
+        """Yield (text, tags) for every quote in a JSON list source"""
+        # A JSON list has to be parsed in one go; big libraries should be JSON lines
+        with open(self.source_path, encoding='utf-8') as f:
+            for record in json.load(f):
+                yield _parse_quote(record)
+
+    def build_index(self):
+        """(Re)build the offset and tag indexes from the source file"""
+        offsets = array('Q')
+        by_tag = {}
+        data_tmp = self.data_path + '.tmp' if self.data_path != self.source_path else None
+
+        data_out = open(data_tmp, 'w', encoding='utf-8') if data_tmp else None
+        try:
+            if data_out is None:
+                # JSON-lines source: index the existing lines where they are
+                with open(self.source_path, 'rb') as f:
+                    offset = 0
+                    for line in f:
+                        if line.strip():
+                            text, tags = _parse_quote(json.loads(line))
+                            for tag in tags:
+                                by_tag.setdefault(tag, array('I')).append(len(offsets))
+                            offsets.append(offset)
+                        offset += len(line)
+            else:
+                offset = 0
+                for text, tags in self._json_list_records():
+                    line = json.dumps({'text': text, 'tags': tags}, ensure_ascii=False) + '\n'
+                    for tag in tags:
+                        by_tag.setdefault(tag, array('I')).append(len(offsets))
+                    offsets.append(offset)
+                    data_out.write(line)
+                    offset += len(line.encode('utf-8'))
+        finally:
+            if data_out is not None:
+                data_out.close()
+
+        tag_ranges = {}
+        tag_numbers = array('I')
+        for tag, numbers in sorted(by_tag.items()):
+            tag_ranges[tag] = [len(tag_numbers), len(numbers)]
+            tag_numbers.extend(numbers)
+
+        # The index files are little-endian whatever the host is
+        if sys.byteorder != 'little':
+            offsets.byteswap()
+            tag_numbers.byteswap()
+        self._write(self.index_path, offsets.tobytes())
+        self._write(self.tags_path, tag_numbers.tobytes())
+        if data_tmp:
+            os.replace(data_tmp, self.data_path)
+        meta = {'source': self._source_stamp(), 'count': len(offsets), 'tags': tag_ranges}
+        self._write(self.meta_path, json.dumps(meta).encode('utf-8'))
+
+    @staticmethod
+    def _write(path, payload):
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp, path)
+
+    # Reading
+
+    def _map(self, path):
+        f = open(path, 'rb')
+        self._files.append(f)
+        if os.fstat(f.fileno()).st_size == 0:
+            return b''
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _open(self):
+        with open(self.meta_path) as f:
+            meta = json.load(f)
+        self.count = meta['count']
+        self.tag_ranges = meta['tags']
+        self._offsets = self._map(self.index_path)
+        self._tag_numbers = self._map(self.tags_path)
+        self._data = open(self.data_path, 'rb')
+        self._files.append(self._data)
+
+    def close(self):
+        for f in self._files:
+            f.close()
+        self._files = []
+
+    def __len__(self):
+        return self.count
+
+    def tags(self):
+        return sorted(self.tag_ranges)
+
+    def _candidates(self, tag):
+        """(start, count) into the tag index, or None for every quote"""
+        if tag:
+            return self.tag_ranges.get(tag, (0, 0))
+        return None
+
+    def _number(self, position, tag):
+        candidates = self._candidates(tag)
+        if candidates is None:
+            return position
+        start, _ = candidates
+        return NUMBER.unpack_from(self._tag_numbers, (start + position) * NUMBER.size)[0]
+
+    def _size(self, tag):
+        candidates = self._candidates(tag)
+        return self.count if candidates is None else candidates[1]
+
+    def quote(self, number):
+        """The text of quote ``number``: one seek and one line read"""
+        offset = OFFSET.unpack_from(self._offsets, number * OFFSET.size)[0]
+        self._data.seek(offset)
+        return _parse_quote(json.loads(self._data.readline()))[0]
+
+    def random_quote(self, tag=None, rng=random):
+        """A uniformly random quote (optionally with ``tag``), or None"""
+        size = self._size(tag)
+        if not size:
+            return None
+        return self.quote(self._number(rng.randrange(size), tag))
+
+    def next_quote(self, state=None, tag=None):
+        """Next quote of the no-repeat cycle, and the state to persist
+
+        ``state`` is what the previous call returned (or None). A new cycle
+        starts when the previous one is exhausted, or when the library or
+        the tag filter changed.
+        """
+        size = self._size(tag)
+        if not size:
+            return None, state
+        state = state or {}
+        if state.get('size') != size or state.get('tag') != tag or state.get('emitted', 0) >= size:
+            cycle = ShuffleCycle(size)
+        else:
+            cycle = ShuffleCycle(size, state['seed'], state['x'], state['emitted'])
+        text = self.quote(self._number(next(cycle), tag))
+        return text, dict(cycle.state(), tag=tag)
@@ -0,0 +1,112 @@
+"""
+Small in-process scheduler for the countdown app.
+
+Jobs are kept in a heap ordered by their wall-clock due time. A single
+background thread sleeps until the earliest job is due, then hands its
+callback to ``dispatch`` (for Tk, a queue plus a wake-up byte on a pipe) so the job
+itself runs on the UI thread. Nothing wakes up unless there is work, apart
+from a long safety-net interval that catches the wall clock jumping ahead
+after a suspend; jobs missed while suspended then run once, late.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from datetime import datetime, timedelta
+
+
+class Job:
+    def __init__(self, due, callback, name=None, repeat=None):
+        self.due = due  # Unix timestamp
+        self.callback = callback
+        self.name = name or getattr(callback, '__name__', 'job')
+        self.repeat = repeat  # Callable giving the next due datetime after a run, or None
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"<Job {self.name} at {datetime.fromtimestamp(self.due)}>"
+
+
+def next_daily(hour, minute, after):
+    """The first hour:minute strictly after the datetime ``after``"""
+    candidate = after.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if candidate <= after:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+class Scheduler:
+    def __init__(self, dispatch=None, max_sleep=900.0):
+        # By default callbacks run on the scheduler thread itself
+        self.dispatch = dispatch or (lambda callback: callback())
+        self.max_sleep = max_sleep
+        self._heap = []
+        self._counter = itertools.count()  # Tie-breaker for jobs due at the same time
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def schedule_at(self, when, callback, name=None, repeat=None):
+        """Run ``callback`` at the datetime ``when`` (right away if it has passed)"""
+        job = Job(when.timestamp(), callback, name, repeat)
+        with self._condition:
+            heapq.heappush(self._heap, (job.due, next(self._counter), job))
+            self._condition.notify()
+        return job
+
+    def daily(self, hour, minute, callback, name=None):
+        """Run ``callback`` every day at hour:minute local time"""
+        first = next_daily(hour, minute, datetime.now())
+        return self.schedule_at(first, callback, name,
+                                repeat=lambda now: next_daily(hour, minute, now))
+
+    def cancel(self, job):
+        with self._condition:
+            job.cancelled = True
+            self._condition.notify()
+
+    def pending(self):
+        """Jobs still waiting to run, earliest first"""
+        with self._condition:
+            return [job for _, _, job in sorted(self._heap) if not job.cancelled]
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+
+    def _run(self):
+        with self._condition:
+            while not self._stopped:
+                # Drop cancelled jobs from the front so they never cause a wake-up
+                while self._heap and self._heap[0][2].cancelled:
+                    heapq.heappop(self._heap)
+
+                now = time.time()
+                if self._heap and self._heap[0][0] <= now:
+                    _, _, job = heapq.heappop(self._heap)
+                    self._fire(job, now)
+                    continue
+
+                timeout = self.max_sleep
+                if self._heap:
+                    timeout = min(timeout, self._heap[0][0] - now)
+                self._condition.wait(timeout)
+
+    def _fire(self, job, now):
+        try:
+            self.dispatch(job.callback)
+        except Exception as e:
+            print(f"Error running scheduled job {job.name}: {e}")
+
+        if job.repeat is not None:
+            # Compute the next run from now, so runs missed during a suspend
+            # collapse into the single late run that just happened
+            job.due = job.repeat(datetime.fromtimestamp(now)).timestamp()
+            heapq.heappush(self._heap, (job.due, next(self._counter), job))
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Calendar-correct countdown arithmetic for the countdown app.
+
+The time left until a target is split into years, months and days counted
+back from the target on the calendar (month lengths and leap years come
+from lookup tables, and a day that does not exist in a shorter month is
+clamped to its last day), followed by the exact hours, minutes and seconds
+between now and that point. Targets are datetimes, naive for system local
+time or aware with a ``zoneinfo`` zone, so days stay calendar days across
+DST changes: the clock part of a 25-hour day simply reads up to 24:59:59.
+
+``CountdownText`` is driven by one Unix timestamp per tick. The calendar
+part only changes once a day, so it is cached together with the window of
+timestamps it is valid for; in between, a tick is an integer subtraction,
+two divmods and table lookups into a reused segment list.
+
+Run this file directly for the self-checks and a micro-benchmark:
+
+    python timemath.py --check 1000000
+    python timemath.py --bench
+"""
+
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+# "00".."99": every clock segment is a table lookup instead of a format call
+TWO_DIGITS = tuple(f"{n:02d}" for n in range(100))
+
+
+def is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def days_in_month(year, month):
+    if month == 2 and is_leap(year):
+        return 29
+    return DAYS_IN_MONTH[month]
+
+
+def add_months(moment, months):
+    """``moment`` moved by whole calendar months, clamping the day to the month"""
+    years, month_index = divmod(moment.month - 1 + months, 12)
+    year = moment.year + years
+    month = month_index + 1
+    return moment.replace(year=year, month=month, day=min(moment.day, days_in_month(year, month)))
+
+
+def add_years(moment, years):
+    return add_months(moment, 12 * years)
+
+
+def decompose(target, now_ts):
+    """Split the time from ``now_ts`` to ``target`` on the calendar
+
+    Returns (years, months, days, anchor_ts, previous_ts): ``anchor`` is
+    the target moved back by the years, months and days, so the clock part
+    is ``anchor_ts - now_ts``; the result holds for any now in
+    (previous_ts, anchor_ts]. ``target`` must be after ``now_ts``.
+    """
+    now = datetime.fromtimestamp(now_ts, target.tzinfo)
+
+    # As many whole months as fit without passing now
+    months = (target.year - now.year) * 12 + target.month - now.month
+    month_anchor = add_months(target, -months)
+    if month_anchor.timestamp() < now_ts:
+        months -= 1
+        month_anchor = add_months(target, -months)
+
+    # Then as many whole days
+    days = (month_anchor.date() - now.date()).days
+    anchor = month_anchor - timedelta(days=days)
+    if anchor.timestamp() < now_ts:
+        days -= 1
+        anchor += timedelta(days=1)
+
+    years, months = divmod(months, 12)
+    previous = anchor - timedelta(days=1)
+    return years, months, days, int(anchor.timestamp()), int(previous.timestamp())
+
+
+def format_prefix(years, months, days):
+    if years:
+        return f"{years}Y {months}M {days}D "
+    if months:
+        return f"{months}M {days}D "
+    return f"{days}D "
+
+
+class CountdownText:
+    """Formats the time left until one target, one timestamp per tick"""
+
+    def __init__(self, target):
+        self.target = target
+        self.target_ts = int(target.timestamp())
+        self._anchor_ts = 0
+        self._previous_ts = 0
+        # prefix, hours, ":", minutes, ":", seconds
+        self._segments = ["", "00", ":", "00", ":", "00"]
+
+    def parts(self, now_ts):
+        """(years, months, days, hours, minutes, seconds) left, or None once reached"""
+        if now_ts >= self.target_ts:
+            return None
+        if not self._previous_ts < now_ts <= self._anchor_ts:
+            self._refresh(now_ts)
+        hours, rest = divmod(self._anchor_ts - now_ts, 3600)
+        minutes, seconds = divmod(rest, 60)
+        return self._calendar + (hours, minutes, seconds)
+
+    def _refresh(self, now_ts):
+        years, months, days, self._anchor_ts, self._previous_ts = decompose(self.target, now_ts)
+        self._calendar = (years, months, days)
+        self._segments[0] = format_prefix(years, months, days)
+
+    def format(self, now_ts, show_seconds=True):
+        """The countdown text at ``now_ts`` (whole seconds), or None once reached"""
+        if now_ts >= self.target_ts:
+            return None
+        if not self._previous_ts < now_ts <= self._anchor_ts:
+            self._refresh(now_ts)
+        hours, rest = divmod(self._anchor_ts - now_ts, 3600)
+        segments = self._segments
+        if show_seconds:
+            minutes, seconds = divmod(rest, 60)
+            segments[1] = TWO_DIGITS[hours]
+            segments[3] = TWO_DIGITS[minutes]
+            segments[5] = TWO_DIGITS[seconds]
+            return "".join(segments)
+        return segments[0] + TWO_DIGITS[hours] + ":" + TWO_DIGITS[rest // 60]
+
+
+# Self-checks and benchmark
+
+CHECK_ZONES = ("", "Europe/London", "America/New_York", "Australia/Sydney", "Asia/Kolkata", "UTC")
+
+
+def _zone(name):
+    if not name:
+        return None
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(name)
+
+
+def _random_moment(rng, tz, start_year=1971, end_year=2099):
+    while True:
+        try:
+            return datetime(rng.randint(start_year, end_year), rng.randint(1, 12), rng.randint(1, 31),
+                            rng.randrange(24), rng.randrange(60), rng.randrange(60), tzinfo=tz)
+        except ValueError:
+            continue
+
+
+def check(count, seed=0):
+    """Randomized property checks; returns the number of failures"""
+    rng = random.Random(seed)
+    zones = [_zone(name) for name in CHECK_ZONES]
+    failures = 0
+
+    def fail(message):
+        nonlocal failures
+        failures += 1
+        if failures <= 10:
+            print("FAIL:", message)
+
+    for _ in range(count):
+        tz = rng.choice(zones)
+        target = _random_moment(rng, tz)
+        if rng.random() < 0.5:
+            # Mostly short countdowns, where month ends and DST bite
+            now_ts = int(target.timestamp()) - rng.randrange(1, 120 * 86400)
+        else:
+            now_ts = int(_random_moment(rng, tz).timestamp())
+        if now_ts >= int(target.timestamp()):
+            continue
+
+        years, months, days, anchor_ts, previous_ts = decompose(target, now_ts)
+        case = f"target={target.isoformat()} tz={tz} now={now_ts}"
+        if not (0 <= months < 12 and 0 <= days < 31 and years >= 0):
+            fail(f"out of range {years}Y {months}M {days}D: {case}")
+        # The anchor is exactly the target moved back by the parts
+        anchor = add_months(target, -(12 * years + months)) - timedelta(days=days)
+        if int(anchor.timestamp()) != anchor_ts:
+            fail(f"anchor mismatch: {case}")
+        # ... it is not before now, and one more day would be (maximality)
+        if not previous_ts < now_ts <= anchor_ts:
+            fail(f"now outside ({previous_ts}, {anchor_ts}]: {case}")
+        # ... and less than a day (25 hours across a DST change) remains on the clock
+        if not 0 <= anchor_ts - now_ts < 25 * 3600:
+            fail(f"clock part {anchor_ts - now_ts}s: {case}")
+        # One more month would pass now too
+        if days == 0 and (years or months):
+            later = add_months(target, -(12 * years + months - 1))
+            if later.timestamp() < now_ts:
+                fail(f"month count not maximal: {case}")
+
+        # The cached formatter agrees with a fresh decomposition while time moves on
+        text = CountdownText(target)
+        for step in (0, rng.randrange(1, 3 * 86400), rng.randrange(1, 40 * 86400)):
+            now_ts += step
+            if now_ts >= text.target_ts:
+                break
+            cached = text.parts(now_ts)
+            fresh = decompose(target, now_ts)
+            expected = fresh[:3] + (
+                (fresh[3] - now_ts) // 3600, (fresh[3] - now_ts) % 3600 // 60, (fresh[3] - now_ts) % 60)
+            if cached != expected:
+                fail(f"cache {cached} != fresh {expected}: {case}")
+    return failures
+
+
+def bench(countdowns=100, ticks=2000, seed=0):
+    rng = random.Random(seed)
+    now_ts = int(time.time())
+    targets = [datetime.fromtimestamp(now_ts + rng.randrange(86400, 60 * 365 * 86400))
+               for _ in range(countdowns)]
+    texts = [CountdownText(target) for target in targets]
+
+    started = time.perf_counter()
+    for tick in range(ticks):
+        for text in texts:
+            text.format(now_ts + tick)
+    cached = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for tick in range(ticks // 10):
+        for target in targets:
+            years, months, days, anchor_ts, _ = decompose(target, now_ts + tick)
+            rest = anchor_ts - now_ts - tick
+            format_prefix(years, months, days) + f"{rest // 3600:02d}:{rest % 3600 // 60:02d}:{rest % 60:02d}"
+    fresh = (time.perf_counter() - started) * 10
+
+    per_tick = countdowns * ticks
+    print(f"{countdowns} countdowns x {ticks} ticks")
+    print(f"  cached CountdownText.format: {cached / per_tick * 1e6:.2f} us per countdown")
+    print(f"  full decomposition each tick: {fresh / per_tick * 1e6:.2f} us per countdown")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Self-checks and benchmark for the countdown arithmetic")
+    parser.add_argument("--check", type=int, metavar="N", help="run N randomized property checks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bench", action="store_true", help="time formatting per countdown per tick")
+    args = parser.parse_args()
+
+    if args.check is None and not args.bench:
+        args.check = 100000
+    if args.check:
+        started = time.perf_counter()
+        failures = check(args.check, args.seed)
+        print(f"{args.check} cases, {failures} failures ({time.perf_counter() - started:.1f} s)")
+        if failures:
+            sys.exit(1)
+    if args.bench:
+        bench()
+
+
+if __name__ == "__main__":
+    main()